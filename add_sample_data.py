@@ -5,7 +5,7 @@ from database import Database
 
 def add_sample_torrents():
     """샘플 토렌트 데이터 추가"""
-    db = Database()
+    db = Database(background_tasks=False)
     session = db.get_session()
     
     sample_data = [
@@ -1,40 +1,26 @@
-"""views 컬럼 추가 스크립트"""
+"""views 컬럼 추가 스크립트
+
+views 컬럼은 이제 스키마 마이그레이션(database/migrations.py 3번)이 Database 생성 시 자동으로 추가한다.
+이 스크립트는 기존 사용법 호환을 위해 남겨두었으며 마이그레이션만 실행한다.
+"""
 from database.database import Database
 from sqlalchemy import text
-import sqlite3
+
 
 def add_views_column():
-    """torrents 테이블에 views 컬럼 추가"""
-    db = Database()
+    """torrents 테이블에 views 컬럼 추가 (마이그레이션 실행 후 확인)"""
+    db = Database(background_tasks=False)
     
     try:
         with db.engine.connect() as conn:
-            # SQLite는 IF NOT EXISTS 미지원, 직접 확인
-            result = conn.execute(text("PRAGMA table_info(torrents)"))
-            columns = [row[1] for row in result]
-            
-            if 'views' in columns:
-                print("[OK] views 컬럼이 이미 존재합니다.")
-            else:
-                # views 컬럼 추가
-                conn.execute(text("ALTER TABLE torrents ADD COLUMN views INTEGER DEFAULT 0"))
-                conn.commit()
-                print("[OK] views 컬럼이 성공적으로 추가되었습니다!")
-            
-            # 기존 데이터의 views 값 추정 (downloads * 5)
-            conn.execute(text("""
-                UPDATE torrents 
-                SET views = downloads * 5 
-                WHERE views = 0 OR views IS NULL
-            """))
-            conn.commit()
-            
-            print("[OK] 기존 데이터의 조회수가 추정되었습니다 (완료수 x 5)")
-            
-    except Exception as e:
-        print(f"[X] 오류 발생: {e}")
-        raise
+            columns = [row[1] for row in conn.execute(text("PRAGMA table_info(torrents)"))]
+        
+        if 'views' in columns:
+            print("[OK] views 컬럼이 존재합니다.")
+        else:
+            print("[X] views 컬럼이 없습니다. 마이그레이션 로그를 확인하세요.")
+    finally:
+        db.close()
 
 if __name__ == "__main__":
     add_views_column()
-
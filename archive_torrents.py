@@ -0,0 +1,27 @@
+"""오래된 토렌트 보관 DB 이동 스크립트
+
+사용법:
+    ARCHIVE_ENABLED=true python archive_torrents.py [--days 일수]
+
+업로드 후 일정 기간이 지난 토렌트를 archive.db로 옮긴다 (Database도 ARCHIVE_INTERVAL마다 자동 실행).
+"""
+import argparse
+from database.database import Database
+from database.archive import archive_old_torrents
+
+
+def main():
+    parser = argparse.ArgumentParser(description='오래된 토렌트 보관 DB 이동')
+    parser.add_argument('--db', default='./torrents.db', help='데이터베이스 파일 경로')
+    parser.add_argument('--days', type=int, help='보관 기준 일수 (기본: ARCHIVE_AFTER_DAYS)')
+    args = parser.parse_args()
+
+    db = Database(args.db, background_tasks=False)
+    try:
+        archive_old_torrents(db, args.days)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
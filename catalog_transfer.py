@@ -0,0 +1,46 @@
+"""카탈로그 내보내기 / 가져오기 스크립트
+
+사용법:
+    python catalog_transfer.py export catalog.ndjson.gz [--period 1month] [--censored yes|no]
+                                     [--country JP] [--genre 장르 ...] [--search 검색어]
+    python catalog_transfer.py import catalog.ndjson.gz
+
+다른 PC의 카탈로그를 수집과 같은 중복 규칙(info hash / source_id / 제목)으로 병합할 때 사용한다.
+"""
+import argparse
+from config import TIME_RANGE_DAYS
+from database.database import Database
+from database.catalog_transfer import export_catalog, import_catalog
+
+
+def main():
+    parser = argparse.ArgumentParser(description='카탈로그 내보내기 / 가져오기')
+    parser.add_argument('--db', default='./torrents.db', help='데이터베이스 파일 경로')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    export_parser = sub.add_parser('export', help='필터에 맞는 토렌트를 파일로 내보내기')
+    export_parser.add_argument('path', help='출력 파일 (.gz면 gzip 압축)')
+    export_parser.add_argument('--period', choices=sorted(TIME_RANGE_DAYS), default='all', help='기간')
+    export_parser.add_argument('--censored', choices=['yes', 'no'], help='검열 여부')
+    export_parser.add_argument('--country', help='국가 코드')
+    export_parser.add_argument('--genre', action='append', help='장르 (여러 번 지정하면 모두 가진 항목)')
+    export_parser.add_argument('--search', help='검색어')
+
+    import_parser = sub.add_parser('import', help='내보낸 파일을 현재 DB에 병합')
+    import_parser.add_argument('path', help='입력 파일')
+    args = parser.parse_args()
+
+    db = Database(args.db, background_tasks=False)
+    try:
+        if args.command == 'export':
+            censored = None if args.censored is None else args.censored == 'yes'
+            export_catalog(db, args.path, TIME_RANGE_DAYS[args.period], censored,
+                           args.country, args.genre, args.search)
+        else:
+            import_catalog(db, args.path)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
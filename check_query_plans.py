@@ -0,0 +1,144 @@
+"""쿼리 실행 계획 점검 스크립트 (개발용)
+
+get_torrents가 만들 수 있는 필터/정렬 조합마다 EXPLAIN QUERY PLAN을 실행하고
+전체 테이블 스캔이나 임시 B-tree 정렬(USE TEMP B-TREE)이 나오는 조합을 표시한다.
+
+- [X] 전체 스캔: 인덱스 추가가 필요한 조합 (종료 코드 1)
+- [!] 임시 정렬: 인덱스로 좁힌 행을 다시 정렬하는 조합 (필터가 선택적이면 문제없음)
+
+사용법:
+    python check_query_plans.py [DB 경로] [--all]
+
+    --all: 모든 조합의 실행 계획 출력
+
+실제 데이터가 있는 DB로 실행해야 의미가 있다 (플래너가 sqlite_stat1 통계를 보고 인덱스를 고름).
+DB는 읽기만 한다.
+"""
+import itertools
+import sys
+from sqlalchemy import select, func, text
+from database.database import Database
+from database.models import Torrent
+
+# 필터 값 (None = 필터 없음)
+PERIODS = [None, 7]
+CENSORED = [None, True]
+COUNTRIES = [None, 'JP']
+GENRES = [None, ['Amateur'], ['Amateur', 'Solo']]
+SEARCHES = [None, 'FC2', 'ab']
+
+# 목록 헤더에서 정렬 가능한 필드 + 기본 정렬
+SORT_FIELDS = [
+    'upload_date', 'title', 'size', 'seeders', 'leechers', 'downloads', 'popularity_score', 'trending_score'
+]
+SORT_ORDERS = ['desc', 'asc']
+
+
+def explain(conn, stmt) -> list:
+    """EXPLAIN QUERY PLAN 결과의 detail 열 목록"""
+    sql = str(stmt.compile(dialect=conn.dialect, compile_kwargs={'literal_binds': True}))
+    return [row[3] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+
+
+def problems(plan: list) -> tuple:
+    """실행 계획에서 문제 항목 추출
+
+    Returns:
+        (torrents 전체 스캔 항목, 임시 정렬 항목)
+    """
+    scans = [d for d in plan if d.split()[:2] == ['SCAN', 'torrents'] and 'USING' not in d]
+    sorts = [d for d in plan if 'USE TEMP B-TREE' in d]
+    return scans, sorts
+
+
+def describe(period, censored, country, genres, search, sort_by=None, sort_order=None) -> str:
+    parts = []
+    if period:
+        parts.append(f"period={period}d")
+    if censored is not None:
+        parts.append(f"censored={censored}")
+    if country:
+        parts.append(f"country={country}")
+    if genres:
+        parts.append(f"genres={'+'.join(genres)}")
+    if search:
+        parts.append(f"search='{search}'")
+    if sort_by:
+        parts.append(f"sort={sort_by} {sort_order}")
+    return ', '.join(parts) or '(필터 없음)'
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    show_all = '--all' in sys.argv
+    db = Database(args[0] if args else './torrents.db', background_tasks=False)
+    table = Torrent.__table__
+
+    checked = 0
+    scanned = 0
+    sorted_ = 0
+
+    def check(label, stmt):
+        nonlocal checked, scanned, sorted_
+        plan = explain(conn, stmt)
+        checked += 1
+        scans, sorts = problems(plan)
+        if scans:
+            scanned += 1
+            print(f"[X] {label}")
+        elif sorts:
+            sorted_ += 1
+            print(f"[!] {label}")
+        elif show_all:
+            print(f"[OK] {label}")
+        if scans or show_all:
+            for detail in plan:
+                marker = '  <--' if detail in scans or detail in sorts else ''
+                print(f"     {detail}{marker}")
+
+    try:
+        with db.read_engine.connect() as conn:
+            has_stats = conn.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE name='sqlite_stat1'"
+            )).first() is not None
+            if not has_stats:
+                print("[!] sqlite_stat1 통계가 없습니다. 실행 계획이 실제와 다를 수 있습니다.")
+
+            for period, censored, country, genres, search in itertools.product(
+                PERIODS, CENSORED, COUNTRIES, GENRES, SEARCHES
+            ):
+                conditions = db._filter_conditions(table, period, censored, country, genres, search)
+
+                # 총 개수 (get_total_count)
+                check(
+                    f"COUNT  {describe(period, censored, country, genres, search)}",
+                    select(func.count()).select_from(table).where(*conditions)
+                )
+
+                # 목록 (get_torrents / get_torrents_page 첫 페이지)
+                for sort_by, sort_order in itertools.product(SORT_FIELDS, SORT_ORDERS):
+                    stmt = (
+                        select(table.c.id)
+                        .where(*conditions)
+                        .order_by(*db._order_clauses(table, sort_by, sort_order))
+                        .limit(50)
+                    )
+                    check(f"LIST   {describe(period, censored, country, genres, search, sort_by, sort_order)}", stmt)
+
+            # 중복 확인 조회 (DBWriterThread 일괄 저장)
+            check("DEDUPE info_hash", select(table.c.id).where(
+                table.c.info_hash.in_(['0' * 40, 'f' * 40])
+            ).order_by(table.c.id))
+            check("DEDUPE source_id", select(table.c.id).where(
+                table.c.source_id.in_(['1', '2']), table.c.source_site == 'sukebei.nyaa.si'
+            ))
+            check("DEDUPE title", select(table.c.id).where(table.c.title.in_(['a', 'b'])).order_by(table.c.id))
+    finally:
+        db.close()
+
+    print(f"\n점검 {checked}개 / 전체 스캔 {scanned}개 / 임시 정렬 {sorted_}개")
+    return 1 if scanned else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,6 +7,10 @@ load_dotenv()
 # UI 설정
 PAGE_SIZE = int(os.getenv('PAGE_SIZE', '50'))  # 페이지당 표시할 아이템 수
 IMAGE_CACHE_SIZE = int(os.getenv('IMAGE_CACHE_SIZE', '200'))  # 이미지 메모리 캐시 크기
+PAGE_ANCHOR_STRIDE = int(os.getenv('PAGE_ANCHOR_STRIDE', '1000'))  # 먼 페이지 이동용 정렬 앵커 간격 (행 수)
+PAGE_ANCHOR_TTL = int(os.getenv('PAGE_ANCHOR_TTL', '60'))  # 페이지 앵커 캐시 유지 시간 (초)
+COUNT_CACHE_TTL = int(os.getenv('COUNT_CACHE_TTL', '300'))  # 기간 필터 총 개수 캐시 유지 시간 (초)
+COUNT_EXACT_LIMIT = int(os.getenv('COUNT_EXACT_LIMIT', '20000'))  # 이 행 수를 넘으면 총 개수를 추정값으로 먼저 표시
 
 # 스크래핑 설정
 MAX_SCRAPE_PAGES = int(os.getenv('MAX_SCRAPE_PAGES', '100'))  # 최대 스크래핑 페이지 수
@@ -17,8 +21,48 @@ ENABLE_SELENIUM_FOR_IMAGES = os.getenv('ENABLE_SELENIUM_FOR_IMAGES', 'true').low
 IMAGE_HTTP_TIMEOUT = int(os.getenv('IMAGE_HTTP_TIMEOUT', '10'))  # 이미지/검색 HTTP 타임아웃(초)
 IMAGE_HTTP_RETRIES = int(os.getenv('IMAGE_HTTP_RETRIES', '2'))  # 검색 요청 재시도 횟수
 THUMBNAIL_SERVER_BLOCK_THRESHOLD = int(os.getenv('THUMBNAIL_SERVER_BLOCK_THRESHOLD', '200'))  # 썸네일 서버 정지 기준 (연속 실패 횟수)
+THUMBNAIL_FC2_TITLE_PATTERN = r'FC2(?:-|\s+)?PPV'  # FC2 제목 판별 정규식 (대소문자 무시)
+# 제목 형태별로 검색 가능한 썸네일 서버 (JAVGURU, JAVMOST는 모든 형태의 제목 검색 가능)
+THUMBNAIL_SERVER_CLASSES = {
+    'fc2': ['fc2ppv', 'javdb', 'javguru', 'javmost'],
+    'default': ['javdb', 'javbee', 'javguru', 'javmost'],
+}
 PROXY_URL = os.getenv('PROXY_URL', '')  # 셀레니움/요청용 프록시 (예: http://127.0.0.1:7890 또는 socks5://127.0.0.1:1080)
 
+# 데이터베이스 설정
+DB_WAL_MODE = os.getenv('DB_WAL_MODE', 'true').lower() == 'true'  # WAL 저널 모드 사용 (읽기/쓰기 동시 진행)
+DB_SYNCHRONOUS = os.getenv('DB_SYNCHRONOUS', 'NORMAL').upper()  # PRAGMA synchronous (OFF/NORMAL/FULL)
+DB_CACHE_SIZE_KB = int(os.getenv('DB_CACHE_SIZE_KB', '65536'))  # 연결당 페이지 캐시 크기 (KiB)
+DB_MMAP_SIZE = int(os.getenv('DB_MMAP_SIZE', str(256 * 1024 * 1024)))  # 메모리 맵 I/O 크기 (바이트, 0=비활성화)
+DB_BUSY_TIMEOUT_MS = int(os.getenv('DB_BUSY_TIMEOUT_MS', '30000'))  # DB lock 대기 시간 (밀리초)
+DB_READ_POOL_SIZE = int(os.getenv('DB_READ_POOL_SIZE', '4'))  # GUI/워커용 읽기 전용 연결 수
+DB_OPTIMIZE_INTERVAL = int(os.getenv('DB_OPTIMIZE_INTERVAL', '3600'))  # PRAGMA optimize 실행 주기 (초, 0=비활성화)
+DB_WRITER_COMMIT_WINDOW_MS = int(os.getenv('DB_WRITER_COMMIT_WINDOW_MS', '50'))  # 쓰기 작업을 모아서 한 번에 커밋하는 최대 대기 시간 (밀리초)
+DB_WRITER_MAX_WINDOW_OPS = int(os.getenv('DB_WRITER_MAX_WINDOW_OPS', '500'))  # 한 번에 커밋하는 최대 쓰기 작업 수
+DB_WRITER_MAX_BULK_PER_WINDOW = int(os.getenv('DB_WRITER_MAX_BULK_PER_WINDOW', '2'))  # 한 커밋에 넣는 스크래핑 배치(페이지) 수
+DB_WRITER_BULK_LANE_SIZE = int(os.getenv('DB_WRITER_BULK_LANE_SIZE', '8'))  # 대기 가능한 스크래핑 배치 수 (초과 시 스크래퍼 대기, 0=무제한)
+DB_WRITER_THUMBNAIL_LANE_SIZE = int(os.getenv('DB_WRITER_THUMBNAIL_LANE_SIZE', '5000'))  # 대기 가능한 썸네일 업데이트 수 (0=무제한)
+INGEST_JOURNAL_ENABLED = os.getenv('INGEST_JOURNAL_ENABLED', 'true').lower() == 'true'  # 스크래핑 페이지를 커밋 전까지 디스크 저널에 보관 (비정상 종료 후 다시 스크래핑하지 않고 복구)
+INGEST_JOURNAL_PATH = os.getenv('INGEST_JOURNAL_PATH', '')  # 수집 저널 경로 (비우면 DB 파일과 같은 폴더의 ingest_journal.ndjson)
+
+# 통계 기록 / 인기 급상승 점수 / 인기도 일괄 재계산 (numpy 필요)
+TRENDING_UPDATE_INTERVAL = int(os.getenv('TRENDING_UPDATE_INTERVAL', '600'))  # 급상승 점수 재계산 주기 (초, 0=비활성화)
+TRENDING_WINDOW_HOURS = int(os.getenv('TRENDING_WINDOW_HOURS', '48'))  # 급상승 점수에 반영하는 최근 기간 (시간)
+TRENDING_HALF_LIFE_HOURS = float(os.getenv('TRENDING_HALF_LIFE_HOURS', '12'))  # 오래된 변화량의 가중치가 절반이 되는 시간
+TORRENT_STATS_HOURLY_DAYS = int(os.getenv('TORRENT_STATS_HOURLY_DAYS', '3'))  # 시간 단위 통계 보관 기간 (이후 일 단위로 합침)
+TORRENT_STATS_RETENTION_DAYS = int(os.getenv('TORRENT_STATS_RETENTION_DAYS', '90'))  # 통계 기록 보관 기간 (일)
+POPULARITY_SCORER = os.getenv('POPULARITY_SCORER', 'capped')  # 인기도 공식 (capped / percentile, database/scoring.py, 수집과 일괄 재계산에 같이 사용)
+POPULARITY_HALF_LIFE_DAYS = float(os.getenv('POPULARITY_HALF_LIFE_DAYS', '0'))  # 인기도 시간 감쇠 반감기 (일, 0=감쇠 없음)
+POPULARITY_RESCORE_INTERVAL = int(os.getenv('POPULARITY_RESCORE_INTERVAL', '3600'))  # 백분위 / 시간 감쇠 공식일 때 인기도 전체 재계산 주기 (초, 0=비활성화)
+CATALOG_INDEX_ENABLED = os.getenv('CATALOG_INDEX_ENABLED', 'false').lower() == 'true'  # 정렬/필터 컬럼 메모리 인덱스 (database/catalog_index.py, 100만 행당 약 80MB, 큰 DB에서 켜기)
+TITLE_CLUSTERING_ENABLED = os.getenv('TITLE_CLUSTERING_ENABLED', 'true').lower() == 'true'  # 제목 유사 중복 묶음 배정 (database/title_clusters.py)
+TITLE_CLUSTER_THRESHOLD = float(os.getenv('TITLE_CLUSTER_THRESHOLD', '0.7'))  # 같은 릴리스로 보는 정규화 제목 3-gram 유사도 (0~1)
+ARCHIVE_ENABLED = os.getenv('ARCHIVE_ENABLED', 'false').lower() == 'true'  # 오래된 토렌트를 보관 DB로 옮김 (database/archive.py, 기간 '전체' 조회만 두 파일을 함께 읽음)
+ARCHIVE_DB_PATH = os.getenv('ARCHIVE_DB_PATH', '')  # 보관 DB 경로 (비우면 DB 파일과 같은 폴더의 archive.db)
+ARCHIVE_AFTER_DAYS = int(os.getenv('ARCHIVE_AFTER_DAYS', '365'))  # 업로드 후 이 일수가 지난 토렌트를 보관 (이보다 긴 기간 필터도 보관 DB를 함께 읽음)
+ARCHIVE_INTERVAL = int(os.getenv('ARCHIVE_INTERVAL', '86400'))  # 보관 이동 주기 (초, 0=시작 시 한 번만)
+SYNC_OVERLAP_SECONDS = int(os.getenv('SYNC_OVERLAP_SECONDS', '300'))  # 증분 동기화 기준 시각을 이만큼 앞당겨 저장 (내보내는 동안 커밋된 변경을 다음 델타에서 다시 포함)
+
 # 스크래핑 설정
 SCRAPE_SOURCES = [
     'https://sukebei.nyaa.si'
@@ -109,5 +153,6 @@ SORT_OPTIONS = {
     'seeders': '시더 많은순',
     'date': '최신순',
     'size': '용량순',
-    'downloads': '다운로드순'
+    'downloads': '다운로드순',
+    'trending_score': '급상승순'
 }
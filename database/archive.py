@@ -0,0 +1,210 @@
+"""
+오래된 토렌트 보관 DB (cold tier)
+업로드 후 ARCHIVE_AFTER_DAYS가 지난 행을 같은 스키마의 archive.db로 옮겨서 torrents.db를 작게 유지한다.
+
+- 보관 DB는 모든 연결에 'archive' 스키마로 ATTACH된다 (Database._create_engine)
+- torrents, torrent_genres 테이블과 인덱스는 본 DB의 DDL을 그대로 복사해서 만든다
+  (FTS 인덱스, 통계 시계열, 썸네일 탐색 기록, 제목 LSH 버킷은 옮기지 않음)
+- 기간 '전체'처럼 보관 기준보다 긴 기간을 조회할 때만 두 파일을 UNION ALL로 읽는다
+- 보관된 행은 더 이상 갱신하지 않는다 (다시 수집되면 TorrentBulkIngestor가 중복으로 처리)
+
+WAL 모드에서는 두 파일에 걸친 커밋이 파일별로만 원자적이다. 이동 도중 중단되면 같은 행이
+양쪽에 남을 수 있지만, 다음 실행에서 INSERT OR REPLACE로 다시 옮기므로 결과는 같다.
+"""
+import os
+import re
+import time
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Set, Tuple
+from sqlalchemy import MetaData, select, func
+from .models import Torrent, torrent_genres
+from config import ARCHIVE_DB_PATH, ARCHIVE_AFTER_DAYS
+
+SCHEMA = 'archive'
+
+# 한 트랜잭션에서 옮기는 행 수 (DBWriterThread가 쓰기 잠금을 오래 기다리지 않도록 짧게)
+CHUNK_SIZE = 2000
+# SQLite 바인드 변수 제한을 넘지 않도록 IN (...) 조회를 나누는 크기
+IN_CHUNK_SIZE = 500
+
+# 보관 DB 테이블 (조회용, 스키마는 ensure_schema가 본 DB DDL로 만듦)
+_metadata = MetaData()
+archive_torrents = Torrent.__table__.to_metadata(_metadata, schema=SCHEMA)
+archive_torrent_genres = torrent_genres.to_metadata(_metadata, schema=SCHEMA)
+
+# 보관 DB로 복사하는 테이블 (인덱스 포함)
+_ARCHIVED_TABLES = ('torrents', 'torrent_genres')
+# 행을 옮길 때 본 DB에서 함께 지우는 부가 테이블
+_DETAIL_TABLES = ('torrent_genres', 'torrent_stats', 'thumbnail_attempts', 'title_lsh')
+
+_CREATE_TABLE = re.compile(r'^CREATE TABLE (\S+)', re.IGNORECASE)
+_CREATE_INDEX = re.compile(r'^CREATE (UNIQUE )?INDEX (\S+) ON', re.IGNORECASE)
+
+
+def archive_path(db_path: str) -> str:
+    """보관 DB 파일 경로 (ARCHIVE_DB_PATH가 비어 있으면 본 DB 파일과 같은 폴더의 archive.db)"""
+    if ARCHIVE_DB_PATH:
+        return ARCHIVE_DB_PATH
+    return os.path.join(os.path.dirname(os.path.abspath(db_path)), 'archive.db')
+
+
+def genre_links(table):
+    """토렌트 테이블과 같은 파일에 있는 torrent_genres 테이블"""
+    return archive_torrent_genres if table.schema == SCHEMA else torrent_genres
+
+
+def is_attached(conn) -> bool:
+    """연결에 보관 DB가 ATTACH되어 있는지 확인 (SQLAlchemy 연결)"""
+    rows = conn.connection.driver_connection.execute("PRAGMA database_list").fetchall()
+    return any(row[1] == SCHEMA for row in rows)
+
+
+def _columns(raw, schema: str, table: str) -> List[tuple]:
+    """(이름, 타입, 기본값) 목록 (PRAGMA table_info 순서)"""
+    return [(row[1], row[2], row[4]) for row in raw.execute(f"PRAGMA {schema}.table_info({table})")]
+
+
+def ensure_schema(db):
+    """보관 DB에 torrents, torrent_genres 테이블과 인덱스 생성 (이미 있으면 빠진 컬럼만 추가)
+
+    본 DB가 마이그레이션으로 컬럼을 늘려도 보관 DB가 같은 컬럼을 갖도록 Database 초기화 때마다 실행한다.
+    """
+    with db.engine.connect() as conn:
+        raw = conn.connection.driver_connection
+        mode = raw.execute(f"PRAGMA {SCHEMA}.journal_mode=WAL").fetchone()[0]
+        if mode.lower() != 'wal':
+            print(f"[DB] 보관 DB WAL 모드 전환 실패 (현재 모드: {mode})")
+
+        placeholders = ', '.join('?' * len(_ARCHIVED_TABLES))
+        ddl = raw.execute(
+            f"SELECT type, name, tbl_name, sql FROM main.sqlite_master "
+            f"WHERE tbl_name IN ({placeholders}) AND type IN ('table', 'index') AND sql IS NOT NULL "
+            f"ORDER BY type = 'index', name",
+            _ARCHIVED_TABLES
+        ).fetchall()
+        existing = {
+            name for (name,) in raw.execute(f"SELECT name FROM {SCHEMA}.sqlite_master")
+        }
+
+        created = False
+        for kind, name, table, sql in ddl:
+            if name in existing:
+                continue
+            if kind == 'table':
+                sql = _CREATE_TABLE.sub(rf'CREATE TABLE IF NOT EXISTS {SCHEMA}.\1', sql, count=1)
+            else:
+                # 인덱스는 스키마를 인덱스 이름에 붙임 (ON 뒤 테이블 이름은 같은 스키마로 해석됨)
+                sql = _CREATE_INDEX.sub(rf'CREATE \1INDEX IF NOT EXISTS {SCHEMA}.\2 ON', sql, count=1)
+            raw.execute(sql)
+            created = True
+
+        # 본 DB에 나중에 추가된 컬럼
+        for table in _ARCHIVED_TABLES:
+            archived = {name for name, _, _ in _columns(raw, SCHEMA, table)}
+            for name, type_, default in _columns(raw, 'main', table):
+                if name in archived:
+                    continue
+                sql = f'ALTER TABLE {SCHEMA}.{table} ADD COLUMN "{name}" {type_}'
+                if default is not None:
+                    sql += f' DEFAULT {default}'
+                raw.execute(sql)
+                created = True
+        raw.commit()
+
+    if created:
+        print("[DB] 보관 DB 스키마 준비 완료")
+
+
+def archived_keys(conn, info_hashes: Iterable[str], source_ids: Iterable[str]) -> Tuple[Set[str], Set[tuple]]:
+    """보관 DB에 있는 info hash와 (source_site, source_id) 조회 (수집 시 중복 확인용)"""
+    raw = conn.connection.driver_connection
+    found_hashes = set()
+    found_sources = set()
+    info_hashes = list(info_hashes)
+    source_ids = list(source_ids)
+    for i in range(0, len(info_hashes), IN_CHUNK_SIZE):
+        chunk = info_hashes[i:i + IN_CHUNK_SIZE]
+        rows = raw.execute(
+            f"SELECT info_hash FROM {SCHEMA}.torrents WHERE info_hash IN ({', '.join('?' * len(chunk))})", chunk
+        )
+        found_hashes.update(row[0] for row in rows)
+    for i in range(0, len(source_ids), IN_CHUNK_SIZE):
+        chunk = source_ids[i:i + IN_CHUNK_SIZE]
+        rows = raw.execute(
+            f"SELECT source_site, source_id FROM {SCHEMA}.torrents "
+            f"WHERE source_id IN ({', '.join('?' * len(chunk))})", chunk
+        )
+        found_sources.update((site, source_id) for site, source_id in rows)
+    return found_hashes, found_sources
+
+
+def _move_chunk(conn, columns: str, ids: List[int]):
+    """id 목록의 행을 보관 DB로 복사한 뒤 본 DB에서 삭제 (호출자 트랜잭션 안에서)"""
+    raw = conn.connection.driver_connection
+    placeholders = ', '.join('?' * len(ids))
+    raw.execute(
+        f"INSERT OR REPLACE INTO {SCHEMA}.torrents ({columns}) "
+        f"SELECT {columns} FROM main.torrents WHERE id IN ({placeholders})", ids
+    )
+    # 다시 옮기는 경우 이전 장르 연결을 지우고 본 DB 기준으로 다시 복사
+    raw.execute(f"DELETE FROM {SCHEMA}.torrent_genres WHERE torrent_id IN ({placeholders})", ids)
+    raw.execute(
+        f"INSERT INTO {SCHEMA}.torrent_genres (torrent_id, genre_id) "
+        f"SELECT torrent_id, genre_id FROM main.torrent_genres WHERE torrent_id IN ({placeholders})", ids
+    )
+    for table in _DETAIL_TABLES:
+        raw.execute(f"DELETE FROM main.{table} WHERE torrent_id IN ({placeholders})", ids)
+    # FTS 인덱스는 삭제 트리거가 정리
+    raw.execute(f"DELETE FROM main.torrents WHERE id IN ({placeholders})", ids)
+    # 보관은 삭제가 아니므로 삭제 트리거가 남긴 기록 제거 (증분 동기화로 전달되지 않도록)
+    raw.execute(f"DELETE FROM main.torrent_tombstones WHERE torrent_id IN ({placeholders})", ids)
+
+
+def archive_old_torrents(db, after_days: Optional[int] = None, chunk_size: int = CHUNK_SIZE,
+                         stop_event=None) -> int:
+    """업로드 후 after_days가 지난 토렌트를 보관 DB로 이동 (청크 단위 짧은 트랜잭션)
+
+    가장 큰 id의 행은 옮기지 않는다. id에 AUTOINCREMENT가 없어서 최대 id 행이 지워지면
+    다음 INSERT가 그 id를 다시 쓰게 되고, 보관 DB의 행과 id가 겹치기 때문이다.
+
+    Args:
+        db: Database 인스턴스 (보관 DB가 ATTACH되어 있어야 함)
+        after_days: 보관 기준 일수 (None이면 ARCHIVE_AFTER_DAYS)
+        chunk_size: 한 트랜잭션에서 옮기는 행 수
+        stop_event: 설정되면 현재 청크까지만 옮기고 중단
+
+    Returns:
+        옮긴 행 수
+    """
+    if db.archive_path is None:
+        print("[DB] 보관 DB가 설정되지 않았습니다 (ARCHIVE_ENABLED=true)")
+        return 0
+    if after_days is None:
+        after_days = ARCHIVE_AFTER_DAYS
+    cutoff = datetime.now() - timedelta(days=after_days)
+    t = Torrent.__table__
+    columns = ', '.join(f'"{c.name}"' for c in t.columns)
+    # 순서 없이 upload_date 인덱스 범위에서 바로 찾음 (옮긴 행은 삭제되므로 매번 앞에서부터)
+    candidates = (
+        select(t.c.id)
+        .where(t.c.upload_date < cutoff)
+        .where(t.c.id < select(func.max(t.c.id)).scalar_subquery())
+        .limit(chunk_size)
+    )
+
+    start = time.time()
+    moved: List[int] = []
+    while stop_event is None or not stop_event.is_set():
+        with db.write_engine.begin() as conn:
+            ids = list(conn.execute(candidates).scalars())
+            if not ids:
+                break
+            for i in range(0, len(ids), IN_CHUNK_SIZE):
+                _move_chunk(conn, columns, ids[i:i + IN_CHUNK_SIZE])
+        moved.extend(ids)
+
+    if moved:
+        # 옮긴 행은 본 DB에서 삭제된 것과 같으므로 카탈로그 인덱스와 개수 캐시에 반영
+        db.notify_data_changed(changed_ids=moved, rows_removed=len(moved))
+        print(f"[DB] 보관 DB로 이동: {len(moved)}건 ({after_days}일 이전, {time.time() - start:.1f}초)")
+    return len(moved)
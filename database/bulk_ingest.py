@@ -0,0 +1,451 @@
+"""
+집합 기반 토렌트 일괄 저장 (bulk upsert)
+DBWriterThread가 스크래핑 페이지 단위로 사용
+"""
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple
+from sqlalchemy import select, update, insert, bindparam, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from .models import GENRE_MASK_BITS, Torrent, Genre, TrackerSet, TorrentStat, torrent_genres
+from .magnet import parse_info_hash, split_magnet, join_trackers
+from . import archive, scoring, title_clusters
+from .change_feed import ChangeSet
+from config import TRENDING_WINDOW_HOURS, TITLE_CLUSTERING_ENABLED
+
+
+# SQLite 바인드 변수 제한을 넘지 않도록 IN (...) 조회를 나누는 크기
+IN_CHUNK_SIZE = 500
+
+# 다운로드수가 더 많은 항목이 들어오면 교체하는 필드
+REPLACE_FIELDS = [
+    'downloads', 'seeders', 'leechers', 'magnet_link', 'info_hash', 'tracker_set_id',
+    'torrent_link', 'size', 'size_bytes'
+]
+
+# _is_update (재수집) 항목에서 갱신하는 통계 필드
+STAT_FIELDS = ['downloads', 'seeders', 'leechers']
+
+# 인기도 계산에 필요한 필드
+SCORE_FIELDS = ['seeders', 'leechers', 'downloads', 'comments', 'views']
+
+
+def _chunks(items: list, size: int = IN_CHUNK_SIZE):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class TorrentBulkIngestor:
+    """페이지 단위 토렌트 upsert
+
+    - 기존 행은 info hash / source_id / 제목 IN (...) 조회 한 번씩으로 찾는다
+      (info hash가 같으면 다른 소스, 다른 제목으로 올라온 같은 토렌트도 하나로 합쳐짐)
+    - magnet 링크는 info hash / 나머지 파라미터 / tracker_sets 참조로 나눠서 저장한다
+    - 다운로드수 비교 규칙은 메모리에서 적용한다
+    - 신규는 INSERT ... ON CONFLICT DO UPDATE, 갱신은 executemany로 한 번에 쓴다
+    - 신규/갱신 행의 통계는 torrent_stats 시계열에 함께 기록한다
+    - 신규 행은 제목 유사 중복 묶음(cluster_id)을 바로 배정한다
+    - 보관 DB에 있는 토렌트(info hash / source_id)는 다시 추가하지 않고 중복으로 처리한다
+    - 추가/변경한 행과 필드는 changes(ChangeSet)에 기록한다 (커밋 후 DBWriterThread가 변경 피드로 내보냄)
+    - 장르, tracker 목록 id는 인스턴스 수명 동안 캐시한다 (DBWriterThread당 하나)
+    """
+
+    def __init__(self, changes: Optional[ChangeSet] = None):
+        self.table = Torrent.__table__
+        self._columns = [c.name for c in self.table.columns if c.name != 'id']
+        self._defaults = self._column_defaults()
+        self._genre_ids: Dict[str, int] = {}  # 장르 이름 -> id
+        self._genre_bits: Dict[int, Optional[int]] = {}  # 장르 id -> genre_mask 비트
+        self._tracker_set_ids: Dict[str, int] = {}  # tracker 목록 -> tracker_sets.id
+        self._archive_attached: Optional[bool] = None  # 보관 DB ATTACH 여부 (첫 저장 때 확인)
+        self.changes = changes if changes is not None else ChangeSet()
+
+    def _column_defaults(self) -> Dict[str, Any]:
+        """모델에 선언된 스칼라 기본값 (callable 기본값은 행마다 계산)"""
+        defaults = {}
+        for column in self.table.columns:
+            if column.name == 'id' or column.default is None:
+                continue
+            if column.default.is_scalar:
+                defaults[column.name] = column.default.arg
+        return defaults
+
+    def ingest(self, session, torrents: List[Dict[str, Any]]) -> Tuple[Dict[str, int], List[str]]:
+        """토렌트 목록 일괄 저장 (커밋은 호출자가 처리)
+
+        Args:
+            session: DB 세션 (DBWriterThread 쓰기 세션)
+            torrents: 스크래퍼가 만든 토렌트 딕셔너리 리스트
+
+        Returns:
+            (통계 {'added', 'updated', 'duplicate'}, 입력 순서대로 'added'/'updated'/'duplicate' 리스트)
+        """
+        stats = {'added': 0, 'updated': 0, 'duplicate': 0}
+        results = []
+        if not torrents:
+            return stats, results
+
+        torrents = [self._prepare(session, d) for d in torrents]
+        by_hash, by_source, by_title = self._load_existing(session, torrents)
+        archived_hashes, archived_sources = self._load_archived(session, torrents, by_hash, by_source)
+        now = datetime.utcnow()
+
+        inserts: List[Dict[str, Any]] = []  # 신규 행 (배치 내 중복은 같은 dict를 갱신)
+        insert_genres: List[List[str]] = []
+        updates: Dict[int, Dict[str, Any]] = {}  # 기존 행 id -> 변경 필드
+        touched: Dict[int, Dict[str, Any]] = {}  # 통계가 바뀐 기존 행 (통계 기록용)
+
+        for torrent_data in torrents:
+            info_hash = torrent_data.get('info_hash')
+            source_id = torrent_data.get('source_id')
+            source_site = torrent_data.get('source_site')
+            title = torrent_data.get('title')
+
+            # 1순위: info hash, 2순위: source_id, 3순위: 제목 (같은 배치에서 먼저 추가된 항목 포함)
+            existing = None
+            if info_hash:
+                existing = by_hash.get(info_hash)
+            if existing is None and source_id and source_site:
+                existing = by_source.get((source_site, source_id))
+            if existing is None and title:
+                existing = by_title.get(title)
+
+            if existing is None and (info_hash in archived_hashes or (source_site, source_id) in archived_sources):
+                # 보관된 토렌트는 갱신하지 않음
+                result = 'duplicate'
+            elif existing is None:
+                row = self._new_row(torrent_data, now)
+                inserts.append(row)
+                insert_genres.append(torrent_data.get('genres') or [])
+                if info_hash:
+                    by_hash[info_hash] = row
+                if source_id and source_site:
+                    by_source[(source_site, source_id)] = row
+                if title and title not in by_title:
+                    by_title[title] = row
+                result = 'added'
+            else:
+                result = self._apply_rules(existing, torrent_data)
+                if result == 'updated' and existing.get('id') is not None:
+                    changes = updates.setdefault(existing['id'], {})
+                    changes.update(existing['_changes'])
+                    touched[existing['id']] = existing
+                existing['_changes'] = {}
+
+            stats[result] = stats.get(result, 0) + 1
+            results.append(result)
+
+        if inserts:
+            self._write_inserts(session, inserts, insert_genres)
+            for row in inserts:
+                self.changes.record('insert', row.get('id'), {k: v for k, v in row.items() if k != 'id' and not k.startswith('_')})
+            if TITLE_CLUSTERING_ENABLED:
+                self._assign_clusters(session, inserts)
+        if updates:
+            self._write_updates(session, updates, now)
+            for torrent_id, changes in updates.items():
+                self.changes.record('update', torrent_id, dict(changes, updated_at=now))
+        if inserts or touched:
+            self._write_stats(session, inserts, list(touched.values()))
+
+        return stats, results
+
+    def _prepare(self, session, torrent_data: Dict[str, Any]) -> Dict[str, Any]:
+        """magnet 링크를 저장 형식(info hash, 나머지 파라미터, tracker_set_id)으로 나눈 사본"""
+        magnet_link = torrent_data.get('magnet_link')
+        parts = split_magnet(magnet_link, torrent_data.get('title'))
+        if parts is None:
+            # 분리할 수 없는 링크는 그대로 저장
+            if torrent_data.get('info_hash') or not magnet_link:
+                return torrent_data
+            return dict(torrent_data, info_hash=parse_info_hash(magnet_link))
+        info_hash, rest, trackers = parts
+        return dict(
+            torrent_data,
+            info_hash=info_hash,
+            magnet_link=rest,
+            tracker_set_id=self._resolve_tracker_set_id(session, join_trackers(trackers))
+        )
+
+    def _load_existing(self, session, torrents: List[Dict[str, Any]]):
+        """기존 행을 info hash, source_id, 제목 순으로 IN (...) 조회하여 메모리 맵 생성
+
+        같은 행은 먼저 찾은 쪽의 dict를 공유한다 (한 배치 안에서 변경이 한 곳에 모이도록).
+        """
+        t = self.table
+        fields = [t.c.id, t.c.info_hash, t.c.source_id, t.c.source_site, t.c.title, t.c.thumbnail_url,
+                  t.c.upload_date] + \
+                 [t.c[name] for name in SCORE_FIELDS]
+
+        by_id: Dict[int, dict] = {}
+        by_hash: Dict[str, dict] = {}
+        by_source: Dict[tuple, dict] = {}
+        by_title: Dict[str, dict] = {}
+
+        def load(rows):
+            for row in rows:
+                yield by_id.setdefault(row['id'], dict(row, _changes={}, _base_downloads=row['downloads'] or 0))
+
+        hashes = list({d['info_hash'] for d in torrents if d.get('info_hash')})
+        for chunk in _chunks(hashes):
+            rows = session.execute(select(*fields).where(t.c.info_hash.in_(chunk)).order_by(t.c.id)).mappings()
+            for existing in load(rows):
+                # 같은 hash가 여러 개면 가장 먼저 저장된 행 사용
+                by_hash.setdefault(existing['info_hash'], existing)
+
+        # info hash로 못 찾은 항목만 source_id로 조회
+        source_ids = list({
+            d.get('source_id') for d in torrents
+            if d.get('source_id') and d.get('source_site') and d.get('info_hash') not in by_hash
+        })
+        for chunk in _chunks(source_ids):
+            for existing in load(session.execute(select(*fields).where(t.c.source_id.in_(chunk))).mappings()):
+                by_source[(existing['source_site'], existing['source_id'])] = existing
+
+        # 둘 다 못 찾은 항목만 제목으로 조회
+        titles = list({
+            d.get('title') for d in torrents
+            if d.get('title') and d.get('info_hash') not in by_hash
+            and (d.get('source_site'), d.get('source_id')) not in by_source
+        })
+        for chunk in _chunks(titles):
+            rows = session.execute(
+                select(*fields).where(t.c.title.in_(chunk)).order_by(t.c.id)
+            ).mappings()
+            for existing in load(rows):
+                # 같은 제목이 여러 개면 가장 먼저 저장된 행 사용
+                by_title.setdefault(existing['title'], existing)
+
+        return by_hash, by_source, by_title
+
+    def _load_archived(self, session, torrents: List[Dict[str, Any]], by_hash: dict, by_source: dict):
+        """본 DB에서 못 찾은 항목 중 보관 DB에 있는 info hash, (source_site, source_id) 조회"""
+        if self._archive_attached is None:
+            self._archive_attached = archive.is_attached(session.connection())
+        if not self._archive_attached:
+            return set(), set()
+        hashes = {d['info_hash'] for d in torrents if d.get('info_hash') and d['info_hash'] not in by_hash}
+        source_ids = {
+            d['source_id'] for d in torrents
+            if d.get('source_id') and d.get('source_site') and (d['source_site'], d['source_id']) not in by_source
+        }
+        return archive.archived_keys(session.connection(), hashes, source_ids)
+
+    def _apply_rules(self, existing: dict, torrent_data: Dict[str, Any]) -> str:
+        """중복 항목 처리 규칙 (다운로드수 비교) - existing['_changes']에 변경 필드 기록"""
+        changes = existing.setdefault('_changes', {})
+        new_downloads = torrent_data.get('downloads', 0) or 0
+        existing_downloads = existing.get('downloads') or 0
+
+        # 새 항목의 다운로드수가 더 많으면 업데이트
+        if new_downloads > existing_downloads:
+            for key in REPLACE_FIELDS:
+                if key in torrent_data:
+                    existing[key] = torrent_data[key]
+                    changes[key] = torrent_data[key]
+
+            # 썸네일이 없었는데 새로 생겼으면 업데이트
+            if not existing.get('thumbnail_url') and torrent_data.get('thumbnail_url'):
+                existing['thumbnail_url'] = torrent_data.get('thumbnail_url')
+                changes['thumbnail_url'] = existing['thumbnail_url']
+                changes['snapshot_urls'] = torrent_data.get('snapshot_urls', '')
+                existing['snapshot_urls'] = changes['snapshot_urls']
+
+        # 기존 항목이 다운로드수가 더 많거나 같으면 중복으로 처리
+        # 단, _is_update 플래그가 있으면 통계 정보만 업데이트
+        elif torrent_data.get('_is_update', False):
+            for key in STAT_FIELDS:
+                if key in torrent_data:
+                    existing[key] = torrent_data[key]
+                    changes[key] = torrent_data[key]
+        else:
+            return 'duplicate'
+
+        # 인기도 점수 재계산 (POPULARITY_SCORER 공식)
+        existing['popularity_score'] = scoring.score_row(existing, existing.get('upload_date'))
+        changes['popularity_score'] = existing['popularity_score']
+        return 'updated'
+
+    def _new_row(self, torrent_data: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+        """INSERT용 전체 컬럼 딕셔너리 (executemany는 모든 행의 키가 같아야 함)"""
+        row = {name: None for name in self._columns}
+        row.update(self._defaults)
+        row['created_at'] = now
+        row['updated_at'] = now
+        for key, value in torrent_data.items():
+            # genres, _is_update 등 컬럼이 아닌 키는 제외
+            if key in row:
+                row[key] = value
+        row['popularity_score'] = scoring.score_row(row, row.get('upload_date'))
+        row['_changes'] = {}
+        return row
+
+    def _write_inserts(self, session, inserts: List[Dict[str, Any]], insert_genres: List[List[str]]):
+        """신규 행 INSERT (source_id 충돌 시 통계만 갱신) 후 장르 연결"""
+        t = self.table
+        genre_ids = [self._resolve_genre_ids(session, names) for names in insert_genres]
+        for row, ids in zip(inserts, genre_ids):
+            row['genre_mask'] = self._genre_mask(ids)
+        params = [{k: v for k, v in row.items() if not k.startswith('_')} for row in inserts]
+
+        stmt = sqlite_insert(t)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[t.c.source_id],
+            set_={
+                'seeders': stmt.excluded.seeders,
+                'leechers': stmt.excluded.leechers,
+                'downloads': stmt.excluded.downloads,
+                'popularity_score': stmt.excluded.popularity_score,
+                'updated_at': stmt.excluded.updated_at,
+                # 아래에서 기존 행에도 장르 연결이 추가되므로 마스크도 합침
+                'genre_mask': t.c.genre_mask.op('|')(stmt.excluded.genre_mask),
+            }
+        ).returning(t.c.id, t.c.source_id, t.c.title)
+        # sort_by_parameter_order는 SQLite upsert에서 한 행씩 실행되므로 쓰지 않고,
+        # 반환된 source_id(충돌 시 기존 행) / 제목(source_id가 없는 행)으로 입력 행과 맞춘다
+        # (한 배치의 신규 행은 _load_existing 규칙상 source_id와 제목이 서로 겹치지 않음)
+        by_source: Dict[str, int] = {}
+        by_title: Dict[str, int] = {}
+        for torrent_id, source_id, title in session.execute(stmt, params):
+            if source_id is not None:
+                by_source[source_id] = torrent_id
+            else:
+                by_title[title] = torrent_id
+
+        for row in inserts:
+            if row.get('source_id') is not None:
+                row['id'] = by_source.get(row['source_id'])
+            else:
+                row['id'] = by_title.get(row['title'])
+        ids = [row['id'] for row in inserts]
+
+        links = []
+        for torrent_id, row_genre_ids in zip(ids, genre_ids):
+            for genre_id in row_genre_ids:
+                links.append({'torrent_id': torrent_id, 'genre_id': genre_id})
+        if links:
+            session.execute(insert(torrent_genres).prefix_with('OR IGNORE'), links)
+
+    def _assign_clusters(self, session, inserts: List[Dict[str, Any]]):
+        """신규 행 제목 묶음 배정 (묶음에 품번이 같은 행의 썸네일이 있으면 복사)"""
+        conn = session.connection()
+        prepared = title_clusters.build_features([(row['id'], row['title']) for row in inserts])
+        assigned = title_clusters.assign_clusters(conn, prepared)
+        for torrent_id, cluster_id in assigned.items():
+            self.changes.record('update', torrent_id, {'cluster_id': cluster_id})
+        shared = title_clusters.share_cluster_thumbnails(
+            conn, [cluster_id for torrent_id, cluster_id in assigned.items() if cluster_id != torrent_id]
+        )
+        for torrent_id, thumbnail_url in shared:
+            self.changes.record('update', torrent_id, {'thumbnail_url': thumbnail_url})
+
+    def _write_updates(self, session, updates: Dict[int, Dict[str, Any]], now: datetime):
+        """기존 행 UPDATE (같은 필드 조합끼리 묶어서 executemany)"""
+        t = self.table
+        groups: Dict[tuple, List[Dict[str, Any]]] = {}
+        for torrent_id, changes in updates.items():
+            keys = tuple(sorted(changes))
+            params = {f'_{k}': changes[k] for k in keys}
+            params['_id'] = torrent_id
+            params['_updated_at'] = now
+            groups.setdefault(keys, []).append(params)
+
+        for keys, params in groups.items():
+            values = {k: bindparam(f'_{k}') for k in keys}
+            values['updated_at'] = bindparam('_updated_at')
+            stmt = update(t).where(t.c.id == bindparam('_id')).values(**values)
+            session.execute(stmt, params)
+
+    def _write_stats(self, session, inserted: List[Dict[str, Any]], updated: List[Dict[str, Any]]):
+        """torrent_stats에 현재 시간 구간 통계 기록 (같은 구간은 덮어쓰고 완료수 증가량은 누적)
+
+        신규 행은 업로드가 급상승 집계 기간 안일 때만 현재 완료수를 증가량으로 본다
+        (오래된 토렌트를 처음 수집했을 때 누적 완료수가 급상승으로 잡히지 않도록).
+        """
+        bucket = int(time.time() // 3600)
+        recent = datetime.now() - timedelta(hours=TRENDING_WINDOW_HOURS)
+        params = []
+        for row in inserted:
+            upload_date = row.get('upload_date')
+            is_recent = isinstance(upload_date, datetime) and upload_date >= recent
+            params.append(self._stat_params(row, bucket, (row.get('downloads') or 0) if is_recent else 0))
+        for row in updated:
+            delta = (row.get('downloads') or 0) - row['_base_downloads']
+            params.append(self._stat_params(row, bucket, max(delta, 0)))
+            # 같은 인스턴스가 다시 쓰일 경우를 대비해 기준값 갱신
+            row['_base_downloads'] = row.get('downloads') or 0
+
+        s = TorrentStat.__table__
+        stmt = sqlite_insert(s)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[s.c.torrent_id, s.c.bucket],
+            set_={
+                'seeders': stmt.excluded.seeders,
+                'leechers': stmt.excluded.leechers,
+                'downloads_delta': s.c.downloads_delta + stmt.excluded.downloads_delta,
+            }
+        )
+        session.execute(stmt, [p for p in params if p['torrent_id'] is not None])
+
+    @staticmethod
+    def _stat_params(row: Dict[str, Any], bucket: int, downloads_delta: int) -> Dict[str, Any]:
+        return {
+            'torrent_id': row.get('id'),
+            'bucket': bucket,
+            'seeders': row.get('seeders') or 0,
+            'leechers': row.get('leechers') or 0,
+            'downloads_delta': downloads_delta,
+        }
+
+    def _resolve_genre_ids(self, session, genre_names: List[str]) -> List[int]:
+        """장르 이름 -> id 변환 (캐시에 없으면 조회, DB에도 없으면 생성)"""
+        names = [n for n in genre_names if isinstance(n, str) and n.strip()]
+        missing = [n for n in names if n not in self._genre_ids]
+        if missing:
+            rows = session.execute(
+                select(Genre.id, Genre.name, Genre.bit).where(Genre.name.in_(missing))
+            ).all()
+            for genre_id, name, bit in rows:
+                self._genre_ids[name] = genre_id
+                self._genre_bits[genre_id] = bit
+            for name in missing:
+                if name not in self._genre_ids:
+                    bit = self._next_genre_bit(session)
+                    result = session.execute(insert(Genre.__table__).values(name=name, bit=bit))
+                    self._genre_ids[name] = result.inserted_primary_key[0]
+                    self._genre_bits[self._genre_ids[name]] = bit
+        return [self._genre_ids[n] for n in names]
+
+    @staticmethod
+    def _next_genre_bit(session) -> Optional[int]:
+        """새 장르에 줄 genre_mask 비트 (다 쓰면 None, 그 장르는 torrent_genres로만 필터)"""
+        last = session.execute(select(func.max(Genre.bit))).scalar()
+        bit = 0 if last is None else last + 1
+        return bit if bit < GENRE_MASK_BITS else None
+
+    def _genre_mask(self, genre_ids: List[int]) -> int:
+        mask = 0
+        for genre_id in genre_ids:
+            bit = self._genre_bits.get(genre_id)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def _resolve_tracker_set_id(self, session, trackers: str) -> Optional[int]:
+        """tracker 목록 -> tracker_sets.id (캐시에 없으면 조회, DB에도 없으면 생성)"""
+        if not trackers:
+            return None
+        set_id = self._tracker_set_ids.get(trackers)
+        if set_id is None:
+            t = TrackerSet.__table__
+            set_id = session.execute(select(t.c.id).where(t.c.trackers == trackers)).scalar()
+            if set_id is None:
+                set_id = session.execute(insert(t).values(trackers=trackers)).inserted_primary_key[0]
+            self._tracker_set_ids[trackers] = set_id
+        return set_id
+
+    def reset_cache(self):
+        """장르/tracker 목록 캐시 초기화 (트랜잭션 롤백으로 새로 만든 행이 사라진 경우)"""
+        self._genre_ids.clear()
+        self._genre_bits.clear()
+        self._tracker_set_ids.clear()
@@ -0,0 +1,392 @@
+"""
+정렬/필터 컬럼 메모리 인덱스 (numpy)
+torrents의 정렬/필터 컬럼만 id 순서 배열로 올려두고, 필터는 배열 마스크로, 정렬은 컬럼별로 미리 정렬해 둔
+위치 배열로 처리해서 페이지에 들어갈 id만 구한다. 행 내용은 그 id로 SQLite에서 읽는다.
+
+- Database가 시작할 때 백그라운드에서 load()로 채운다 (다 읽기 전에는 SQL로 조회)
+- DBWriterThread는 커밋 후 바뀐 id를 apply_changes()로 넘기고, 인덱스는 그 행만 다시 읽는다
+- 급상승/인기도 일괄 재계산처럼 컬럼 전체가 바뀌면 reload_columns()로 그 컬럼만 다시 읽는다
+- 검색어 필터, 비트가 없는 장르, 인덱스에 없는 정렬 컬럼(제목 등)은 처리하지 않는다 (None 반환, SQL 사용)
+"""
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from .trending import NUMPY_AVAILABLE, read_array
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+# 정렬 컬럼 이름 -> 읽기 식 (NULL은 SQLite 정렬처럼 가장 작은 값)
+NULL_VALUE = -1e308
+SORT_COLUMNS = {
+    'upload_date': 'julianday(upload_date)',
+    'seeders': 'seeders',
+    'leechers': 'leechers',
+    'downloads': 'downloads',
+    'size_bytes': 'size_bytes',
+    'popularity_score': 'popularity_score',
+    'trending_score': 'trending_score',
+}
+
+# 필터 컬럼 읽기 식 (genre_mask는 63비트라 float64에 정확히 들어가지 않으므로 int64로 따로 읽음)
+_INT_SQL = "SELECT id, COALESCE(censored, -1), COALESCE(genre_mask, 0) FROM torrents"
+_VALUE_SQL = "SELECT " + ", ".join(
+    f"COALESCE({expr}, {NULL_VALUE})" for expr in SORT_COLUMNS.values()
+) + " FROM torrents"
+_COUNTRY_SQL = "SELECT country FROM torrents"
+
+# apply_changes에서 IN (...) 한 번에 넣는 id 수
+IN_CHUNK_SIZE = 500
+
+# 정렬 순서를 만든 뒤 바뀐 행이 이 수(또는 전체의 2%)를 넘으면 정렬 순서를 다시 만듦
+REBUILD_MIN_CHANGES = 10000
+
+# 1970-01-01 00:00:00의 julianday
+_UNIX_EPOCH_JULIAN = 2440587.5
+
+
+def _julianday(value: datetime) -> float:
+    """datetime -> SQLite julianday 값 (시간대 없는 값 그대로)"""
+    return (value - datetime(1970, 1, 1)).total_seconds() / 86400 + _UNIX_EPOCH_JULIAN
+
+
+class _SortedRun:
+    """정렬 컬럼 하나의 정렬 순서 (만든 시점 값 기준) + 그 뒤에 바뀌거나 추가된 위치
+
+    바뀐 행은 정렬 순서 안에서는 stale로 건너뛰고, 조회할 때 dirty 위치만 현재 값으로 따로 정렬해서 합친다.
+    변경 반영은 바뀐 행 수만큼의 비용이고, 전체 재정렬은 dirty가 많이 쌓였을 때만 한다.
+    """
+    __slots__ = ('order', 'sorted_values', 'stale', 'dirty')
+
+    def __init__(self, values: 'np.ndarray'):
+        # id 순서 배열이므로 stable 정렬이면 같은 값은 id 순서 (ORDER BY 값, id와 같음)
+        self.order = np.argsort(values, kind='stable')
+        self.sorted_values = values[self.order]
+        self.stale = np.zeros(len(values), dtype=bool)
+        self.dirty = set()
+
+    def mark(self, positions: Iterable[int]):
+        for pos in positions:
+            if pos < len(self.stale):
+                self.stale[pos] = True
+            self.dirty.add(pos)
+
+    def bounds(self, value: float, pos: int) -> tuple:
+        """(값, 위치) 키의 정렬 순서 안 경계 (키보다 작은 항목 수, 키 이하 항목 수)"""
+        lo = int(np.searchsorted(self.sorted_values, value, side='left'))
+        hi = int(np.searchsorted(self.sorted_values, value, side='right'))
+        ties = self.order[lo:hi]  # 같은 값 구간은 위치 오름차순
+        return lo + int(np.searchsorted(ties, pos, side='left')), lo + int(np.searchsorted(ties, pos, side='right'))
+
+
+class CatalogIndex:
+    """torrents 정렬/필터 컬럼 배열 (id 오름차순, 스레드 안전)
+
+    배열은 용량을 두 배씩 늘리며 새 id는 끝에 붙인다. 삭제된 행은 alive=False로만 표시한다.
+    정렬 컬럼마다 _SortedRun을 로드할 때 만들어 두고, 행이 바뀌면 바뀐 위치만 표시한다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.ready = False
+        self._pending_ids = set()  # 로드 중에 들어온 변경 id
+        self._size = 0
+        self._ids = None
+        self._alive = None
+        self._censored = None
+        self._country = None
+        self._genre_mask = None
+        self._values = {}
+        self._country_codes: Dict[str, int] = {}  # 국가 코드 -> 번호 (NULL은 -1)
+        self._runs: Dict[str, _SortedRun] = {}  # 정렬 컬럼 -> 정렬 순서
+
+    def load(self, db):
+        """전체 행 로드 (Database가 백그라운드 스레드에서 호출)"""
+        start = time.time()
+        try:
+            with db.read_engine.connect() as conn:
+                raw = conn.connection.driver_connection
+                # 세 번 나눠 읽는 동안 행이 추가돼도 순서가 어긋나지 않도록 한 스냅샷에서 읽음
+                raw.execute("BEGIN")
+                try:
+                    ints = read_array(conn, _INT_SQL + " ORDER BY id", (), width=3)
+                    values = read_array(conn, _VALUE_SQL + " ORDER BY id", (), width=len(SORT_COLUMNS),
+                                        dtype=np.float64)
+                    cursor = raw.execute(_COUNTRY_SQL + " ORDER BY id")
+                    try:
+                        countries = np.fromiter((self._country_code(c) for (c,) in cursor), dtype=np.int32)
+                    finally:
+                        cursor.close()
+                finally:
+                    raw.rollback()
+        except Exception as e:
+            print(f"[DB] 카탈로그 인덱스 로드 오류: {e}")
+            return
+
+        # 정렬 순서는 ready 전에 (조회/변경이 배열을 건드리지 않는 동안) 미리 만듦
+        columns = {name: values[:, i].copy() for i, name in enumerate(SORT_COLUMNS)}
+        runs = {name: _SortedRun(array) for name, array in columns.items()}
+        with self._lock:
+            self._size = len(ints)
+            self._ids = ints[:, 0].copy()
+            self._alive = np.ones(len(ints), dtype=bool)
+            self._censored = ints[:, 1].astype(np.int8)
+            self._genre_mask = ints[:, 2].copy()
+            self._country = countries
+            self._values = columns
+            self._runs = runs
+            pending = list(self._pending_ids)
+            self._pending_ids.clear()
+            self.ready = True
+        if pending:
+            self.apply_changes(db, pending)
+        print(f"[DB] 카탈로그 인덱스 로드: {self._size}건 ({time.time() - start:.1f}초)")
+
+    def _country_code(self, country: Optional[str]) -> int:
+        if not country:
+            return -1
+        code = self._country_codes.get(country)
+        if code is None:
+            code = self._country_codes[country] = len(self._country_codes)
+        return code
+
+    def apply_changes(self, db, ids: Iterable[int]):
+        """추가/변경/삭제된 행을 SQLite에서 다시 읽어 반영 (DBWriterThread 커밋 후)"""
+        ids = sorted(set(ids))
+        if not ids:
+            return
+        with self._lock:
+            if not self.ready:
+                self._pending_ids.update(ids)
+                return
+
+        found = []
+        with db.read_engine.connect() as conn:
+            for i in range(0, len(ids), IN_CHUNK_SIZE):
+                chunk = ids[i:i + IN_CHUNK_SIZE]
+                where = f" WHERE id IN ({', '.join('?' * len(chunk))}) ORDER BY id"
+                ints = read_array(conn, _INT_SQL + where, tuple(chunk), width=3)
+                values = read_array(conn, _VALUE_SQL + where, tuple(chunk), width=len(SORT_COLUMNS),
+                                    dtype=np.float64)
+                countries = [c for (c,) in conn.connection.driver_connection.execute(_COUNTRY_SQL + where, chunk)]
+                # 세 조회 사이에 삭제된 행이 있으면 어긋나므로 건너뜀 (다음 변경 때 다시 반영)
+                if len(ints) == len(values) == len(countries):
+                    found.append((ints, values, countries))
+
+        with self._lock:
+            present = set()
+            changed = []
+            for ints, values, countries in found:
+                for row, (torrent_id, censored, genre_mask) in enumerate(ints.tolist()):
+                    pos = self._position(torrent_id, create=True)
+                    changed.append(pos)
+                    self._alive[pos] = True
+                    self._censored[pos] = censored
+                    self._genre_mask[pos] = genre_mask
+                    self._country[pos] = self._country_code(countries[row])
+                    for i, name in enumerate(SORT_COLUMNS):
+                        self._values[name][pos] = values[row, i]
+                    present.add(torrent_id)
+            # DB에 없는 id는 삭제된 행
+            for torrent_id in ids:
+                if torrent_id not in present:
+                    pos = self._position(torrent_id)
+                    if pos is not None:
+                        self._alive[pos] = False
+            for run in self._runs.values():
+                run.mark(changed)
+
+    def reload_columns(self, db, names: Iterable[str]):
+        """정렬 컬럼 전체 다시 읽기 (급상승/인기도 일괄 재계산 후)"""
+        names = [name for name in names if name in SORT_COLUMNS]
+        with self._lock:
+            if not names or not self.ready:
+                return
+            size = self._size
+            last_id = int(self._ids[size - 1]) if size else 0
+        sql = "SELECT id, " + ", ".join(
+            f"COALESCE({SORT_COLUMNS[name]}, {NULL_VALUE})" for name in names
+        ) + " FROM torrents WHERE id <= ? ORDER BY id"
+        with db.read_engine.connect() as conn:
+            data = read_array(conn, sql, (last_id,), width=len(names) + 1, dtype=np.float64)
+
+        with self._lock:
+            ids = self._ids[:self._size]
+            data_ids = data[:, 0].astype(np.int64)
+            positions = np.minimum(np.searchsorted(ids, data_ids), max(self._size - 1, 0))
+            # 인덱스에 없는 id (아직 apply_changes 전)는 건너뜀
+            matched = ids[positions] == data_ids if self._size else np.zeros(len(data_ids), dtype=bool)
+            for i, name in enumerate(names):
+                self._values[name][positions[matched]] = data[matched, i + 1]
+                self._runs.pop(name, None)
+            snapshot = {name: self._values[name][:self._size].copy() for name in names}
+
+        # 정렬 순서는 잠금 밖에서 다시 만들고, 그 사이 행이 바뀌지 않았을 때만 교체 (바뀌었으면 조회 시 생성)
+        runs = {name: _SortedRun(values) for name, values in snapshot.items()}
+        with self._lock:
+            for name, run in runs.items():
+                if name not in self._runs and len(snapshot[name]) == self._size and \
+                        np.array_equal(snapshot[name], self._values[name][:self._size]):
+                    self._runs[name] = run
+
+    def _position(self, torrent_id: int, create: bool = False) -> Optional[int]:
+        """id의 배열 위치 (create=True면 없을 때 자리를 만듦, 잠금 안에서 호출)"""
+        ids = self._ids[:self._size]
+        pos = int(np.searchsorted(ids, torrent_id))
+        if pos < self._size and ids[pos] == torrent_id:
+            return pos
+        if not create:
+            return None
+        if self._size == len(self._ids):
+            self._grow(max(1024, self._size * 2))
+        if pos < self._size:
+            # 중간 id (드묾): 뒤쪽을 한 칸씩 밀고, 위치가 바뀌었으므로 정렬 순서는 조회 시 다시 만듦
+            for array in self._arrays():
+                array[pos + 1:self._size + 1] = array[pos:self._size]
+            self._runs = {}
+        self._ids[pos] = torrent_id
+        self._size += 1
+        return pos
+
+    def _arrays(self) -> List['np.ndarray']:
+        return [self._ids, self._alive, self._censored, self._country, self._genre_mask, *self._values.values()]
+
+    def _grow(self, capacity: int):
+        def grown(array):
+            result = np.zeros(capacity, dtype=array.dtype)
+            result[:self._size] = array[:self._size]
+            return result
+        self._ids = grown(self._ids)
+        self._alive = grown(self._alive)
+        self._censored = grown(self._censored)
+        self._country = grown(self._country)
+        self._genre_mask = grown(self._genre_mask)
+        self._values = {name: grown(array) for name, array in self._values.items()}
+
+    def _run(self, name: str) -> _SortedRun:
+        """정렬 컬럼 정렬 순서 (없거나 바뀐 행이 많이 쌓였으면 다시 만듦, 잠금 안에서 호출)"""
+        run = self._runs.get(name)
+        if run is None or len(run.dirty) > max(REBUILD_MIN_CHANGES, self._size // 50):
+            run = self._runs[name] = _SortedRun(self._values[name][:self._size].copy())
+        return run
+
+    def page(
+        self,
+        sort_by: str,
+        sort_order: str = 'desc',
+        limit: int = 50,
+        since: Optional[datetime] = None,
+        censored: Optional[bool] = None,
+        country: Optional[str] = None,
+        genre_mask: int = 0,
+        cursor: Optional[tuple] = None,
+        direction: str = 'next',
+        skip: int = 0
+    ) -> Optional[List[int]]:
+        """필터 + 정렬 + 페이지 id 목록 (Database.get_torrents_page와 같은 순서)
+
+        정렬 순서를 화면 방향으로 조금씩 늘려 가며 읽고 필터 마스크를 통과한 위치만 모은 뒤,
+        정렬 순서를 만든 뒤 바뀐 행(dirty) 중 조건에 맞는 것과 합쳐 다시 정렬한다.
+        앞쪽 페이지는 페이지 크기만큼만, 조건이 드물거나 먼 페이지도 배열을 한 번 훑는 것으로 끝난다.
+
+        Args:
+            sort_by: SORT_COLUMNS 이름
+            since: 기간 필터 시작 시각 (upload_date >= since)
+            genre_mask: 모두 가져야 하는 장르 비트
+            cursor: 기준 행의 (정렬 값, id). 인덱스 값과 다르면 (그 사이 바뀐 행) None 반환
+
+        Returns:
+            화면 순서 id 리스트, 처리할 수 없으면 None
+        """
+        if sort_by not in SORT_COLUMNS:
+            return None
+        with self._lock:
+            if not self.ready:
+                return None
+            size = self._size
+            mask = self._alive[:size].copy()
+            if since is not None:
+                mask &= self._values['upload_date'][:size] >= _julianday(since)
+            if censored is not None:
+                mask &= self._censored[:size] == int(censored)
+            if country and country != 'ALL':
+                code = self._country_codes.get(country)
+                if code is None:
+                    return []
+                mask &= self._country[:size] == code
+            if genre_mask:
+                mask &= (self._genre_mask[:size] & genre_mask) == genre_mask
+
+            run = self._run(sort_by)
+            values = self._values[sort_by]
+            # 읽는 방향이 정렬 순서의 역방향인지 (내림차순 next, 오름차순 prev)
+            backward = (sort_order == 'desc') == (direction == 'next')
+            if cursor is None:
+                key = None
+                sequence = run.order[::-1] if sort_order == 'desc' else run.order
+                backward = sort_order == 'desc'
+            else:
+                key = self._cursor_key(sort_by, cursor)
+                if key is None:
+                    return None
+                before, through = run.bounds(*key)
+                sequence = run.order[:before][::-1] if backward else run.order[through:]
+
+            # 정렬 순서에서 필요한 개수만큼 (바뀐 행은 건너뜀, 정렬 순서에는 만든 시점의 위치만 있음)
+            needed = skip + limit
+            main_mask = mask[:len(run.stale)] & ~run.stale if run.dirty else mask
+            found = []
+            found_count = 0
+            start = 0
+            chunk = max(needed * 4, 4096)
+            while found_count < needed and start < len(sequence):
+                positions = sequence[start:start + chunk]
+                hits = positions[main_mask[positions]]
+                found.append(hits)
+                found_count += len(hits)
+                start += chunk
+                chunk *= 4
+
+            candidates = np.concatenate(found)[:needed] if found else np.empty(0, dtype=np.int64)
+
+            # 바뀐 행 중 조건에 맞고 커서 뒤(읽는 방향 기준)에 있는 것을 합쳐서 (값, 위치) 순으로 다시 정렬
+            if run.dirty:
+                dirty = np.fromiter(run.dirty, dtype=np.int64, count=len(run.dirty))
+                dirty = dirty[mask[dirty]]
+                if key is not None and len(dirty):
+                    dirty_values = values[dirty]
+                    if backward:
+                        keep = (dirty_values < key[0]) | ((dirty_values == key[0]) & (dirty < key[1]))
+                    else:
+                        keep = (dirty_values > key[0]) | ((dirty_values == key[0]) & (dirty > key[1]))
+                    dirty = dirty[keep]
+                if len(dirty):
+                    candidates = np.concatenate([candidates, dirty])
+                    candidates = candidates[np.lexsort((candidates, values[candidates]))]
+                    if backward:
+                        candidates = candidates[::-1]
+            selected = candidates[skip:needed]
+            if cursor is not None and direction == 'prev':
+                selected = selected[::-1]
+            return self._ids[selected].tolist()
+
+    def _cursor_key(self, sort_by: str, cursor: tuple) -> Optional[tuple]:
+        """커서 (정렬 값, id) -> (인덱스 값, 배열 위치) (커서 값이 인덱스 값과 다르면 None)"""
+        value, torrent_id = cursor
+        pos = self._position(torrent_id)
+        if pos is None or not self._alive[pos]:
+            return None
+        if value is None:
+            expected = NULL_VALUE
+        elif isinstance(value, datetime):
+            expected = _julianday(value)
+        else:
+            try:
+                expected = float(value)
+            except (TypeError, ValueError):
+                return None
+        current = self._values[sort_by][pos]
+        if abs(current - expected) > 1e-6:
+            return None
+        return current, pos
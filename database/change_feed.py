@@ -0,0 +1,64 @@
+"""
+커밋 단위 행 변경 피드
+DBWriterThread가 커밋 창 동안 추가/수정한 행과 바뀐 필드를 모아 두었다가 커밋 후 한 번에 내보낸다.
+GUI는 이 피드로 현재 페이지에 보이는 행만 고치고 목록 전체를 다시 불러오지 않는다.
+"""
+from typing import Any, Dict, List
+
+
+class RowChange:
+    """행 하나의 변경 (같은 커밋 안의 여러 변경은 하나로 합쳐짐)
+
+    op: 'insert' (커밋 창 안에서 새로 추가된 행), 'update' 또는 'delete'
+    fields: 바뀐 컬럼 -> 새 값 (insert는 추가 시점의 전체 컬럼 + 이후 변경, delete는 비어 있음)
+    """
+    __slots__ = ('op', 'torrent_id', 'fields')
+
+    def __init__(self, op: str, torrent_id: int, fields: Dict[str, Any]):
+        self.op = op
+        self.torrent_id = torrent_id
+        self.fields = fields
+
+    def __repr__(self):
+        return f"<RowChange({self.op}, id={self.torrent_id}, fields={sorted(self.fields)})>"
+
+
+class ChangeSet:
+    """커밋 창 동안의 변경 기록
+
+    기록은 순서대로 쌓고 pop()에서 행별로 합친다.
+    SAVEPOINT가 롤백되면 mark()로 받은 위치 이후 기록을 rollback_to()로 버린다.
+    """
+
+    def __init__(self):
+        self._log: List[tuple] = []  # (op, torrent_id, fields)
+
+    def record(self, op: str, torrent_id: int, fields: Dict[str, Any]):
+        if torrent_id is not None:
+            self._log.append((op, torrent_id, fields))
+
+    def mark(self) -> int:
+        return len(self._log)
+
+    def rollback_to(self, mark: int):
+        del self._log[mark:]
+
+    def __bool__(self):
+        return bool(self._log)
+
+    def pop(self) -> List[RowChange]:
+        """행별로 합친 변경 목록을 꺼내고 비움 (처음 기록된 순서)"""
+        merged: Dict[int, RowChange] = {}
+        for op, torrent_id, fields in self._log:
+            change = merged.get(torrent_id)
+            if change is None:
+                merged[torrent_id] = RowChange(op, torrent_id, dict(fields))
+            elif op == 'delete':
+                # 삭제 이전 변경은 의미가 없음
+                change.op = op
+                change.fields = {}
+            else:
+                # insert 이후 update는 insert로 유지, 나중 값이 이김
+                change.fields.update(fields)
+        self._log = []
+        return list(merged.values())
@@ -1,22 +1,43 @@
 """데이터베이스 연결 및 세션 관리"""
 import os
+import re
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 import requests
 from bs4 import BeautifulSoup
-from sqlalchemy import create_engine, desc, and_
+from sqlalchemy import create_engine, desc, and_, or_, event, text, select, func, case, delete, union_all
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import sessionmaker, Session
-from .models import Base, Torrent, Genre, Country
+from .magnet import parse_info_hash, build_magnet
+from . import archive, maintenance
+from .models import (
+    Torrent, TorrentRow, Genre, Country, ThumbnailAttempt, TrackerSet, TorrentStat, TitleLshBucket,
+    torrent_genres, torrents_fts
+)
+from config import (
+    DB_WAL_MODE, DB_SYNCHRONOUS, DB_CACHE_SIZE_KB, DB_MMAP_SIZE,
+    DB_BUSY_TIMEOUT_MS, DB_READ_POOL_SIZE, DB_OPTIMIZE_INTERVAL,
+    PAGE_ANCHOR_STRIDE, PAGE_ANCHOR_TTL, COUNT_CACHE_TTL, COUNT_EXACT_LIMIT,
+    THUMBNAIL_FC2_TITLE_PATTERN, THUMBNAIL_SERVER_CLASSES, TRENDING_UPDATE_INTERVAL, POPULARITY_RESCORE_INTERVAL, TIME_RANGE_DAYS,
+    CATALOG_INDEX_ENABLED, TITLE_CLUSTERING_ENABLED, ARCHIVE_ENABLED, ARCHIVE_AFTER_DAYS, ARCHIVE_INTERVAL
+)
 
 
 class Database:
     """데이터베이스 관리 클래스"""
     
-    def __init__(self, db_path: str = "./torrents.db"):
+    # 개수 / 패싯 조회 조건에 쓰는 컬럼 (기존 행에서 바뀌면 필터별 캐시를 무효화)
+    FILTER_COLUMNS = frozenset({'upload_date', 'censored', 'country', 'genre_mask', 'title'})
+    
+    def __init__(self, db_path: str = "./torrents.db", background_tasks: bool = True):
         """데이터베이스 초기화
         
         Args:
             db_path: 데이터베이스 파일 경로 (기본값: 현재 디렉토리)
+            background_tasks: False면 백그라운드 스레드(PRAGMA optimize, 급상승 점수, 카탈로그 인덱스,
+                제목 묶음 배정, 보관 DB 이동)를 시작하지 않음 (한 번 실행하고 끝나는 CLI 스크립트용)
         """
         import os
         
@@ -30,117 +51,224 @@ class Database:
         else:
             print(f"[DB] 기존 데이터베이스 로드: {db_path}")
         
-        # 엔진 생성 (DB lock 방지를 위한 timeout 설정)
-        self.engine = create_engine(
-            f'sqlite:///{db_path}',
-            echo=False,
-            connect_args={
-                'check_same_thread': False,  # 멀티스레드 지원
-                'timeout': 30  # DB lock 대기 시간 30초
-            }
-        )
+        # WAL 모드 전환 (DB 파일에 영구 저장됨, 읽기와 쓰기가 서로 막지 않음)
+        if DB_WAL_MODE:
+            self._enable_wal()
+
+        # 보관 DB (오래된 토렌트, 모든 연결에 'archive' 스키마로 ATTACH)
+        self.archive_path = archive.archive_path(db_path) if ARCHIVE_ENABLED else None
+
+        # 엔진 생성
+        # - engine: 일반 읽기/쓰기 (마이그레이션, 유지보수 작업)
+        # - write_engine: DBWriterThread 전용 단일 쓰기 연결
+        # - read_engine: GUI/썸네일 워커용 읽기 전용 연결 풀
+        self.engine = self._create_engine()
+        self.write_engine = self._create_engine(pool_size=1, explicit_begin=True)
+        self.read_engine = self._create_engine(pool_size=DB_READ_POOL_SIZE, read_only=True)
         self.SessionLocal = sessionmaker(bind=self.engine)
+        self.WriteSessionLocal = sessionmaker(bind=self.write_engine)
+        self.ReadSessionLocal = sessionmaker(bind=self.read_engine)
+
+        # 조회 캐시 (페이지 앵커 등), DBWriterThread 커밋 시 data_version 증가로 무효화
+        self._cache_lock = threading.Lock()
+        self._data_version = 0
+        self._page_anchor_cache = {}
+        # 총 개수 캐시 - 행 추가 시에만 row_version 증가 (썸네일/통계 갱신은 개수에 영향 없음)
+        self._row_version = 0
+        self._count_cache = {}
+        # 필터 패널 항목별 개수 캐시 (get_facet_counts)
+        self._facet_cache = {}
+        # 장르 이름 -> genre_mask 비트 ((장르 수, {이름: 비트}), _get_genre_bits 참고)
+        self._genre_bits = None
+
+        # 주기적 PRAGMA optimize (백그라운드)
+        self._stop_event = threading.Event()
+        self._optimize_thread = None
+        if background_tasks and DB_OPTIMIZE_INTERVAL > 0:
+            self._optimize_thread = threading.Thread(target=self._optimize_loop, daemon=True)
+            self._optimize_thread.start()
+
+        # 스키마 마이그레이션 (최신 버전이면 schema_version 한 줄만 읽고 끝남)
+        # write_engine은 BEGIN IMMEDIATE로 시작하므로 DDL까지 마이그레이션 단위로 원자적으로 적용됨
+        from . import migrations
+        migrations.upgrade(self.write_engine)
         
-        # 테이블 생성 (없으면)
-        Base.metadata.create_all(self.engine)
+        # 제목 전문 검색 인덱스 (FTS5 미지원 SQLite면 LIKE 검색으로 대체)
+        with self.engine.connect() as conn:
+            self.fts_enabled = conn.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name='torrents_fts'"
+            )).first() is not None
         
-        if not db_exists:
-            print("[DB] 테이블 생성 완료")
+        # 급상승 점수 주기적 재계산 (백그라운드, numpy 필요)
+        self._trending_thread = None
+        if background_tasks and TRENDING_UPDATE_INTERVAL > 0:
+            from . import trending
+            if trending.NUMPY_AVAILABLE:
+                self._trending_thread = threading.Thread(target=self._trending_loop, daemon=True)
+                self._trending_thread.start()
+            else:
+                print("[DB] numpy가 설치되지 않아 급상승 점수를 계산하지 않습니다 (설치: pip install numpy)")
+        
+        # 백분위 / 시간 감쇠 인기도 공식이면 시작 시 한 번, 이후 주기적으로 전체 재계산 (백그라운드, numpy 필요)
+        if background_tasks and POPULARITY_RESCORE_INTERVAL > 0:
+            from . import scoring
+            if scoring.NUMPY_AVAILABLE and scoring.needs_rescore():
+                threading.Thread(target=self._rescore_loop, daemon=True).start()
+        
+        # 정렬/필터 컬럼 메모리 인덱스 (백그라운드 로드, 다 읽기 전에는 SQL로 조회)
+        self.catalog_index = None
+        if background_tasks and CATALOG_INDEX_ENABLED:
+            from . import catalog_index
+            if catalog_index.NUMPY_AVAILABLE:
+                self.catalog_index = catalog_index.CatalogIndex()
+                threading.Thread(target=self.catalog_index.load, args=(self,), daemon=True).start()
         
-        # 마이그레이션 실행 (기존 DB에 새 필드 추가)
-        self._migrate_database()
+        # 제목 묶음이 배정되지 않은 기존 행 채우기 (백그라운드, 새 행은 수집 시 바로 배정됨)
+        if background_tasks and TITLE_CLUSTERING_ENABLED:
+            threading.Thread(target=self._cluster_backfill, daemon=True).start()
         
-        # 초기 데이터 추가 (장르, 국가)
-        self._initialize_data()
+        # 보관 DB 스키마 맞추기 및 주기적 이동 (백그라운드)
+        if self.archive_path is not None:
+            archive.ensure_schema(self)
+            if background_tasks:
+                threading.Thread(target=self._archive_loop, daemon=True).start()
         
         if not db_exists:
             print("[DB] 데이터베이스 초기화 완료!")
     
-    def get_session(self) -> Session:
-        """새로운 데이터베이스 세션 반환"""
-        return self.SessionLocal()
-    
-    def _migrate_database(self):
-        """데이터베이스 마이그레이션 (기존 DB에 새 필드 추가)"""
-        from sqlalchemy import inspect, text
-        
+    def _create_engine(self, pool_size: int = 5, read_only: bool = False, explicit_begin: bool = False):
+        """연결 튜닝 PRAGMA가 적용된 엔진 생성
+
+        Args:
+            pool_size: 연결 풀 크기 (1이면 단일 연결)
+            read_only: True면 PRAGMA query_only로 쓰기 차단
+            explicit_begin: True면 트랜잭션을 BEGIN IMMEDIATE로 직접 시작
+                (pysqlite 자동 BEGIN 대신 사용, SAVEPOINT가 바깥 트랜잭션 안에서 동작)
+        """
+        engine = create_engine(
+            f'sqlite:///{self.db_path}',
+            echo=False,
+            pool_size=pool_size,
+            max_overflow=0 if pool_size == 1 else 2,
+            connect_args={
+                'check_same_thread': False,  # 멀티스레드 지원
+                'timeout': DB_BUSY_TIMEOUT_MS / 1000  # DB lock 대기 시간
+            }
+        )
+
+        @event.listens_for(engine, 'connect')
+        def _on_connect(dbapi_conn, connection_record):
+            cursor = dbapi_conn.cursor()
+            try:
+                cursor.execute(f"PRAGMA synchronous={DB_SYNCHRONOUS}")
+                cursor.execute(f"PRAGMA cache_size=-{DB_CACHE_SIZE_KB}")
+                cursor.execute(f"PRAGMA mmap_size={DB_MMAP_SIZE}")
+                cursor.execute(f"PRAGMA busy_timeout={DB_BUSY_TIMEOUT_MS}")
+                cursor.execute("PRAGMA temp_store=MEMORY")
+                # 썸네일 정리 등에서 쓰는 REGEXP 연산자 (database/maintenance.py)
+                dbapi_conn.create_function('regexp', 2, maintenance.regexp, deterministic=True)
+                if self.archive_path is not None:
+                    cursor.execute(f"ATTACH DATABASE ? AS {archive.SCHEMA}", (self.archive_path,))
+                    cursor.execute(f"PRAGMA {archive.SCHEMA}.synchronous={DB_SYNCHRONOUS}")
+                if read_only:
+                    cursor.execute("PRAGMA query_only=ON")
+            finally:
+                cursor.close()
+            if explicit_begin:
+                # 드라이버의 암묵적 트랜잭션 관리 끄기 (BEGIN은 아래 begin 이벤트에서)
+                dbapi_conn.isolation_level = None
+
+        if explicit_begin:
+            @event.listens_for(engine, 'begin')
+            def _on_begin(conn):
+                # 쓰기 잠금을 처음부터 잡아서 중간에 잠금 승격 실패(SQLITE_BUSY)가 없도록 함
+                conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+        return engine
+
+    def _enable_wal(self):
+        """WAL 저널 모드 활성화 (한 번 설정하면 DB 파일에 유지됨)"""
+        import sqlite3
         try:
-            inspector = inspect(self.engine)
-            columns = [col['name'] for col in inspector.get_columns('torrents')]
-            
-            # thumbnail_searched_servers 필드 추가
-            if 'thumbnail_searched_servers' not in columns:
-                print("[DB] 마이그레이션: thumbnail_searched_servers 필드 추가 중...")
-                with self.engine.connect() as conn:
-                    conn.execute(text(
-                        "ALTER TABLE torrents ADD COLUMN thumbnail_searched_servers TEXT DEFAULT '[]'"
-                    ))
-                    conn.commit()
-                print("[DB] 마이그레이션 완료: thumbnail_searched_servers 필드 추가됨")
+            conn = sqlite3.connect(self.db_path, timeout=DB_BUSY_TIMEOUT_MS / 1000)
+            try:
+                mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+                if mode.lower() != 'wal':
+                    print(f"[DB] WAL 모드 전환 실패 (현재 모드: {mode})")
+            finally:
+                conn.close()
         except Exception as e:
-            print(f"[DB] 마이그레이션 오류: {e}")
-            # 마이그레이션 실패해도 계속 진행
-    
-    def _initialize_data(self):
-        """초기 장르 및 국가 데이터 추가"""
-        session = self.get_session()
-        
+            print(f"[DB] WAL 모드 설정 오류: {e}")
+
+    def _optimize_loop(self):
+        """주기적으로 PRAGMA optimize 실행 (쿼리 플래너 통계 갱신)"""
+        while not self._stop_event.wait(DB_OPTIMIZE_INTERVAL):
+            self.optimize()
+
+    def _trending_loop(self):
+        """주기적으로 통계 기록 정리 및 급상승 점수 재계산"""
+        from . import trending
+        while not self._stop_event.wait(TRENDING_UPDATE_INTERVAL):
+            trending.refresh(self)
+
+    def _rescore_loop(self):
+        """시작 시 한 번, 이후 POPULARITY_RESCORE_INTERVAL마다 인기도 점수 재계산 (수집 경로의 백분위 분포 / 감쇠 갱신)"""
+        from . import scoring
+        while not self._stop_event.is_set():
+            try:
+                scoring.rescore_popularity(self)
+            except Exception as e:
+                print(f"[DB] 인기도 점수 재계산 오류: {e}")
+            if self._stop_event.wait(POPULARITY_RESCORE_INTERVAL):
+                return
+
+    def _cluster_backfill(self):
+        """cluster_id가 없는 기존 행에 제목 묶음 배정 (마이그레이션 직후 한 번)"""
+        from . import title_clusters
         try:
-            # 장르 초기화 (이미 있으면 스킵)
-            if session.query(Genre).count() == 0:
-                genres_data = [
-                    ('Blowjob', 'BJ/펠라치오'),
-                    ('Handjob', '핸드잡'),
-                    ('Threesome', '쓰리썸'),
-                    ('Creampie', '크림파이'),
-                    ('Anal', '항문'),
-                    ('BDSM', 'BDSM'),
-                    ('Bondage', '속박'),
-                    ('Cosplay', '코스프레'),
-                    ('Schoolgirl', '여학생'),
-                    ('MILF', '숙녀'),
-                    ('Amateur', '아마추어'),
-                    ('POV', 'POV'),
-                    ('Gangbang', '갱뱅'),
-                    ('Lesbian', '레즈비언'),
-                    ('Solo', '솔로'),
-                    ('Masturbation', '자위'),
-                    ('Toy', '도구'),
-                    ('Squirting', '분수'),
-                    ('Bukkake', '부카케'),
-                    ('Outdoor', '야외'),
-                    ('Massage', '마사지'),
-                    ('Office', '오피스'),
-                ]
-                
-                for name, name_kr in genres_data:
-                    genre = Genre(name=name, name_kr=name_kr)
-                    session.add(genre)
-            
-            # 국가 초기화 (이미 있으면 스킵)
-            if session.query(Country).count() == 0:
-                countries_data = [
-                    ('JP', 'Japan', '일본'),
-                    ('CN', 'China', '중국'),
-                    ('KR', 'Korea', '한국'),
-                    ('US', 'United States', '미국'),
-                    ('EU', 'Europe', '유럽'),
-                    ('TH', 'Thailand', '태국'),
-                    ('TW', 'Taiwan', '대만'),
-                    ('OTHER', 'Other', '기타'),
-                ]
-                
-                for code, name, name_kr in countries_data:
-                    country = Country(code=code, name=name, name_kr=name_kr)
-                    session.add(country)
-            
-            session.commit()
+            title_clusters.backfill_clusters(self, stop_event=self._stop_event)
         except Exception as e:
-            session.rollback()
-            print(f"초기 데이터 추가 실패: {e}")
-        finally:
-            session.close()
-    
+            print(f"[DB] 제목 묶음 배정 오류: {e}")
+
+    def _archive_loop(self):
+        """시작 시 한 번, 이후 ARCHIVE_INTERVAL마다 오래된 토렌트를 보관 DB로 이동"""
+        while not self._stop_event.is_set():
+            try:
+                archive.archive_old_torrents(self, stop_event=self._stop_event)
+            except Exception as e:
+                print(f"[DB] 보관 DB 이동 오류: {e}")
+            if ARCHIVE_INTERVAL <= 0 or self._stop_event.wait(ARCHIVE_INTERVAL):
+                return
+
+    def optimize(self):
+        """PRAGMA optimize 실행 (필요한 인덱스만 ANALYZE)"""
+        try:
+            with self.engine.connect() as conn:
+                conn.execute(text("PRAGMA optimize"))
+        except Exception as e:
+            print(f"[DB] PRAGMA optimize 오류: {e}")
+
+    def close(self):
+        """백그라운드 작업 중지 및 모든 연결 정리"""
+        self._stop_event.set()
+        if DB_OPTIMIZE_INTERVAL > 0:
+            # 종료 전에 한 번 더 통계 갱신
+            self.optimize()
+        for engine in (self.read_engine, self.write_engine, self.engine):
+            engine.dispose()
+
+    def get_session(self) -> Session:
+        """새로운 데이터베이스 세션 반환"""
+        return self.SessionLocal()
+
+    def get_read_session(self) -> Session:
+        """읽기 전용 세션 반환 (GUI 페이지 로드, 썸네일 워커 조회용)"""
+        return self.ReadSessionLocal()
+
+    def get_write_session(self) -> Session:
+        """DBWriterThread 전용 쓰기 세션 반환 (단일 연결)"""
+        return self.WriteSessionLocal()
+
     def add_torrent(self, session: Session, torrent_data: dict) -> Optional[Torrent]:
         """토렌트 추가 또는 업데이트
         
@@ -152,20 +280,27 @@ class Database:
             추가/업데이트된 Torrent 객체
         """
         try:
-            # 중복 확인: source_id 또는 제목으로 확인
+            # 중복 확인: info hash, source_id 또는 제목으로 확인
             existing = None
             source_id = torrent_data.get('source_id')
             source_site = torrent_data.get('source_site')
             title = torrent_data.get('title')
+            if not torrent_data.get('info_hash'):
+                torrent_data['info_hash'] = parse_info_hash(torrent_data.get('magnet_link'))
+            info_hash = torrent_data['info_hash']
             
-            # 1순위: source_id로 확인
-            if source_id and source_site:
+            # 1순위: info hash로 확인 (다른 소스/제목으로 올라온 같은 토렌트)
+            if info_hash:
+                existing = session.query(Torrent).filter_by(info_hash=info_hash).order_by(Torrent.id).first()
+            
+            # 2순위: source_id로 확인
+            if not existing and source_id and source_site:
                 existing = session.query(Torrent).filter_by(
                     source_id=source_id,
                     source_site=source_site
                 ).first()
             
-            # 2순위: 제목으로 확인 (source_id가 없거나 못 찾은 경우)
+            # 3순위: 제목으로 확인 (source_id가 없거나 못 찾은 경우)
             if not existing and title:
                 existing = session.query(Torrent).filter_by(
                     title=title
@@ -201,6 +336,135 @@ class Database:
             # 오류만 출력 (개별 항목 출력 제거)
             return None
     
+    def _search_conditions(self, table, search_query: Optional[str]) -> list:
+        """검색어 조건 생성 (띄어쓰기가 있으면 AND 조건으로 검색)
+        
+        3글자 이상 단어는 FTS5 trigram 인덱스로 찾고, trigram이 만들어지지 않는
+        1~2글자 단어만 LIKE 검색으로 처리한다. (보관 DB에는 FTS 인덱스가 없어서 모두 LIKE)
+        """
+        if not search_query:
+            return []
+        
+        # 띄어쓰기로 분리하여 각 단어가 모두 포함되는지 확인
+        search_words = [word.strip() for word in search_query.split() if word.strip()]
+        if not search_words:
+            return []
+        
+        conditions = []
+        fts_words = []
+        use_fts = self.fts_enabled and table.schema != archive.SCHEMA
+        for word in search_words:
+            if use_fts and len(word) >= 3:
+                fts_words.append(word)
+            else:
+                conditions.append(table.c.title.contains(word, autoescape=True))
+        
+        if fts_words:
+            # 각 단어를 구문(phrase)으로 감싸서 특수문자를 그대로 검색 (여러 구문은 AND)
+            match_expr = ' '.join('"' + word.replace('"', '""') + '"' for word in fts_words)
+            fts_ids = select(torrents_fts.c.rowid).where(torrents_fts.c.title.match(match_expr))
+            conditions.append(table.c.id.in_(fts_ids))
+        
+        return conditions
+    
+    def _filter_conditions(
+        self,
+        table,
+        period_days: Optional[int] = None,
+        censored: Optional[bool] = None,
+        country: Optional[str] = None,
+        genres: Optional[List[str]] = None,
+        search_query: Optional[str] = None
+    ) -> list:
+        """get_torrents/get_total_count 공통 필터 조건 생성
+        
+        Args:
+            table: 조건을 적용할 테이블 (Torrent.__table__ 또는 archive.archive_torrents)
+            
+        Returns:
+            WHERE 조건 리스트
+        """
+        conditions = []
+        
+        # 기간 필터
+        if period_days:
+            since_date = datetime.now() - timedelta(days=period_days)
+            # NULL 날짜도 제외
+            conditions.append(table.c.upload_date != None)  # noqa: E711
+            conditions.append(table.c.upload_date >= since_date)
+        
+        # 검열 필터
+        if censored is not None:
+            conditions.append(table.c.censored == censored)
+        
+        # 국가 필터
+        if country and country != 'ALL':
+            conditions.append(table.c.country == country)
+        
+        # 장르 필터 (선택한 장르를 모두 가진 항목)
+        # 비트가 있는 장르는 genre_mask 비트 AND 한 번으로, 비트가 없는 장르만 torrent_genres 조회
+        if genres:
+            genre_bits = self._get_genre_bits()
+            links = archive.genre_links(table)
+            mask = 0
+            for genre_name in genres:
+                bit = genre_bits.get(genre_name)
+                if bit is not None:
+                    mask |= 1 << bit
+                    continue
+                genre_ids = (
+                    select(links.c.torrent_id)
+                    .join(Genre.__table__, Genre.id == links.c.genre_id)
+                    .where(Genre.name == genre_name)
+                )
+                conditions.append(table.c.id.in_(genre_ids))
+            if mask:
+                conditions.append(table.c.genre_mask.op('&')(mask) == mask)
+        
+        # 검색어 필터
+        conditions.extend(self._search_conditions(table, search_query))
+        
+        return conditions
+    
+    def _get_genre_bits(self) -> Dict[str, int]:
+        """장르 이름 -> genre_mask 비트 (한 번 배정된 비트는 바뀌지 않으므로 캐시)
+
+        DBWriterThread가 새 장르를 만들 수 있으므로 캐시는 장르 수가 바뀌면 다시 읽는다.
+        """
+        with self.read_engine.connect() as conn:
+            count = conn.execute(select(func.count()).select_from(Genre.__table__)).scalar()
+            with self._cache_lock:
+                if self._genre_bits is not None and self._genre_bits[0] == count:
+                    return self._genre_bits[1]
+            rows = conn.execute(select(Genre.name, Genre.bit).where(Genre.bit.isnot(None))).all()
+        bits = {name: bit for name, bit in rows}
+        with self._cache_lock:
+            self._genre_bits = (count, bits)
+        return bits
+    
+    def _source_tables(self, period_days: Optional[int] = None) -> list:
+        """기간 조건에 필요한 토렌트 테이블 목록
+
+        보관 DB가 있으면 기간 '전체'나 보관 기준(ARCHIVE_AFTER_DAYS)보다 긴 기간에만 보관 테이블을 포함한다.
+        """
+        if self.archive_path is not None and (not period_days or period_days > ARCHIVE_AFTER_DAYS):
+            return [Torrent.__table__, archive.archive_torrents]
+        return [Torrent.__table__]
+    
+    def get_filtered_sources(
+        self,
+        period_days: Optional[int] = None,
+        censored: Optional[bool] = None,
+        country: Optional[str] = None,
+        genres: Optional[List[str]] = None,
+        search_query: Optional[str] = None
+    ) -> List[tuple]:
+        """필터에 맞는 (토렌트 테이블, WHERE 조건 리스트) 목록 (보관 DB 포함 기준은 get_torrents와 같음, 내보내기용)"""
+        return [
+            (table, self._filter_conditions(table, period_days, censored, country, genres, search_query))
+            for table in self._source_tables(period_days)
+        ]
+    
     def get_torrents(
         self,
         session: Session,
@@ -227,56 +491,359 @@ class Database:
             offset: 시작 위치
             
         Returns:
-            Torrent 객체 리스트
+            Torrent 객체 리스트 (보관 DB 행도 Torrent 객체로 반환, 읽기 전용으로 사용)
         """
-        query = session.query(Torrent)
+        tables = self._source_tables(period_days)
+        if len(tables) > 1:
+            return self._get_torrents_union(
+                session, tables, (period_days, censored, country, genres, search_query),
+                sort_by, sort_order, limit, offset
+            )
         
-        # 기간 필터
-        if period_days:
-            since_date = datetime.now() - timedelta(days=period_days)
-            # NULL 날짜도 제외
-            query = query.filter(
-                Torrent.upload_date != None,
-                Torrent.upload_date >= since_date
+        table = Torrent.__table__
+        query = session.query(Torrent).filter(*self._filter_conditions(
+            table, period_days, censored, country, genres, search_query
+        ))
+        
+        # 정렬 (파라미터에 따라, 동일 값은 id로 순서 고정)
+        query = query.order_by(*self._order_clauses(table, sort_by, sort_order))
+        
+        # 제한 및 오프셋
+        query = query.limit(limit).offset(offset)
+        
+        return query.all()
+    
+    def _get_torrents_union(self, session: Session, tables: list, filter_args: tuple,
+                            sort_by: str, sort_order: str, limit: int, offset: int) -> List[Torrent]:
+        """본 DB와 보관 DB를 UNION ALL로 함께 조회 (get_torrents의 기간 '전체')
+        
+        파일마다 정렬 인덱스로 앞의 offset + limit행만 읽은 뒤 합쳐서 다시 정렬한다.
+        """
+        branches = []
+        for table in tables:
+            branch = (
+                select(*[table.c[c.name] for c in Torrent.__table__.columns])
+                .where(*self._filter_conditions(table, *filter_args))
+                .order_by(*self._order_clauses(table, sort_by, sort_order))
+                .limit(offset + limit)
+                .subquery()
+            )
+            branches.append(select(branch))
+        combined = union_all(*branches).subquery()
+        stmt = (
+            select(combined)
+            .order_by(*self._order_clauses(combined, sort_by, sort_order))
+            .limit(limit)
+            .offset(offset)
+        )
+        return session.query(Torrent).from_statement(stmt).all()
+    
+    def _sort_column(self, table, sort_by: str):
+        """정렬 컬럼 반환 (size 필드 정렬 시 size_bytes를 사용, 알 수 없는 필드는 upload_date)"""
+        if sort_by == 'size':
+            return table.c.size_bytes
+        return table.c.get(sort_by, table.c.upload_date)
+    
+    def _order_clauses(self, table, sort_by: str, sort_order: str) -> list:
+        """ORDER BY 절 생성 (정렬 값 + id 타이브레이커)"""
+        sort_column = self._sort_column(table, sort_by)
+        if sort_order == 'desc':
+            return [desc(sort_column), desc(table.c.id)]
+        return [sort_column, table.c.id]
+    
+    def _keyset_condition(self, sort_column, id_column, cursor: tuple, descending: bool):
+        """커서 (정렬 값, id) 다음에 오는 행 조건
+        
+        SQLite는 NULL을 가장 작은 값으로 정렬하므로 (ASC: 맨 앞, DESC: 맨 뒤)
+        정렬 값이 NULL인 경우를 따로 처리한다.
+        """
+        value, last_id = cursor
+        if descending:
+            if value is None:
+                return and_(sort_column.is_(None), id_column < last_id)
+            return or_(
+                sort_column < value,
+                and_(sort_column == value, id_column < last_id),
+                sort_column.is_(None)
+            )
+        if value is None:
+            return or_(
+                and_(sort_column.is_(None), id_column > last_id),
+                sort_column.isnot(None)
             )
+        return or_(
+            sort_column > value,
+            and_(sort_column == value, id_column > last_id)
+        )
+    
+    def notify_data_changed(self, rows_added: int = 0, changed_ids: Optional[Iterable[int]] = None,
+                            changed_columns: Optional[Iterable[str]] = None, rows_removed: int = 0,
+                            changed_fields: Optional[Iterable[str]] = None):
+        """DB 내용이 바뀌었음을 알림 (DBWriterThread가 커밋 후 호출, 페이지 앵커 캐시 무효화)
         
-        # 검열 필터
-        if censored is not None:
-            query = query.filter(Torrent.censored == censored)
+        Args:
+            rows_added: 새로 추가된 토렌트 수 (0보다 크면 총 개수 캐시도 갱신)
+            changed_ids: 추가/변경/삭제된 토렌트 id (카탈로그 인덱스가 그 행만 다시 읽음)
+            changed_columns: 전체 행에서 값이 바뀐 정렬 컬럼 (카탈로그 인덱스가 그 컬럼만 다시 읽음)
+            rows_removed: 삭제되거나 보관 DB로 옮겨진 토렌트 수 (0보다 크면 총 개수 캐시 무효화)
+            changed_fields: changed_ids 기존 행에서 값이 바뀐 컬럼 (필터 컬럼이면 필터별 개수 캐시 무효화)
+        """
+        touched = set(changed_columns or ()) | set(changed_fields or ())
+        with self._cache_lock:
+            self._data_version += 1
+            if rows_added > 0:
+                self._row_version += 1
+                # 필터 없는 전체 개수는 다시 세지 않고 더해서 유지, 나머지는 버전 불일치로 무효화
+                unfiltered = self._count_cache.get(self._count_key())
+                if unfiltered is not None:
+                    count, _, cached_at = unfiltered
+                    self._count_cache[self._count_key()] = (count + rows_added, self._row_version, cached_at)
+            if rows_removed > 0:
+                # 행 수가 줄어든 기간/필터를 알 수 없으므로 모두 다시 셈
+                self._row_version += 1
+                self._count_cache.pop(self._count_key(), None)
+            if touched & self.FILTER_COLUMNS:
+                # 기존 행이 다른 필터 조합으로 옮겨감 (행 수는 같으므로 필터 없는 전체 개수는 유지)
+                unfiltered = self._count_cache.get(self._count_key())
+                self._row_version += 1
+                if unfiltered is not None and unfiltered[1] == self._row_version - 1:
+                    self._count_cache[self._count_key()] = (unfiltered[0], self._row_version, unfiltered[2])
         
-        # 국가 필터
-        if country:
-            query = query.filter(Torrent.country == country)
+        if self.catalog_index is not None and (changed_ids or changed_columns):
+            try:
+                if changed_ids:
+                    self.catalog_index.apply_changes(self, changed_ids)
+                if changed_columns:
+                    self.catalog_index.reload_columns(self, changed_columns)
+            except Exception as e:
+                print(f"[DB] 카탈로그 인덱스 갱신 오류: {e}")
+    
+    def get_torrents_page(
+        self,
+        session: Session,
+        period_days: Optional[int] = None,
+        censored: Optional[bool] = None,
+        country: Optional[str] = None,
+        genres: Optional[List[str]] = None,
+        search_query: Optional[str] = None,
+        sort_by: str = 'upload_date',
+        sort_order: str = 'desc',
+        limit: int = 50,
+        cursor: Optional[tuple] = None,
+        direction: str = 'next',
+        skip: int = 0
+    ) -> dict:
+        """커서 기반(keyset) 페이지 조회
+        
+        OFFSET처럼 앞의 행을 모두 읽고 버리지 않고, 이전 페이지 마지막 행의
+        (정렬 값, id)부터 인덱스를 따라 바로 이어서 읽는다.
+        
+        Args:
+            cursor: 기준 행의 (정렬 값, id). None이면 처음부터
+            direction: 'next'=커서 다음 행들, 'prev'=커서 이전 행들
+            skip: 커서 이후 건너뛸 행 수 (앵커 점프 시 나머지 보정용, 작은 값만 사용)
+            
+        Returns:
+            {'torrents': TorrentRow 리스트, 'first_cursor': 첫 행 커서, 'last_cursor': 마지막 행 커서}
+        """
+        table = Torrent.__table__
+        sort_column = self._sort_column(table, sort_by)
         
-        # 장르 필터
+        # 카탈로그 인덱스로 처리할 수 있으면 페이지 id만 구해서 그 행만 읽음
+        ids = self._catalog_page(
+            period_days, censored, country, genres, search_query,
+            sort_column.name, sort_order, limit, cursor=cursor, direction=direction, skip=skip
+        )
+        if ids is not None:
+            return self._page_from_ids(session, table, sort_column, ids)
+        
+        descending = sort_order == 'desc'
+        if direction == 'prev':
+            # 역방향으로 읽은 뒤 결과를 뒤집는다
+            descending = not descending
+        
+        def page_select(t):
+            # 목록에 표시하는 컬럼만 조회 (magnet_link, 장르 제외) + 커서용 정렬 값
+            t_sort_column = self._sort_column(t, sort_by)
+            stmt = (
+                select(*TorrentRow.columns(t), t_sort_column.label('_sort_value'))
+                .where(*self._filter_conditions(t, period_days, censored, country, genres, search_query))
+            )
+            if cursor is not None:
+                stmt = stmt.where(self._keyset_condition(t_sort_column, t.c.id, cursor, descending))
+            return stmt.order_by(*self._order_clauses(t, sort_by, 'desc' if descending else 'asc'))
+        
+        tables = self._source_tables(period_days)
+        if len(tables) == 1:
+            stmt = page_select(table).limit(limit)
+        else:
+            # 보관 DB 포함: 파일마다 limit + skip행까지만 읽고 합쳐서 다시 정렬
+            combined = union_all(*(
+                select(page_select(t).limit(limit + skip).subquery()) for t in tables
+            )).subquery()
+            sort_value, id_column = combined.c['_sort_value'], combined.c.id
+            order = [desc(sort_value), desc(id_column)] if descending else [sort_value, id_column]
+            stmt = select(combined).order_by(*order).limit(limit)
+        if skip:
+            stmt = stmt.offset(skip)
+        
+        rows = session.execute(stmt).all()
+        if direction == 'prev':
+            rows.reverse()
+        
+        return {
+            'torrents': [TorrentRow(*row) for row in rows],
+            'first_cursor': (rows[0][-1], rows[0][0]) if rows else None,
+            'last_cursor': (rows[-1][-1], rows[-1][0]) if rows else None,
+        }
+    
+    def _catalog_page(self, period_days, censored, country, genres, search_query,
+                      sort_name: str, sort_order: str, limit: int, **kwargs) -> Optional[List[int]]:
+        """카탈로그 인덱스로 페이지 id 조회 (인덱스가 없거나 처리할 수 없는 조건이면 None)"""
+        if self.catalog_index is None or not self.catalog_index.ready or search_query:
+            return None
+        # 카탈로그 인덱스는 본 DB 행만 가지고 있음
+        if len(self._source_tables(period_days)) > 1:
+            return None
+        genre_mask = 0
         if genres:
+            genre_bits = self._get_genre_bits()
             for genre_name in genres:
-                query = query.join(Torrent.genres).filter(Genre.name == genre_name)
-        
-        # 검색어 필터 (띄어쓰기가 있으면 AND 조건으로 검색)
-        if search_query:
-            # 띄어쓰기로 분리하여 각 단어가 모두 포함되는지 확인
-            search_words = [word.strip() for word in search_query.split() if word.strip()]
-            if search_words:
-                for word in search_words:
-                    query = query.filter(Torrent.title.contains(word))
-        
-        # 정렬 (파라미터에 따라)
-        # size 필드 정렬 시 size_bytes를 사용 (단위 고려)
-        if sort_by == 'size':
-            sort_column = Torrent.size_bytes
-        else:
-            sort_column = getattr(Torrent, sort_by, Torrent.upload_date)
-
-        if sort_order == 'desc':
-            query = query.order_by(desc(sort_column))
+                if genre_name not in genre_bits:
+                    return None
+                genre_mask |= 1 << genre_bits[genre_name]
+        since = datetime.now() - timedelta(days=period_days) if period_days else None
+        return self.catalog_index.page(
+            sort_name, sort_order, limit,
+            since=since, censored=censored, country=country, genre_mask=genre_mask, **kwargs
+        )
+    
+    def _page_from_ids(self, session: Session, table, sort_column, ids: List[int]) -> dict:
+        """id 목록 순서대로 목록 행 조회 (get_torrents_page와 같은 형식)"""
+        rows_by_id = {}
+        for i in range(0, len(ids), 500):
+            stmt = (
+                select(*TorrentRow.columns(table), sort_column.label('_sort_value'))
+                .where(table.c.id.in_(ids[i:i + 500]))
+            )
+            rows_by_id.update((row[0], row) for row in session.execute(stmt))
+        rows = [rows_by_id[torrent_id] for torrent_id in ids if torrent_id in rows_by_id]
+        return {
+            'torrents': [TorrentRow(*row) for row in rows],
+            'first_cursor': (rows[0][-1], rows[0][0]) if rows else None,
+            'last_cursor': (rows[-1][-1], rows[-1][0]) if rows else None,
+        }
+    
+    def _get_page_anchors(self, session: Session, filter_args: tuple, sort_by: str, sort_order: str) -> list:
+        """정렬 순서상 PAGE_ANCHOR_STRIDE 행마다 (정렬 값, id) 앵커 샘플링 (캐시)
+        
+        anchors[i]는 (i + 1) * stride 번째 행 (0부터 세면 (i + 1) * stride - 1)의 커서.
+        인덱스만 한 번 훑어서 만들고, DB가 바뀌거나 일정 시간이 지나면 다시 만든다.
+        """
+        cache_key = (filter_args, sort_by, sort_order)
+        now = time.time()
+        with self._cache_lock:
+            version = self._data_version
+            cached = self._page_anchor_cache.get(cache_key)
+        if cached and cached[0] == version and now - cached[1] < PAGE_ANCHOR_TTL:
+            return cached[2]
+        
+        tables = self._source_tables(filter_args[0])
+        if len(tables) == 1:
+            table = tables[0]
+            sort_column = self._sort_column(table, sort_by)
+            ordered = (
+                select(
+                    sort_column.label('sort_value'),
+                    table.c.id.label('id'),
+                    func.row_number().over(order_by=self._order_clauses(table, sort_by, sort_order)).label('rn')
+                )
+                .where(*self._filter_conditions(table, *filter_args))
+                .subquery()
+            )
         else:
-            query = query.order_by(sort_column)
+            # 보관 DB 포함: 두 파일의 (정렬 값, id)를 합친 순서로 번호 매김
+            keys = union_all(*(
+                select(self._sort_column(t, sort_by).label('sort_value'), t.c.id.label('id'))
+                .where(*self._filter_conditions(t, *filter_args))
+                for t in tables
+            )).subquery()
+            if sort_order == 'desc':
+                order = [desc(keys.c.sort_value), desc(keys.c.id)]
+            else:
+                order = [keys.c.sort_value, keys.c.id]
+            ordered = select(
+                keys.c.sort_value, keys.c.id, func.row_number().over(order_by=order).label('rn')
+            ).subquery()
+        rows = session.execute(
+            select(ordered.c.sort_value, ordered.c.id)
+            .where(ordered.c.rn % PAGE_ANCHOR_STRIDE == 0)
+            .order_by(ordered.c.rn)
+        ).all()
+        anchors = [(row.sort_value, row.id) for row in rows]
         
-        # 제한 및 오프셋
-        query = query.limit(limit).offset(offset)
+        with self._cache_lock:
+            # 캐시가 무한히 커지지 않도록 필터 조합이 많아지면 비움
+            if len(self._page_anchor_cache) > 32:
+                self._page_anchor_cache.clear()
+            self._page_anchor_cache[cache_key] = (version, now, anchors)
+        return anchors
+    
+    def get_torrents_at_page(
+        self,
+        session: Session,
+        page: int,
+        page_size: int,
+        period_days: Optional[int] = None,
+        censored: Optional[bool] = None,
+        country: Optional[str] = None,
+        genres: Optional[List[str]] = None,
+        search_query: Optional[str] = None,
+        sort_by: str = 'upload_date',
+        sort_order: str = 'desc'
+    ) -> dict:
+        """임의 페이지로 바로 이동 (앵커 점프)
         
-        return query.all()
+        목표 위치 직전의 앵커에서 keyset으로 시작하고 나머지(< stride)만 OFFSET으로 건너뛰므로
+        4000번째 페이지도 앞쪽 페이지와 비슷한 비용으로 읽는다.
+        
+        Returns:
+            get_torrents_page와 같은 형식의 딕셔너리
+        """
+        filter_args = (period_days, censored, country, tuple(genres) if genres else None, search_query)
+        offset = max(0, (page - 1) * page_size)
+        
+        # 카탈로그 인덱스가 있으면 앵커 없이 바로 해당 위치
+        table = Torrent.__table__
+        sort_column = self._sort_column(table, sort_by)
+        ids = self._catalog_page(*filter_args, sort_column.name, sort_order, page_size, skip=offset)
+        if ids is not None:
+            return self._page_from_ids(session, table, sort_column, ids)
+        
+        cursor = None
+        skip = offset
+        if offset >= PAGE_ANCHOR_STRIDE:
+            anchors = self._get_page_anchors(session, filter_args, sort_by, sort_order)
+            # offset보다 앞에 있는 가장 가까운 앵커 선택
+            anchor_index = min(offset // PAGE_ANCHOR_STRIDE, len(anchors)) - 1
+            if anchor_index >= 0:
+                cursor = anchors[anchor_index]
+                skip = offset - (anchor_index + 1) * PAGE_ANCHOR_STRIDE
+        
+        return self.get_torrents_page(
+            session,
+            period_days=period_days,
+            censored=censored,
+            country=country,
+            genres=genres,
+            search_query=search_query,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            limit=page_size,
+            cursor=cursor,
+            direction='next',
+            skip=skip
+        )
     
     def get_total_count(
         self,
@@ -287,35 +854,257 @@ class Database:
         genres: Optional[List[str]] = None,
         search_query: Optional[str] = None
     ) -> int:
-        """필터링된 토렌트 총 개수 반환 (페이지네이션용)"""
-        query = session.query(Torrent)
+        """필터링된 토렌트 총 개수 반환 (페이지네이션용, 캐시 사용)"""
+        key = self._count_key(period_days, censored, country, genres, search_query)
+        cached = self._get_cached_count(key)
+        if cached is not None:
+            return cached
         
-        # 기간 필터
-        if period_days:
-            since_date = datetime.now() - timedelta(days=period_days)
-            # NULL 날짜도 제외
-            query = query.filter(
-                Torrent.upload_date != None,
-                Torrent.upload_date >= since_date
-            )
+        with self._cache_lock:
+            version = self._row_version
+        count = 0
+        for table in self._source_tables(period_days):
+            count += session.execute(
+                select(func.count(table.c.id))
+                .where(*self._filter_conditions(table, period_days, censored, country, genres, search_query))
+            ).scalar() or 0
+        self._store_count(key, count, version)
+        return count
+    
+    def get_count_estimate(
+        self,
+        session: Session,
+        period_days: Optional[int] = None,
+        censored: Optional[bool] = None,
+        country: Optional[str] = None,
+        genres: Optional[List[str]] = None,
+        search_query: Optional[str] = None
+    ) -> Tuple[int, bool]:
+        """총 개수를 빠르게 반환 (정확한 COUNT가 오래 걸릴 조건이면 추정값)
         
-        # 검열 필터
-        if censored is not None:
-            query = query.filter(Torrent.censored == censored)
+        캐시에 있으면 그대로 사용하고, 없으면 id 순으로 COUNT_EXACT_LIMIT행까지만 센다.
+        그 안에 끝나면 정확한 값, 넘으면 샘플이 차지한 id 범위 비율로 전체를 추정한다.
         
-        # 국가 필터
-        if country and country != 'ALL':
-            query = query.filter(Torrent.country == country)
+        Returns:
+            (개수, 추정값 여부) - 추정값이면 get_total_count로 정확한 값을 따로 구할 것
+        """
+        key = self._count_key(period_days, censored, country, genres, search_query)
+        cached = self._get_cached_count(key)
+        if cached is not None:
+            return cached, False
+        
+        with self._cache_lock:
+            version = self._row_version
+        filter_args = (period_days, censored, country, genres, search_query)
+        total = 0
+        estimated = False
+        # 보관 DB가 포함되면 파일마다 따로 세거나 추정해서 합침
+        for table in self._source_tables(period_days):
+            count, table_estimated = self._estimate_table_count(session, table, filter_args)
+            total += count
+            estimated = estimated or table_estimated
+        if not estimated:
+            self._store_count(key, total, version)
+        return total, estimated
+    
+    def _estimate_table_count(self, session: Session, table, filter_args: tuple) -> Tuple[int, bool]:
+        """테이블 하나의 (개수, 추정값 여부) - get_count_estimate 참고"""
+        sample = (
+            select(table.c.id)
+            .where(*self._filter_conditions(table, *filter_args))
+            .order_by(table.c.id)
+            .limit(COUNT_EXACT_LIMIT)
+            .subquery()
+        )
+        sampled, sample_max_id = session.execute(select(func.count(), func.max(sample.c.id))).one()
+        if sampled < COUNT_EXACT_LIMIT:
+            return sampled, False
         
-        # 검색어 필터 (띄어쓰기가 있으면 AND 조건으로 검색)
-        if search_query:
-            # 띄어쓰기로 분리하여 각 단어가 모두 포함되는지 확인
-            search_words = [word.strip() for word in search_query.split() if word.strip()]
-            if search_words:
-                for word in search_words:
-                    query = query.filter(Torrent.title.contains(word))
+        min_id, max_id = session.execute(select(func.min(table.c.id), func.max(table.c.id))).one()
+        covered = max(1, sample_max_id - min_id + 1)
+        estimate = int(sampled * (max_id - min_id + 1) / covered)
+        return max(estimate, sampled), True
+    
+    @staticmethod
+    def _count_key(period_days=None, censored=None, country=None, genres=None, search_query=None) -> tuple:
+        """총 개수 캐시 키 (필터 조합)"""
+        return (
+            period_days,
+            censored,
+            country,
+            tuple(sorted(genres)) if genres else None,
+            (search_query or '').strip() or None,
+        )
+    
+    def _get_cached_count(self, key: tuple) -> Optional[int]:
+        """캐시된 총 개수 (행이 추가됐거나 기간 필터 캐시가 COUNT_CACHE_TTL을 넘으면 None)"""
+        with self._cache_lock:
+            cached = self._count_cache.get(key)
+            version = self._row_version
+        if cached is None:
+            return None
+        count, cached_version, cached_at = cached
+        if cached_version != version:
+            return None
+        # 기간 필터는 시간이 지나면 범위를 벗어나는 행이 생기므로 일정 시간만 사용
+        if key[0] is not None and time.time() - cached_at >= COUNT_CACHE_TTL:
+            return None
+        return count
+    
+    def _store_count(self, key: tuple, count: int, version: int):
+        """총 개수 캐시 저장 (세는 동안 행이 추가됐으면 저장하지 않음)"""
+        with self._cache_lock:
+            if version != self._row_version:
+                return
+            # 캐시가 무한히 커지지 않도록 필터 조합이 많아지면 비움
+            if len(self._count_cache) > 64:
+                self._count_cache.clear()
+            self._count_cache[key] = (count, version, time.time())
+
+    def get_facet_counts(
+        self,
+        session: Session,
+        period_days: Optional[int] = None,
+        censored: Optional[bool] = None,
+        country: Optional[str] = None,
+        genres: Optional[List[str]] = None,
+        search_query: Optional[str] = None,
+        periods: Optional[Iterable[int]] = None
+    ) -> dict:
+        """필터 패널 항목별 개수 (캐시 사용)
+
+        항목 값마다 COUNT를 따로 하지 않고 필터 종류마다 한 번의 집계로 모든 값의 개수를 구한다.
+        각 필터의 개수는 그 필터만 뺀 나머지 필터 기준이다 (그 항목을 골랐을 때 나올 개수).
+        - 기간: upload_date 기준 CASE 합계 (기간 옵션 전체를 한 번에)
+        - 검열/국가: GROUP BY
+        - 장르: genre_mask 비트별 합계 (비트가 없는 장르만 torrent_genres GROUP BY)
+
+        Args:
+            periods: 개수를 셀 기간 일수 목록 (None이면 TIME_RANGE_DAYS)
+
+        Returns:
+            {'period': {일수 또는 None: 개수}, 'censored': {None/True/False: 개수},
+             'country': {None 또는 국가 코드: 개수}, 'genres': {None 또는 장르 이름: 개수}}
+            (None 키는 해당 필터 '전체' 개수, 국가 코드가 없는 행은 '전체'에만 포함)
+        """
+        if periods is None:
+            periods = [days for days in TIME_RANGE_DAYS.values() if days]
+        periods = tuple(sorted(set(periods)))
+        key = (self._count_key(period_days, censored, country, genres, search_query), periods)
+        with self._cache_lock:
+            cached = self._facet_cache.get(key)
+            version = self._row_version
+        # 기존 행의 검열/국가/장르가 바뀌어도 row_version은 그대로이므로 항상 TTL 적용
+        if cached is not None and cached[1] == version and time.time() - cached[2] < COUNT_CACHE_TTL:
+            return cached[0]
+
+        # 보관 DB는 목록/총 개수와 같은 기준(_source_tables)으로 포함하고 테이블별 개수를 더함
+        tables = self._source_tables(period_days)
+
+        def where(table, **exclude):
+            # 해당 필터만 뺀 조건
+            args = dict(period_days=period_days, censored=censored, country=country,
+                        genres=genres, search_query=search_query)
+            args.update(exclude)
+            return self._filter_conditions(table, **args)
+
+        facets = {'period': {None: 0}, 'censored': {None: 0}, 'country': {None: 0}, 'genres': {None: 0}}
+
+        # 기간: 전체 개수 + 기간 옵션별 개수를 한 번에 (기간마다 그 기간 목록에 포함되는 테이블만 더함)
+        now = datetime.now()
+        for table in self._source_tables(None):
+            columns = [func.count()]
+            for days in periods:
+                since_date = now - timedelta(days=days)
+                columns.append(func.sum(case((table.c.upload_date >= since_date, 1), else_=0)))
+            row = session.execute(select(*columns).where(*where(table, period_days=None))).one()
+            facets['period'][None] += row[0]
+            for days, value in zip(periods, row[1:]):
+                included = table in self._source_tables(days)
+                facets['period'][days] = facets['period'].get(days, 0) + ((value or 0) if included else 0)
+
+        genre_bits = self._get_genre_bits()
+        names = list(genre_bits)
+        unmasked = select(Genre.id).where(Genre.bit.is_(None))
+        has_unmasked = session.execute(unmasked.limit(1)).first() is not None
+        for table in tables:
+            # 검열
+            rows = session.execute(
+                select(table.c.censored, func.count()).where(*where(table, censored=None)).group_by(table.c.censored)
+            ).all()
+            facets['censored'][None] += sum(count for _, count in rows)
+            for value, count in rows:
+                if value is not None:
+                    facets['censored'][bool(value)] = facets['censored'].get(bool(value), 0) + count
+
+            # 국가
+            rows = session.execute(
+                select(table.c.country, func.count()).where(*where(table, country=None)).group_by(table.c.country)
+            ).all()
+            facets['country'][None] += sum(count for _, count in rows)
+            for value, count in rows:
+                if value:
+                    facets['country'][value] = facets['country'].get(value, 0) + count
+
+            # 장르: 비트가 있는 장르는 genre_mask 비트별 합계 한 번으로
+            columns = [func.count()]
+            columns.extend(
+                func.sum(table.c.genre_mask.op('>>')(genre_bits[name]).op('&')(1)) for name in names
+            )
+            row = session.execute(select(*columns).where(*where(table, genres=None))).one()
+            facets['genres'][None] += row[0]
+            for name, value in zip(names, row[1:]):
+                facets['genres'][name] = facets['genres'].get(name, 0) + (value or 0)
+
+            # 비트가 없는 장르 (장르가 GENRE_MASK_BITS개를 넘은 경우)
+            if has_unmasked:
+                links = archive.genre_links(table)
+                rows = session.execute(
+                    select(Genre.name, func.count())
+                    .select_from(links.join(Genre.__table__, Genre.id == links.c.genre_id))
+                    .where(links.c.genre_id.in_(unmasked))
+                    .where(links.c.torrent_id.in_(select(table.c.id).where(*where(table, genres=None))))
+                    .group_by(Genre.name)
+                ).all()
+                for name, count in rows:
+                    facets['genres'][name] = facets['genres'].get(name, 0) + count
+
+        with self._cache_lock:
+            if version == self._row_version:
+                if len(self._facet_cache) > 32:
+                    self._facet_cache.clear()
+                self._facet_cache[key] = (facets, version, time.time())
+        return facets
+
+    def get_torrent_details(self, session: Session, torrent_id: int) -> Optional[dict]:
+        """목록 행에 없는 상세 정보 조회 (행을 열거나 더블클릭할 때)
         
-        return query.count()
+        Returns:
+            {'magnet_link': str, 'torrent_link': str, 'genres': [장르 이름, ...]} 또는 None
+        """
+        # 본 DB에 없으면 보관 DB에서 찾음
+        for t in self._source_tables():
+            row = session.execute(
+                select(t.c.title, t.c.magnet_link, t.c.info_hash, t.c.torrent_link, TrackerSet.trackers)
+                .outerjoin(TrackerSet.__table__, TrackerSet.id == t.c.tracker_set_id)
+                .where(t.c.id == torrent_id)
+            ).first()
+            if row is not None:
+                break
+        else:
+            return None
+        links = archive.genre_links(t)
+        magnet_link = row.magnet_link or ''
+        if row.info_hash and not magnet_link.startswith('magnet:'):
+            # 분리 저장된 링크는 info hash + 나머지 파라미터 + tracker 목록으로 복원
+            magnet_link = build_magnet(row.info_hash, magnet_link, row.trackers, row.title)
+        genre_names = session.execute(
+            select(Genre.name)
+            .join(links, links.c.genre_id == Genre.id)
+            .where(links.c.torrent_id == torrent_id)
+            .order_by(Genre.name)
+        ).scalars().all()
+        return {'magnet_link': magnet_link, 'torrent_link': row.torrent_link, 'genres': list(genre_names)}
     
     def get_all_genres(self, session: Session) -> List[Genre]:
         """모든 장르 조회"""
@@ -333,10 +1122,12 @@ class Database:
             source_site: 소스 사이트 이름
             
         Returns:
-            기존 토렌트가 있으면 True, 없으면 False
+            기존 토렌트가 있으면 True, 없으면 False (보관 DB 포함)
         """
-        count = session.query(Torrent).filter_by(source_site=source_site).count()
-        return count > 0
+        for table in self._source_tables():
+            if session.execute(select(table.c.id).where(table.c.source_site == source_site).limit(1)).first():
+                return True
+        return False
     
     def get_existing_source_ids(self, session: Session, source_site: str) -> set:
         """특정 소스의 기존 source_id 집합 반환 (중복 체크용)
@@ -346,10 +1137,177 @@ class Database:
             source_site: 소스 사이트 이름
             
         Returns:
-            source_id 집합
+            source_id 집합 (보관 DB 포함)
+        """
+        source_ids = set()
+        for table in self._source_tables():
+            rows = session.execute(select(table.c.source_id).where(table.c.source_site == source_site))
+            source_ids.update(source_id for (source_id,) in rows if source_id)
+        return source_ids
+
+    @staticmethod
+    def get_thumbnail_servers(title: Optional[str]) -> List[str]:
+        """제목 형태(FC2 여부)에 따라 검색 가능한 썸네일 서버 목록"""
+        if title and re.search(THUMBNAIL_FC2_TITLE_PATTERN, title, re.IGNORECASE):
+            return list(THUMBNAIL_SERVER_CLASSES['fc2'])
+        return list(THUMBNAIL_SERVER_CLASSES['default'])
+
+    def get_searched_servers(self, session: Session, torrent_ids: Iterable[int]) -> Dict[int, set]:
+        """토렌트별 이미 탐색한 서버 집합 (IN 조회, 기록이 없는 id는 결과에 없음)"""
+        a = ThumbnailAttempt.__table__
+        ids = list(dict.fromkeys(torrent_ids))
+        searched: Dict[int, set] = {}
+        for i in range(0, len(ids), 500):
+            rows = session.execute(
+                select(a.c.torrent_id, a.c.server).where(a.c.torrent_id.in_(ids[i:i + 500]))
+            )
+            for torrent_id, server in rows:
+                searched.setdefault(torrent_id, set()).add(server)
+        return searched
+
+    def get_thumbnail_clusters(self, session: Session, torrent_ids: Iterable[int]) -> Dict[int, Tuple[tuple, Optional[str]]]:
+        """토렌트별 ((제목 묶음 id, 품번 집합), 묶음 안 품번이 같은 다른 행의 썸네일 또는 None)
+        
+        썸네일 탐색은 (묶음, 품번)당 한 행만 하고, 품번이 같은 행에 이미 썸네일이 있으면 탐색 없이 복사하는 데 사용.
+        묶음이 없거나 품번이 없는 id는 결과에 없음 (같은 묶음이어도 다른 화 / 파트일 수 있어 각자 탐색)
+        """
+        from .title_clusters import title_codes, shareable_thumbnail
+        t = Torrent.__table__
+        ids = list(dict.fromkeys(torrent_ids))
+        keys: Dict[int, tuple] = {}
+        for i in range(0, len(ids), 500):
+            rows = session.execute(
+                select(t.c.id, t.c.cluster_id, t.c.title)
+                .where(t.c.id.in_(ids[i:i + 500]), t.c.cluster_id.isnot(None))
+            )
+            for torrent_id, cluster_id, title in rows:
+                codes = title_codes(title)
+                if codes:
+                    keys[torrent_id] = (cluster_id, codes)
+        
+        # 묶음별 썸네일이 있는 행의 (품번 집합, 썸네일) (먼저 저장된 행부터)
+        cluster_ids = list({cluster_id for cluster_id, _ in keys.values()})
+        sources: Dict[int, List[Tuple[frozenset, str]]] = {}
+        for i in range(0, len(cluster_ids), 500):
+            rows = session.execute(
+                select(t.c.cluster_id, t.c.title, t.c.thumbnail_url)
+                .where(t.c.cluster_id.in_(cluster_ids[i:i + 500]), t.c.thumbnail_url != '')
+                .order_by(t.c.id)
+            )
+            for cluster_id, title, thumbnail_url in rows:
+                if shareable_thumbnail(thumbnail_url):
+                    sources.setdefault(cluster_id, []).append((title_codes(title), thumbnail_url))
+        
+        result = {}
+        for torrent_id, (cluster_id, codes) in keys.items():
+            thumbnail = next((url for source_codes, url in sources.get(cluster_id, []) if codes & source_codes), None)
+            result[torrent_id] = ((cluster_id, codes), thumbnail)
+        return result
+
+    def get_cluster_members(self, session: Session, cluster_id: int) -> List[TorrentRow]:
+        """같은 제목 묶음의 토렌트 목록 (업로드 날짜 최신순)"""
+        t = Torrent.__table__
+        rows = session.execute(
+            select(*TorrentRow.columns(t))
+            .where(t.c.cluster_id == cluster_id)
+            .order_by(t.c.upload_date.desc(), t.c.id.desc())
+        )
+        return [TorrentRow(*row) for row in rows]
+
+    def _untried_servers_condition(self, table):
+        """제목 형태별 서버 중 아직 탐색하지 않은 서버가 남아 있는지 (SQL 조건식)"""
+        a = ThumbnailAttempt.__table__
+
+        def tried_count(servers):
+            return (
+                select(func.count())
+                .where(a.c.torrent_id == table.c.id, a.c.server.in_(servers))
+                .scalar_subquery()
+            )
+
+        fc2_servers = THUMBNAIL_SERVER_CLASSES['fc2']
+        default_servers = THUMBNAIL_SERVER_CLASSES['default']
+        return case(
+            (table.c.title.regexp_match(THUMBNAIL_FC2_TITLE_PATTERN, flags='i'),
+             tried_count(fc2_servers) < len(fc2_servers)),
+            else_=tried_count(default_servers) < len(default_servers)
+        )
+
+    def get_untried_thumbnail_ids(self, session: Session, torrent_ids: Optional[Iterable[int]] = None) -> set:
+        """아직 탐색하지 않은 썸네일 서버가 남은 토렌트 id 집합
+        
+        Args:
+            torrent_ids: 확인할 id 목록 (None이면 썸네일이 없는 전체 토렌트 대상)
+        """
+        t = Torrent.__table__
+        stmt = select(t.c.id).where(self._untried_servers_condition(t))
+        if torrent_ids is None:
+            stmt = stmt.where(or_(t.c.thumbnail_url.is_(None), t.c.thumbnail_url == ''))
+            return set(session.execute(stmt).scalars())
+
+        ids = list(dict.fromkeys(torrent_ids))
+        untried = set()
+        for i in range(0, len(ids), 500):
+            untried.update(session.execute(stmt.where(t.c.id.in_(ids[i:i + 500]))).scalars())
+        return untried
+
+    def record_thumbnail_attempts(self, session: Session, attempts: List[dict]):
+        """서버별 탐색 기록 저장 (이미 있으면 시각/결과 갱신, 커밋은 호출자가 처리)
+        
+        Args:
+            attempts: [{'torrent_id': int, 'server': str, 'outcome': 'found'|'miss'}, ...]
+        """
+        if not attempts:
+            return
+        a = ThumbnailAttempt.__table__
+        now = datetime.utcnow()
+        rows = [{
+            'torrent_id': attempt['torrent_id'],
+            'server': attempt['server'].lower(),
+            'attempted_at': now,
+            'outcome': attempt.get('outcome') or 'miss',
+        } for attempt in attempts]
+        stmt = sqlite_insert(a)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[a.c.torrent_id, a.c.server],
+            set_={'attempted_at': stmt.excluded.attempted_at, 'outcome': stmt.excluded.outcome}
+        )
+        session.execute(stmt, rows)
+
+    def reset_thumbnail_attempts(self, session: Session, torrent_ids: Optional[Iterable[int]] = None) -> int:
+        """탐색 기록 삭제 (torrent_ids가 None이면 전체, 커밋은 호출자가 처리)
+        
+        Returns:
+            삭제된 기록 수
+        """
+        a = ThumbnailAttempt.__table__
+        if torrent_ids is None:
+            return session.execute(delete(a)).rowcount
+
+        ids = list(dict.fromkeys(torrent_ids))
+        deleted = 0
+        for i in range(0, len(ids), 500):
+            deleted += session.execute(delete(a).where(a.c.torrent_id.in_(ids[i:i + 500]))).rowcount
+        return deleted
+
+    def delete_torrents(self, session: Session, torrent_ids: Iterable[int]) -> int:
+        """토렌트와 부가 기록(장르 연결, 통계, 탐색 기록, 제목 LSH) 삭제 (커밋은 호출자가 처리)
+        
+        FTS 인덱스와 삭제 기록(torrent_tombstones)은 torrents 삭제 트리거가 처리한다.
+        
+        Returns:
+            삭제된 토렌트 수
         """
-        torrents = session.query(Torrent.source_id).filter_by(source_site=source_site).all()
-        return {t.source_id for t in torrents if t.source_id}
+        t = Torrent.__table__
+        details = (torrent_genres, TorrentStat.__table__, ThumbnailAttempt.__table__, TitleLshBucket.__table__)
+        ids = list(dict.fromkeys(torrent_ids))
+        deleted = 0
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            for table in details:
+                session.execute(delete(table).where(table.c.torrent_id.in_(chunk)))
+            deleted += session.execute(delete(t).where(t.c.id.in_(chunk))).rowcount
+        return deleted
 
     def backfill_missing_dates(self, session: Session, limit: int = 500) -> int:
         """업로드 날짜가 비어있는 항목 보정 (sukebei.nyaa.si 전용)
@@ -3,10 +3,20 @@
 모든 DB write 작업을 큐를 통해 순차적으로 처리
 """
 from PySide6.QtCore import QThread, Signal
-from queue import Queue, Empty
-from enum import Enum
-from typing import Dict, Any, Optional, List
+from queue import Empty
+from collections import deque
+from enum import Enum, IntEnum
+from typing import Dict, Any, Optional, List, Iterable
+import threading
 import time
+from database.bulk_ingest import TorrentBulkIngestor
+from database.change_feed import ChangeSet
+from database.ingest_journal import IngestJournal, journal_path
+from config import (
+    DB_WRITER_COMMIT_WINDOW_MS, DB_WRITER_MAX_WINDOW_OPS, DB_WRITER_MAX_BULK_PER_WINDOW,
+    DB_WRITER_BULK_LANE_SIZE, DB_WRITER_THUMBNAIL_LANE_SIZE, TITLE_CLUSTERING_ENABLED,
+    INGEST_JOURNAL_ENABLED, INGEST_JOURNAL_PATH
+)
 
 
 class WriteOperationType(Enum):
@@ -15,17 +25,142 @@ class WriteOperationType(Enum):
     UPDATE_THUMBNAIL = "update_thumbnail"
     BATCH_ADD_TORRENTS = "batch_add_torrents"
     BATCH_UPDATE_THUMBNAILS = "batch_update_thumbnails"
+    BATCH_DELETE_TORRENTS = "batch_delete_torrents"
+
+
+class WritePriority(IntEnum):
+    """Write 작업 우선순위 (값이 작을수록 먼저 처리)"""
+    INTERACTIVE = 0  # 사용자 조작 (썸네일 교체, 현재 페이지 항목)
+    THUMBNAIL = 1    # 백그라운드 썸네일 탐색 결과
+    BULK = 2         # 스크래핑 일괄 저장
+
+
+# 작업 타입별 기본 우선순위
+DEFAULT_PRIORITIES = {
+    WriteOperationType.ADD_TORRENT: WritePriority.BULK,
+    WriteOperationType.BATCH_ADD_TORRENTS: WritePriority.BULK,
+    WriteOperationType.UPDATE_THUMBNAIL: WritePriority.THUMBNAIL,
+    WriteOperationType.BATCH_UPDATE_THUMBNAILS: WritePriority.THUMBNAIL,
+    # 일괄 저장과 같은 레인에 넣어서 앞뒤 저장 작업과 순서가 유지되도록 함
+    WriteOperationType.BATCH_DELETE_TORRENTS: WritePriority.BULK,
+}
 
 
 class WriteOperation:
     """Write 작업 객체"""
-    def __init__(self, op_type: WriteOperationType, data: Dict[str, Any], callback_id: Optional[str] = None):
+    def __init__(self, op_type: WriteOperationType, data: Dict[str, Any], callback_id: Optional[str] = None,
+                 priority: Optional[WritePriority] = None):
         self.op_type = op_type
         self.data = data
         self.callback_id = callback_id
+        self.priority = DEFAULT_PRIORITIES[op_type] if priority is None else priority
         self.timestamp = time.time()
 
 
+class PriorityWriteQueue:
+    """우선순위 레인별 쓰기 작업 큐
+    
+    - get()은 항상 가장 높은 우선순위 레인의 작업부터 반환 (레인 내부는 FIFO)
+    - 크기 제한이 있는 레인은 가득 차면 put()이 대기 (생산자 역압)
+    - join()/qsize()는 레인을 지정하면 해당 레인만 대상으로 함
+    - None(종료 신호)은 앞선 작업 뒤에 오도록 BULK 레인 끝에 크기 제한 없이 들어감
+    """
+    
+    def __init__(self, maxsizes: Optional[Dict[WritePriority, int]] = None):
+        self._maxsizes = maxsizes or {}
+        self._lanes = {priority: deque() for priority in WritePriority}
+        self._unfinished = {priority: 0 for priority in WritePriority}
+        self._closed = False
+        self._mutex = threading.Lock()
+        self._not_empty = threading.Condition(self._mutex)
+        self._not_full = threading.Condition(self._mutex)
+        self._all_tasks_done = threading.Condition(self._mutex)
+    
+    @staticmethod
+    def _lane_of(item) -> WritePriority:
+        return WritePriority.BULK if item is None else item.priority
+    
+    def put(self, item, timeout: Optional[float] = None, force: bool = False):
+        """작업 추가 (레인이 가득 차면 자리가 날 때까지 대기, close() 이후에는 대기하지 않음)
+        
+        Args:
+            force: True면 크기 제한 없이 바로 추가 (저널 복구처럼 writer 스레드 자신이 넣는 경우)
+        """
+        priority = self._lane_of(item)
+        with self._not_full:
+            maxsize = self._maxsizes.get(priority, 0) if item is not None and not force else 0
+            if maxsize > 0:
+                deadline = None if timeout is None else time.monotonic() + timeout
+                while len(self._lanes[priority]) >= maxsize and not self._closed:
+                    if deadline is None:
+                        self._not_full.wait()
+                    else:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise TimeoutError(f"쓰기 큐 대기 시간 초과 (레인: {priority.name})")
+                        self._not_full.wait(remaining)
+            self._lanes[priority].append(item)
+            self._unfinished[priority] += 1
+            self._not_empty.notify()
+    
+    def get(self, timeout: Optional[float] = None, lanes: Optional[Iterable[WritePriority]] = None):
+        """우선순위가 가장 높은 작업 반환 (timeout 동안 없으면 queue.Empty)
+        
+        Args:
+            timeout: 대기 시간 (초, None이면 무한 대기)
+            lanes: 가져올 레인 제한 (None이면 전체)
+        """
+        lanes = sorted(lanes) if lanes is not None else list(WritePriority)
+        with self._not_empty:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while True:
+                for priority in lanes:
+                    if self._lanes[priority]:
+                        item = self._lanes[priority].popleft()
+                        self._not_full.notify_all()
+                        return item
+                if deadline is None:
+                    self._not_empty.wait()
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise Empty
+                    self._not_empty.wait(remaining)
+    
+    def task_done(self, item):
+        """get()으로 꺼낸 작업의 처리 완료 표시"""
+        priority = self._lane_of(item)
+        with self._all_tasks_done:
+            if self._unfinished[priority] <= 0:
+                raise ValueError('task_done() called too many times')
+            self._unfinished[priority] -= 1
+            if self._unfinished[priority] == 0:
+                self._all_tasks_done.notify_all()
+    
+    def join(self, priority: Optional[WritePriority] = None):
+        """작업이 모두 처리될 때까지 대기 (priority 지정 시 해당 레인만)"""
+        priorities = list(WritePriority) if priority is None else [priority]
+        with self._all_tasks_done:
+            while any(self._unfinished[p] for p in priorities):
+                self._all_tasks_done.wait()
+    
+    def qsize(self, priority: Optional[WritePriority] = None) -> int:
+        """대기 중인 작업 수 (priority 지정 시 해당 레인만)"""
+        with self._mutex:
+            if priority is None:
+                return sum(len(lane) for lane in self._lanes.values())
+            return len(self._lanes[priority])
+    
+    def empty(self) -> bool:
+        return self.qsize() == 0
+    
+    def close(self):
+        """대기 중인 생산자 해제 (writer 종료 시)"""
+        with self._mutex:
+            self._closed = True
+            self._not_full.notify_all()
+
+
 class DBWriterThread(QThread):
     """
     단일 스레드로 모든 DB write 작업 처리
@@ -35,62 +170,116 @@ class DBWriterThread(QThread):
     operation_completed = Signal(str, bool, object)  # callback_id, success, result
     error_occurred = Signal(str, str)  # operation_type, error_message
     batch_completed = Signal(dict)  # stats: {'added': int, 'updated': int, 'duplicate': int}
+    changes_committed = Signal(list)  # 커밋 창별 행 변경 목록 [RowChange, ...] (행별로 합쳐짐)
     
     def __init__(self, db):
         super().__init__()
         self.db = db
-        self.queue = Queue()
+        self.queue = PriorityWriteQueue({
+            WritePriority.BULK: DB_WRITER_BULK_LANE_SIZE,
+            WritePriority.THUMBNAIL: DB_WRITER_THUMBNAIL_LANE_SIZE,
+        })
         self._running = True
+        # 커밋 창 동안의 행 변경 기록 (커밋 후 changes_committed로 내보냄)
+        self.changes = ChangeSet()
+        # 일괄 저장기 (장르 id 캐시를 writer 수명 동안 유지)
+        self.ingestor = TorrentBulkIngestor(self.changes)
+        # 스크래핑 페이지 저널 (커밋 전 비정상 종료 시 다음 시작 때 다시 저장)
+        self.journal = None
+        self._recovered_pages = []
+        if INGEST_JOURNAL_ENABLED:
+            try:
+                self.journal = IngestJournal(journal_path(db.db_path, INGEST_JOURNAL_PATH))
+                self._recovered_pages = self.journal.recover()
+            except OSError as e:
+                print(f"[DBWriter] 수집 저널을 열 수 없습니다 (저널 없이 동작): {e}")
+                self.journal = None
         
     def add_operation(self, operation: WriteOperation):
         """작업 추가"""
         self.queue.put(operation)
     
-    def add_torrent(self, torrent_data: Dict[str, Any], callback_id: Optional[str] = None):
+    def add_torrent(self, torrent_data: Dict[str, Any], callback_id: Optional[str] = None,
+                    priority: Optional[WritePriority] = None):
         """토렌트 추가 요청"""
-        op = WriteOperation(WriteOperationType.ADD_TORRENT, torrent_data, callback_id)
+        op = WriteOperation(WriteOperationType.ADD_TORRENT, torrent_data, callback_id, priority)
         self.queue.put(op)
     
-    def update_thumbnail(self, torrent_id: int, thumbnail_url: str, server_name: Optional[str] = None, callback_id: Optional[str] = None):
-        """썸네일 업데이트 요청"""
+    def update_thumbnail(self, torrent_id: int, thumbnail_url: Optional[str], server_name: Optional[str] = None, callback_id: Optional[str] = None,
+                         priority: Optional[WritePriority] = None, reset_attempts: bool = False):
+        """썸네일 업데이트 요청
+        
+        Args:
+            thumbnail_url: 새 썸네일 URL (None이면 URL은 그대로 두고 탐색 기록만 남김)
+            server_name: 탐색한 서버 이름 (thumbnail_attempts에 기록)
+            priority: 사용자 조작/현재 페이지 항목이면 WritePriority.INTERACTIVE (기본: THUMBNAIL)
+            reset_attempts: True면 이 토렌트의 기존 탐색 기록 삭제
+        """
         op = WriteOperation(
             WriteOperationType.UPDATE_THUMBNAIL,
-            {'torrent_id': torrent_id, 'thumbnail_url': thumbnail_url, 'server_name': server_name},
-            callback_id
+            {'torrent_id': torrent_id, 'thumbnail_url': thumbnail_url, 'server_name': server_name,
+             'reset_attempts': reset_attempts},
+            callback_id,
+            priority
         )
         self.queue.put(op)
     
     def batch_add_torrents(self, torrents: List[Dict[str, Any]], callback_id: Optional[str] = None):
-        """배치 토렌트 추가"""
+        """배치 토렌트 추가 (저널에 먼저 기록, BULK 레인이 가득 차면 자리가 날 때까지 대기)"""
+        journal_seq = None
+        if self.journal is not None:
+            try:
+                journal_seq = self.journal.append(torrents)
+            except (OSError, TypeError, ValueError) as e:
+                print(f"[DBWriter] 수집 저널 기록 실패 (메모리 큐로만 저장): {e}")
         op = WriteOperation(
             WriteOperationType.BATCH_ADD_TORRENTS,
-            {'torrents': torrents},
+            {'torrents': torrents, 'journal_seq': journal_seq},
             callback_id
         )
         self.queue.put(op)
     
-    def batch_update_thumbnails(self, updates: List[Dict[str, Any]], callback_id: Optional[str] = None):
+    def batch_update_thumbnails(self, updates: List[Dict[str, Any]], callback_id: Optional[str] = None,
+                                priority: Optional[WritePriority] = None):
         """배치 썸네일 업데이트"""
         op = WriteOperation(
             WriteOperationType.BATCH_UPDATE_THUMBNAILS,
             {'updates': updates},
+            callback_id,
+            priority
+        )
+        self.queue.put(op)
+    
+    def batch_delete_torrents(self, keys: List[Dict[str, Any]], callback_id: Optional[str] = None):
+        """배치 토렌트 삭제 (info_hash 또는 source_site + source_id로 찾음, 없는 항목은 무시)"""
+        op = WriteOperation(
+            WriteOperationType.BATCH_DELETE_TORRENTS,
+            {'keys': keys},
             callback_id
         )
         self.queue.put(op)
     
+    def wait_for_bulk(self):
+        """스크래핑 일괄 저장 작업이 모두 커밋될 때까지 대기 (썸네일 작업은 기다리지 않음)"""
+        self.queue.join(WritePriority.BULK)
+    
     def stop(self):
         """스레드 정지"""
         self._running = False
+        # 레인 자리를 기다리는 생산자 해제
+        self.queue.close()
         # 빈 작업을 넣어 블로킹 해제
         self.queue.put(None)
     
     def run(self):
-        """메인 루프 - 큐에서 작업을 가져와 순차 처리"""
-        from database.models import Torrent
-        
-        session = self.db.get_session()
+        """메인 루프 - 큐에서 작업을 모아 (시간/개수 제한 창) 한 트랜잭션으로 커밋"""
+        session = self.db.get_write_session()  # 단일 쓰기 연결 사용
         
-        processed_count = 0  # 처리한 작업 수
+        # 이전 실행에서 커밋되지 못한 저널 페이지를 먼저 처리
+        for seq, torrents in self._recovered_pages:
+            op = WriteOperation(WriteOperationType.BATCH_ADD_TORRENTS, {'torrents': torrents, 'journal_seq': seq})
+            self.queue.put(op, force=True)
+        self._recovered_pages = []
         
         try:
             while self._running:
@@ -99,55 +288,15 @@ class DBWriterThread(QThread):
                     operation = self.queue.get(timeout=1)
                     
                     if operation is None:  # 종료 신호
+                        self.queue.task_done(operation)
                         break
                     
-                    processed_count += 1
-                    
-                    success = False
-                    result = None
-                    error_msg = None
-                    
-                    try:
-                        # 작업 타입별 처리
-                        if operation.op_type == WriteOperationType.ADD_TORRENT:
-                            result = self._add_torrent(session, operation.data)
-                            success = True
-                            
-                        elif operation.op_type == WriteOperationType.UPDATE_THUMBNAIL:
-                            self._update_thumbnail(session, operation.data)
-                            success = True
-                            result = operation.data['torrent_id']
-                            
-                        elif operation.op_type == WriteOperationType.BATCH_ADD_TORRENTS:
-                            torrent_count = len(operation.data['torrents'])
-                            result = self._batch_add_torrents(session, operation.data['torrents'])
-                            success = True
-                            # 배치 완료 시그널 발생
-                            if isinstance(result, dict):
-                                self.batch_completed.emit(result)
-                            
-                        elif operation.op_type == WriteOperationType.BATCH_UPDATE_THUMBNAILS:
-                            update_count = len(operation.data['updates'])
-                            self._batch_update_thumbnails(session, operation.data['updates'])
-                            success = True
-                            result = update_count
-                        
-                        # 커밋
-                        session.commit()
-                        
-                    except Exception as e:
-                        error_msg = str(e)
-                        session.rollback()
-                        print(f"[DBWriter] ❌ 오류 발생: {error_msg} (타입: {operation.op_type.value})")
-                        import traceback
-                        traceback.print_exc()
-                        self.error_occurred.emit(operation.op_type.value, error_msg)
-                    
-                    # 콜백 실행
-                    if operation.callback_id:
-                        self.operation_completed.emit(operation.callback_id, success, result)
+                    # 첫 작업 이후 잠시 동안 들어오는 작업을 같은 커밋 창에 모음
+                    window, stop_requested = self._collect_window(operation)
+                    self._process_window(session, window)
                     
-                    self.queue.task_done()
+                    if stop_requested:
+                        break
                     
                 except Empty:
                     # 타임아웃 - 정상적인 대기 상태
@@ -159,153 +308,319 @@ class DBWriterThread(QThread):
                     
         finally:
             session.close()
+            if self.journal is not None:
+                self.journal.close()
     
-    def _add_torrent(self, session, torrent_data: Dict[str, Any]) -> str:
-        """토렌트 추가 (내부 메서드)"""
-        from database.models import Torrent
+    def _collect_window(self, first_operation: WriteOperation):
+        """커밋 창 수집 (DB_WRITER_COMMIT_WINDOW_MS 경과 또는 DB_WRITER_MAX_WINDOW_OPS 도달 시 종료)
         
-        # 중복 확인: source_id 또는 제목으로 확인
-        existing = None
-        source_id = torrent_data.get('source_id')
-        source_site = torrent_data.get('source_site')
-        title = torrent_data.get('title')
+        - INTERACTIVE 작업이 들어오면 더 기다리지 않고 바로 커밋
+        - BULK 작업은 창당 DB_WRITER_MAX_BULK_PER_WINDOW개까지만 넣어 트랜잭션을 짧게 유지
         
-        # 1순위: source_id로 확인
-        if source_id and source_site:
-            existing = session.query(Torrent).filter_by(
-                source_id=source_id,
-                source_site=source_site
-            ).first()
+        Returns:
+            (작업 리스트, 종료 신호 수신 여부)
+        """
+        window = [first_operation]
+        if first_operation.priority == WritePriority.INTERACTIVE:
+            return window, False
         
-        # 2순위: 제목으로 확인 (source_id가 없거나 못 찾은 경우)
-        if not existing and title:
-            existing = session.query(Torrent).filter_by(
-                title=title
-            ).first()
+        bulk_count = 1 if first_operation.priority == WritePriority.BULK else 0
+        deadline = time.monotonic() + DB_WRITER_COMMIT_WINDOW_MS / 1000
         
-        if existing:
-            # 중복 항목 발견 - 다운로드수 비교하여 업데이트 여부 결정
-            new_downloads = torrent_data.get('downloads', 0) or 0
-            existing_downloads = existing.downloads or 0
-            
-            # 새 항목의 다운로드수가 더 많으면 업데이트
-            if new_downloads > existing_downloads:
-                # 다운로드수가 더 많은 항목으로 업데이트
-                for key in ['downloads', 'seeders', 'leechers', 'completed', 'magnet_link', 'torrent_link', 'size', 'size_bytes']:
-                    if key in torrent_data:
-                        setattr(existing, key, torrent_data[key])
-                
-                # 썸네일이 없었는데 새로 생겼으면 업데이트
-                if not existing.thumbnail_url and torrent_data.get('thumbnail_url'):
-                    existing.thumbnail_url = torrent_data.get('thumbnail_url')
-                    existing.snapshot_urls = torrent_data.get('snapshot_urls', '')
-                
-                # 인기도 점수 재계산
-                existing.calculate_popularity()
-                return 'updated'
-            
-            # 기존 항목이 다운로드수가 더 많거나 같으면 중복으로 처리
-            # 단, _is_update 플래그가 있으면 통계 정보만 업데이트
-            is_update = torrent_data.get('_is_update', False)
-            if is_update:
-                for key in ['downloads', 'seeders', 'leechers', 'completed']:
-                    if key in torrent_data:
-                        setattr(existing, key, torrent_data[key])
-                existing.calculate_popularity()
-                return 'updated'
+        while len(window) < DB_WRITER_MAX_WINDOW_OPS:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            lanes = None
+            if bulk_count >= DB_WRITER_MAX_BULK_PER_WINDOW:
+                lanes = (WritePriority.INTERACTIVE, WritePriority.THUMBNAIL)
+            try:
+                operation = self.queue.get(timeout=remaining, lanes=lanes)
+            except Empty:
+                break
+            if operation is None:  # 종료 신호 - 모은 작업까지는 처리
+                self.queue.task_done(operation)
+                return window, True
+            window.append(operation)
+            if operation.priority == WritePriority.INTERACTIVE:
+                break
+            if operation.priority == WritePriority.BULK:
+                bulk_count += 1
+        
+        return window, False
+    
+    def _process_window(self, session, window: List[WriteOperation]):
+        """커밋 창 처리
+        
+        - 각 작업은 SAVEPOINT 안에서 실행하여 실패한 작업만 되돌림
+        - 썸네일 업데이트는 torrent_id별로 병합하여 한 번에 기록
+        - 전체를 한 번 커밋한 뒤 작업별 콜백/시그널 발생
+        - 커밋된 행 변경은 changes_committed로 한 번에 내보냄 (롤백된 SAVEPOINT의 변경은 제외)
+        """
+        outcomes = {}  # id(operation) -> (success, result)
+        thumbnail_ops = []
+        
+        for operation in window:
+            if operation.op_type in (WriteOperationType.UPDATE_THUMBNAIL, WriteOperationType.BATCH_UPDATE_THUMBNAILS):
+                thumbnail_ops.append(operation)
+                continue
             
-            return 'duplicate'
-        else:
-            # 신규 추가
-            # genres 필드는 별도 처리 (Many-to-Many 관계)
-            genres_list = torrent_data.get('genres', [])
+            mark = self.changes.mark()
+            try:
+                with session.begin_nested():
+                    if operation.op_type == WriteOperationType.ADD_TORRENT:
+                        result = self._add_torrent(session, operation.data)
+                    elif operation.op_type == WriteOperationType.BATCH_ADD_TORRENTS:
+                        result = self._batch_add_torrents(session, operation.data['torrents'])
+                    elif operation.op_type == WriteOperationType.BATCH_DELETE_TORRENTS:
+                        result = self._batch_delete_torrents(session, operation.data['keys'])
+                    else:
+                        result = None
+                outcomes[id(operation)] = (True, result)
+            except Exception as e:
+                # 이 작업에서 새로 만든 장르가 SAVEPOINT 롤백으로 사라졌을 수 있으므로 캐시 초기화
+                self.changes.rollback_to(mark)
+                self.ingestor.reset_cache()
+                self._report_error(operation, e)
+                outcomes[id(operation)] = (False, None)
+        
+        if thumbnail_ops:
+            merged = self._merge_thumbnail_updates(thumbnail_ops)
+            mark = self.changes.mark()
+            try:
+                with session.begin_nested():
+                    self._apply_thumbnail_updates(session, merged)
+                for operation in thumbnail_ops:
+                    if operation.op_type == WriteOperationType.UPDATE_THUMBNAIL:
+                        outcomes[id(operation)] = (True, operation.data['torrent_id'])
+                    else:
+                        outcomes[id(operation)] = (True, len(operation.data['updates']))
+            except Exception as e:
+                self.changes.rollback_to(mark)
+                for operation in thumbnail_ops:
+                    self._report_error(operation, e)
+                    outcomes[id(operation)] = (False, None)
+        
+        # 창 전체를 한 번에 커밋
+        changes = []
+        try:
+            session.commit()
+            # 저널 완료 표시 (SAVEPOINT에서 실패한 페이지도 다시 시도하지 않음, 커밋 실패 시에는 남겨서 다음 시작 때 재시도)
+            if self.journal is not None:
+                self.journal.complete(
+                    operation.data.get('journal_seq') for operation in window
+                    if operation.op_type == WriteOperationType.BATCH_ADD_TORRENTS
+                )
+            changes = self.changes.pop()
+            # 조회 캐시 무효화 (페이지 앵커, 새 행이 있으면 총 개수) 및 카탈로그 인덱스에 변경 행 반영
+            self.db.notify_data_changed(
+                rows_added=self._count_added(window, outcomes),
+                rows_removed=self._count_removed(window, outcomes),
+                changed_ids=[change.torrent_id for change in changes],
+                changed_fields={name for change in changes if change.op == 'update' for name in change.fields}
+            )
+        except Exception as e:
+            session.rollback()
+            self.ingestor.reset_cache()
+            self.changes.pop()
+            for operation in window:
+                if outcomes.get(id(operation), (False, None))[0]:
+                    self._report_error(operation, e)
+                outcomes[id(operation)] = (False, None)
+        
+        # 커밋된 행 변경 피드 (GUI가 보이는 행만 갱신)
+        if changes:
+            self.changes_committed.emit(changes)
+        
+        # 커밋 이후 작업 순서대로 결과 통지
+        for operation in window:
+            success, result = outcomes.get(id(operation), (False, None))
             
-            # genres를 제외한 나머지 필드로 Torrent 객체 생성
-            torrent_kwargs = {k: v for k, v in torrent_data.items() if not k.startswith('_') and k != 'genres'}
-            torrent = Torrent(**torrent_kwargs)
-            session.add(torrent)
-            session.flush()  # ID를 얻기 위해 flush
+            # 배치 완료 시그널 발생
+            if success and operation.op_type == WriteOperationType.BATCH_ADD_TORRENTS and isinstance(result, dict):
+                self.batch_completed.emit(result)
             
-            # genres 처리: 문자열 리스트를 Genre 객체로 변환
-            if genres_list:
-                from database.models import Genre
-                for genre_name in genres_list:
-                    if isinstance(genre_name, str) and genre_name.strip():
-                        # Genre 객체 찾기 또는 생성
-                        genre = session.query(Genre).filter_by(name=genre_name).first()
-                        if not genre:
-                            genre = Genre(name=genre_name)
-                            session.add(genre)
-                            session.flush()
-                        torrent.genres.append(genre)
+            # 콜백 실행
+            if operation.callback_id:
+                self.operation_completed.emit(operation.callback_id, success, result)
             
-            return 'added'
+            self.queue.task_done(operation)
+    
+    @staticmethod
+    def _count_added(window: List[WriteOperation], outcomes: Dict[int, tuple]) -> int:
+        """커밋 창에서 새로 추가된 토렌트 수"""
+        added = 0
+        for operation in window:
+            success, result = outcomes.get(id(operation), (False, None))
+            if not success:
+                continue
+            if operation.op_type == WriteOperationType.BATCH_ADD_TORRENTS and isinstance(result, dict):
+                added += result.get('added', 0)
+            elif operation.op_type == WriteOperationType.ADD_TORRENT and result == 'added':
+                added += 1
+        return added
     
-    def _update_thumbnail(self, session, data: Dict[str, Any]):
-        """썸네일 업데이트 (내부 메서드)"""
-        import json
+    @staticmethod
+    def _count_removed(window: List[WriteOperation], outcomes: Dict[int, tuple]) -> int:
+        """커밋 창에서 삭제된 토렌트 수"""
+        removed = 0
+        for operation in window:
+            success, result = outcomes.get(id(operation), (False, None))
+            if success and operation.op_type == WriteOperationType.BATCH_DELETE_TORRENTS:
+                removed += result or 0
+        return removed
+    
+    def _report_error(self, operation: WriteOperation, error: Exception):
+        """작업 오류 로그 및 시그널"""
+        error_msg = str(error)
+        print(f"[DBWriter] ❌ 오류 발생: {error_msg} (타입: {operation.op_type.value})")
+        import traceback
+        traceback.print_exc()
+        self.error_occurred.emit(operation.op_type.value, error_msg)
+    
+    def _add_torrent(self, session, torrent_data: Dict[str, Any]) -> str:
+        """토렌트 추가 (내부 메서드, 일괄 저장 경로를 1건으로 사용)"""
+        stats, results = self.ingestor.ingest(session, [torrent_data])
+        return results[0]
+    
+    def _batch_add_torrents(self, session, torrents: List[Dict[str, Any]]) -> Dict[str, int]:
+        """배치 토렌트 추가 (페이지 전체를 집합 단위로 upsert)"""
+        stats, results = self.ingestor.ingest(session, torrents)
+        return stats
+
+    def _batch_delete_torrents(self, session, keys: List[Dict[str, Any]]) -> int:
+        """배치 토렌트 삭제 (삭제 기록은 torrents 삭제 트리거가 남김)"""
+        from sqlalchemy import select
+        from database.bulk_ingest import _chunks
         from database.models import Torrent
         
-        torrent_id = data.get('torrent_id')
-        thumbnail_url = data.get('thumbnail_url', '')
-        server_name = data.get('server_name')
-        
-        # 타입 검증
-        if not torrent_id:
-            return
+        t = Torrent.__table__
+        hashes = [key['info_hash'] for key in keys if key.get('info_hash')]
+        sources = {(key.get('source_site'), key['source_id']) for key in keys if key.get('source_id')}
+        ids = set()
+        for chunk in _chunks(hashes):
+            ids.update(session.execute(select(t.c.id).where(t.c.info_hash.in_(chunk))).scalars())
+        for chunk in _chunks(sorted({source_id for _, source_id in sources})):
+            for torrent_id, site, source_id in session.execute(
+                select(t.c.id, t.c.source_site, t.c.source_id).where(t.c.source_id.in_(chunk))
+            ):
+                if (site, source_id) in sources:
+                    ids.add(torrent_id)
         
-        if not isinstance(torrent_id, int):
-            try:
-                torrent_id = int(torrent_id)
-            except:
-                return
+        deleted = self.db.delete_torrents(session, ids)
+        for torrent_id in ids:
+            self.changes.record('delete', torrent_id, {})
+        return deleted
+
+    def _merge_thumbnail_updates(self, operations: List[WriteOperation]) -> Dict[int, Dict[str, Any]]:
+        """썸네일 업데이트 작업을 torrent_id별로 병합
         
-        if not isinstance(thumbnail_url, str):
-            thumbnail_url = str(thumbnail_url) if thumbnail_url else ''
+        같은 토렌트에 대한 여러 업데이트는 마지막 thumbnail_url을 사용하고
+        서버별 탐색 결과는 마지막 결과를 사용한다. reset_attempts는 그 이전 기록만 지운다.
         
-        try:
-            # SQLAlchemy 1.4/2.0 호환 조회
-            try:
-                torrent = session.get(Torrent, torrent_id)
-            except Exception:
-                torrent = session.query(Torrent).get(torrent_id)
+        Returns:
+            {torrent_id: {'thumbnail_url': str 또는 None(변경 없음), 'attempts': {서버: 결과}, 'reset': bool}}
+        """
+        merged: Dict[int, Dict[str, Any]] = {}
+        # 우선순위 레인 순서가 아니라 요청 순서대로 적용 (나중 요청이 이김)
+        for operation in sorted(operations, key=lambda op: op.timestamp):
+            if operation.op_type == WriteOperationType.UPDATE_THUMBNAIL:
+                updates = [operation.data]
+            else:
+                updates = operation.data['updates']
             
-            if torrent:
-                # thumbnail_url이 문자열인지 확인
-                if not isinstance(thumbnail_url, str):
-                    thumbnail_url = str(thumbnail_url) if thumbnail_url else ''
+            for data in updates:
+                torrent_id = data.get('torrent_id')
+                thumbnail_url = data.get('thumbnail_url', '')
+                server_name = data.get('server_name')
                 
-                torrent.thumbnail_url = thumbnail_url
+                # 타입 검증
+                if not torrent_id:
+                    continue
+                
+                if not isinstance(torrent_id, int):
+                    try:
+                        torrent_id = int(torrent_id)
+                    except (TypeError, ValueError):
+                        continue
                 
-                # 탐색한 서버 목록에 추가 (서버 이름이 제공된 경우)
+                if thumbnail_url is not None and not isinstance(thumbnail_url, str):
+                    thumbnail_url = str(thumbnail_url) if thumbnail_url else ''
+                
+                entry = merged.setdefault(torrent_id, {'thumbnail_url': None, 'attempts': {}, 'reset': False})
+                if data.get('reset_attempts'):
+                    entry['reset'] = True
+                    entry['attempts'] = {}
+                if thumbnail_url is not None:
+                    entry['thumbnail_url'] = thumbnail_url
                 if server_name:
-                    searched_servers = []
-                    if torrent.thumbnail_searched_servers:
-                        try:
-                            searched_servers = json.loads(torrent.thumbnail_searched_servers)
-                        except (json.JSONDecodeError, TypeError):
-                            searched_servers = []
-                    
-                    if server_name not in searched_servers:
-                        searched_servers.append(server_name)
-                        torrent.thumbnail_searched_servers = json.dumps(searched_servers)
-            # torrent가 없으면 조용히 무시
-        except Exception as e:
-            print(f"[DBWriter] ⚠️ 썸네일 업데이트 오류 (torrent_id={torrent_id}): {e}")
-            raise
+                    entry['attempts'][server_name.lower()] = 'found' if thumbnail_url else 'miss'
+        return merged
     
-    def _batch_add_torrents(self, session, torrents: List[Dict[str, Any]]) -> Dict[str, int]:
-        """배치 토렌트 추가"""
-        stats = {'added': 0, 'updated': 0, 'duplicate': 0}
+    def _apply_thumbnail_updates(self, session, merged: Dict[int, Dict[str, Any]]):
+        """병합된 썸네일 업데이트 기록 (존재 확인 IN 조회 + 탐색 기록 upsert + URL executemany)
         
-        for idx, torrent_data in enumerate(torrents):
-            result = self._add_torrent(session, torrent_data)
-            stats[result] = stats.get(result, 0) + 1
+        찾은 썸네일은 같은 제목 묶음(cluster_id)에서 품번이 같고 썸네일이 없는 행에도 복사한다.
+        """
+        from datetime import datetime
+        from sqlalchemy import select, update, bindparam, case, and_, func
+        from database.bulk_ingest import _chunks
+        from database.models import Torrent
         
-        return stats
-    
-    def _batch_update_thumbnails(self, session, updates: List[Dict[str, Any]]):
-        """배치 썸네일 업데이트"""
-        for update in updates:
-            self._update_thumbnail(session, update)
-
+        if not merged:
+            return
+        
+        t = Torrent.__table__
+        existing: Dict[int, str] = {}  # id -> 현재 썸네일 URL (NULL은 '')
+        for chunk in _chunks(list(merged)):
+            for torrent_id, thumbnail_url in session.execute(
+                select(t.c.id, t.c.thumbnail_url).where(t.c.id.in_(chunk))
+            ):
+                existing[torrent_id] = thumbnail_url or ''
+        # torrent가 없으면 조용히 무시
+        merged = {torrent_id: entry for torrent_id, entry in merged.items() if torrent_id in existing}
+        
+        reset_ids = [torrent_id for torrent_id, entry in merged.items() if entry['reset']]
+        if reset_ids:
+            self.db.reset_thumbnail_attempts(session, reset_ids)
+        
+        attempts = [
+            {'torrent_id': torrent_id, 'server': server, 'outcome': outcome}
+            for torrent_id, entry in merged.items()
+            for server, outcome in entry['attempts'].items()
+        ]
+        self.db.record_thumbnail_attempts(session, attempts)
+        
+        now = datetime.utcnow()
+        # 값이 같은 URL은 쓰지 않음 (updated_at / 변경 알림이 바뀌지 않아야 증분 동기화가 같은 행을 다시 보내지 않음)
+        params = [
+            {'_id': torrent_id, '_thumbnail_url': entry['thumbnail_url'], '_updated_at': now}
+            for torrent_id, entry in merged.items()
+            if entry['thumbnail_url'] is not None and entry['thumbnail_url'] != existing[torrent_id]
+        ]
+        if params:
+            # 있던 URL을 빈 값으로 바꾸면 지운 시각 기록 (증분 동기화가 빈 URL도 전파)
+            cleared = and_(bindparam('_thumbnail_url') == '', func.coalesce(t.c.thumbnail_url, '') != '')
+            stmt = update(t).where(
+                t.c.id == bindparam('_id'),
+                func.coalesce(t.c.thumbnail_url, '') != bindparam('_thumbnail_url'),
+            ).values(
+                thumbnail_url=bindparam('_thumbnail_url'),
+                updated_at=bindparam('_updated_at'),
+                thumbnail_cleared_at=case((cleared, bindparam('_updated_at')), else_=t.c.thumbnail_cleared_at),
+            )
+            session.execute(stmt, params)
+            for p in params:
+                self.changes.record('update', p['_id'], {'thumbnail_url': p['_thumbnail_url'], 'updated_at': now})
+            
+            found_ids = [p['_id'] for p in params if p['_thumbnail_url']]
+            if TITLE_CLUSTERING_ENABLED and found_ids:
+                from database import title_clusters
+                cluster_ids = set()
+                for chunk in _chunks(found_ids):
+                    cluster_ids.update(session.execute(
+                        select(t.c.cluster_id).where(t.c.id.in_(chunk), t.c.cluster_id.isnot(None))
+                    ).scalars())
+                shared = title_clusters.share_cluster_thumbnails(session.connection(), cluster_ids)
+                for torrent_id, thumbnail_url in shared:
+                    self.changes.record('update', torrent_id, {'thumbnail_url': thumbnail_url})
@@ -0,0 +1,265 @@
+"""
+설치본 간 증분 동기화 (델타)
+한 설치본이 기준 시각(watermark) 이후 바뀐 토렌트, 썸네일 탐색 결과, 삭제 기록을 델타 파일로 내보내고
+다른 설치본이 DBWriterThread의 일괄 저장 경로(batch_add_torrents / batch_update_thumbnails /
+batch_delete_torrents)로 적용한다.
+
+- 변경 판단: torrents.updated_at, thumbnail_attempts.attempted_at, torrent_tombstones.deleted_at (모두 인덱스)
+- 토렌트는 카탈로그 내보내기(database/catalog_transfer.py)와 같은 레코드이며 수집과 같은 중복 규칙으로 병합된다
+  (다운로드수가 더 많을 때만 갱신하므로 양방향으로 주고받아도 같은 행이 계속 오가지 않음)
+- 썸네일 URL과 서버별 탐색 결과는 받는 쪽 값과 다를 때만 기록한다. 빈 URL은 받는 쪽 썸네일을 지우지 않고,
+  보낸 쪽에서 있던 썸네일을 지운 경우(thumbnail_cleared, 아이콘 / GIF 정리)에만 지운다
+- 보관 DB의 행은 더 이상 바뀌지 않으므로 포함하지 않는다
+- 기준 시각은 대상(peer)별로 sync_peers에 저장하고, 내보내는 동안 커밋된 변경을 놓치지 않도록
+  SYNC_OVERLAP_SECONDS만큼 앞당긴다 (겹친 변경은 다시 적용해도 결과가 같음)
+
+파일 형식 (.gz면 gzip):
+    첫 줄: {"format": "torrent-delta", "version": 1, "since": "..." 또는 null, "watermark": "...", "exported_at": "..."}
+    삭제: {"deleted": {"info_hash": ..., "source_site": ..., "source_id": ..., "title": ...}}
+    토렌트: 카탈로그 레코드 + "thumbnail_attempts": {서버: "found" 또는 "miss"}
+           (+ 있던 썸네일을 지웠으면 "thumbnail_cleared": true)
+    삭제 기록을 먼저 쓴다 (삭제 후 다시 추가된 토렌트가 적용 순서상 지워지지 않도록)
+"""
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from PySide6.QtCore import Qt
+from sqlalchemy import select, or_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from .models import Torrent, ThumbnailAttempt, TorrentTombstone, SyncPeer
+from .magnet import parse_info_hash
+from .bulk_ingest import _chunks
+from .catalog_transfer import _open, _export_rows, CHUNK_SIZE
+from config import SYNC_OVERLAP_SECONDS
+
+FORMAT = 'torrent-delta'
+VERSION = 1
+
+_TOMBSTONE_FIELDS = ('info_hash', 'source_site', 'source_id', 'title')
+
+
+def get_watermark(db, peer: str) -> Optional[datetime]:
+    """대상에 마지막으로 내보낸 기준 시각 (처음이면 None)"""
+    session = db.get_read_session()
+    try:
+        return session.execute(select(SyncPeer.watermark).where(SyncPeer.name == peer)).scalar()
+    finally:
+        session.close()
+
+
+def _save_watermark(db, peer: str, watermark: datetime):
+    p = SyncPeer.__table__
+    stmt = sqlite_insert(p).values(name=peer, watermark=watermark, exported_at=datetime.utcnow())
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[p.c.name],
+        set_={'watermark': stmt.excluded.watermark, 'exported_at': stmt.excluded.exported_at}
+    )
+    with db.write_engine.begin() as conn:
+        conn.execute(stmt)
+
+
+def export_delta(db, path: str, since: Optional[datetime] = None, peer: Optional[str] = None,
+                 full: bool = False, chunk_size: int = CHUNK_SIZE) -> Dict[str, int]:
+    """since 이후 변경분을 델타 파일로 내보내기
+
+    Args:
+        db: Database 인스턴스
+        path: 출력 파일 경로 (.gz면 gzip 압축)
+        since: 기준 시각 (UTC, None이면 peer의 저장된 기준 시각, 그것도 없으면 전체)
+        peer: 동기화 대상 이름 (지정하면 파일을 다 쓴 뒤 새 기준 시각을 저장)
+        full: True면 since와 저장된 기준 시각을 무시하고 전체 내보내기
+        chunk_size: 한 번에 읽는 행 수
+
+    Returns:
+        {'torrents', 'deleted'} 개수
+    """
+    if full:
+        since = None
+    elif since is None and peer:
+        since = get_watermark(db, peer)
+    exported_at = datetime.utcnow()
+    watermark = exported_at - timedelta(seconds=SYNC_OVERLAP_SECONDS)
+    header = {
+        'format': FORMAT,
+        'version': VERSION,
+        'since': since.isoformat() if since is not None else None,
+        'watermark': watermark.isoformat(),
+        'exported_at': exported_at.isoformat(),
+    }
+
+    t = Torrent.__table__
+    a = ThumbnailAttempt.__table__
+    ts = TorrentTombstone.__table__
+    conditions = []
+    tombstones = select(*(ts.c[name] for name in _TOMBSTONE_FIELDS)).order_by(ts.c.id)
+    if since is not None:
+        # 탐색 결과만 바뀐 행도 포함 (miss 기록은 torrents.updated_at을 바꾸지 않음)
+        conditions.append(or_(
+            t.c.updated_at > since,
+            t.c.id.in_(select(a.c.torrent_id).where(a.c.attempted_at > since))
+        ))
+        tombstones = tombstones.where(ts.c.deleted_at > since)
+
+    start = time.time()
+    totals = {'torrents': 0, 'deleted': 0}
+    session = db.get_read_session()
+    try:
+        with _open(path, 'w') as f:
+            f.write(json.dumps(header, ensure_ascii=False) + '\n')
+            for row in session.execute(tombstones.execution_options(yield_per=chunk_size)):
+                f.write(json.dumps({'deleted': dict(zip(_TOMBSTONE_FIELDS, row))}, ensure_ascii=False,
+                                   separators=(',', ':')) + '\n')
+                totals['deleted'] += 1
+            for chunk in _export_rows(session, t, conditions, chunk_size, with_attempts=True):
+                f.writelines(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+                             for record in chunk)
+                totals['torrents'] += len(chunk)
+    finally:
+        session.close()
+
+    if peer:
+        _save_watermark(db, peer, watermark)
+    print(f"[DB] 델타 내보내기: 토렌트 {totals['torrents']}건, 삭제 {totals['deleted']}건 -> {path} "
+          f"(기준 {header['since'] or '전체'}, {time.time() - start:.1f}초)")
+    return totals
+
+
+def _read_delta(path: str, chunk_size: int) -> Iterator[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]:
+    """델타 파일을 (토렌트 청크, 삭제 청크) 단위로 읽기 (파일 순서 유지, upload_date는 datetime으로 변환)"""
+    with _open(path, 'r') as f:
+        header = json.loads(f.readline() or '{}')
+        if header.get('format') != FORMAT:
+            raise ValueError(f"델타 파일 형식이 아닙니다: {path}")
+        if header.get('version', 0) > VERSION:
+            raise ValueError(f"지원하지 않는 델타 버전입니다: {header.get('version')}")
+        records, deleted = [], []
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if 'deleted' in entry:
+                if records:
+                    # 앞선 토렌트를 먼저 적용해야 순서가 유지됨
+                    yield records, deleted
+                    records, deleted = [], []
+                deleted.append(entry['deleted'])
+            else:
+                if deleted:
+                    yield records, deleted
+                    records, deleted = [], []
+                if entry.get('upload_date'):
+                    entry['upload_date'] = datetime.fromisoformat(entry['upload_date'])
+                records.append(entry)
+            if len(records) + len(deleted) >= chunk_size:
+                yield records, deleted
+                records, deleted = [], []
+        if records or deleted:
+            yield records, deleted
+
+
+def _thumbnail_updates(db, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """받는 쪽 값과 다른 썸네일 URL / 탐색 결과만 batch_update_thumbnails 형식으로 만듦 (저장 후 호출)
+
+    빈 URL은 레코드에 thumbnail_cleared가 있을 때만 받는 쪽 썸네일을 지운다
+    (썸네일을 아직 못 찾은 설치본과 주고받아도 있던 썸네일이 사라지지 않음).
+    """
+    t = Torrent.__table__
+    a = ThumbnailAttempt.__table__
+    keys = []
+    for record in records:
+        keys.append((parse_info_hash(record.get('magnet_link') or ''),
+                     (record.get('source_site'), record.get('source_id'))))
+
+    by_hash: Dict[str, int] = {}
+    by_source: Dict[tuple, int] = {}
+    local_urls: Dict[int, Optional[str]] = {}
+    local_attempts: Dict[int, Dict[str, str]] = {}
+    session = db.get_read_session()
+    try:
+        for chunk in _chunks([info_hash for info_hash, _ in keys if info_hash]):
+            for torrent_id, info_hash, url in session.execute(
+                select(t.c.id, t.c.info_hash, t.c.thumbnail_url).where(t.c.info_hash.in_(chunk))
+            ):
+                by_hash[info_hash] = torrent_id
+                local_urls[torrent_id] = url
+        for chunk in _chunks([source[1] for _, source in keys if source[1]]):
+            for torrent_id, site, source_id, url in session.execute(
+                select(t.c.id, t.c.source_site, t.c.source_id, t.c.thumbnail_url).where(t.c.source_id.in_(chunk))
+            ):
+                by_source[(site, source_id)] = torrent_id
+                local_urls[torrent_id] = url
+        for chunk in _chunks(list(local_urls)):
+            for torrent_id, server, outcome in session.execute(
+                select(a.c.torrent_id, a.c.server, a.c.outcome).where(a.c.torrent_id.in_(chunk))
+            ):
+                local_attempts.setdefault(torrent_id, {})[server] = outcome
+    finally:
+        session.close()
+
+    updates = []
+    for record, (info_hash, source) in zip(records, keys):
+        torrent_id = by_hash.get(info_hash) or by_source.get(source)
+        if torrent_id is None:
+            continue
+        url = record.get('thumbnail_url') or ''
+        local_url = local_urls.get(torrent_id) or ''
+        if url != local_url and (url or record.get('thumbnail_cleared')):
+            updates.append({'torrent_id': torrent_id, 'thumbnail_url': url})
+        tried = local_attempts.get(torrent_id, {})
+        for server, outcome in (record.get('thumbnail_attempts') or {}).items():
+            if tried.get(server) == outcome:
+                continue
+            # writer는 URL이 있으면 found, 없으면 miss로 기록
+            updates.append({'torrent_id': torrent_id, 'server_name': server,
+                            'thumbnail_url': url if outcome == 'found' and url else None})
+    return updates
+
+
+def apply_delta(db, writer, path: str, chunk_size: int = CHUNK_SIZE) -> Dict[str, int]:
+    """델타 파일을 DBWriterThread로 적용 (청크마다 저장 커밋을 기다린 뒤 썸네일 차이를 계산)
+
+    Args:
+        db: Database 인스턴스
+        writer: 실행 중인 DBWriterThread
+        path: 델타 파일 경로
+        chunk_size: 한 번에 넣는 행 수
+
+    Returns:
+        {'added', 'updated', 'duplicate', 'skipped', 'thumbnails', 'deleted'} 개수 (deleted는 삭제 요청 수)
+    """
+    totals = {'added': 0, 'updated': 0, 'duplicate': 0, 'skipped': 0, 'thumbnails': 0, 'deleted': 0}
+    lock = threading.Lock()
+
+    def on_batch(stats: dict):
+        with lock:
+            for key, value in stats.items():
+                totals[key] = totals.get(key, 0) + value
+
+    start = time.time()
+    # writer 스레드에서 바로 호출 (CLI에는 이벤트 루프가 없음)
+    writer.batch_completed.connect(on_batch, Qt.DirectConnection)
+    try:
+        for records, deleted in _read_delta(path, chunk_size):
+            if deleted:
+                writer.batch_delete_torrents(deleted)
+                totals['deleted'] += len(deleted)
+            torrents = [record for record in records if record.get('upload_date') and record.get('title')]
+            with lock:
+                totals['skipped'] += len(records) - len(torrents)
+            if not torrents:
+                continue
+            writer.batch_add_torrents(torrents)
+            writer.wait_for_bulk()
+            updates = _thumbnail_updates(db, torrents)
+            if updates:
+                writer.batch_update_thumbnails(updates)
+                totals['thumbnails'] += len(updates)
+        writer.queue.join()
+    finally:
+        writer.batch_completed.disconnect(on_batch)
+
+    print(f"[DB] 델타 적용: 추가 {totals['added']}건, 갱신 {totals['updated']}건, 중복 {totals['duplicate']}건, "
+          f"썸네일 {totals['thumbnails']}건, 삭제 요청 {totals['deleted']}건 ({time.time() - start:.1f}초)")
+    return totals
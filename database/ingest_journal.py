@@ -0,0 +1,146 @@
+"""
+스크래핑 페이지 수집 저널 (crash-safe)
+DBWriterThread 큐에 넣기 전에 페이지를 NDJSON 한 줄로 파일에 추가하고 fsync한다.
+커밋된 페이지는 완료 표시를 남기고, 미완료 페이지가 없으면 파일을 비운다.
+
+비정상 종료(트레이 강제 종료 등) 후 다시 시작하면 완료 표시가 없는 페이지를 큐에 다시 넣으므로
+큐에만 있던 페이지를 다시 스크래핑하지 않아도 된다. 일괄 저장은 info hash / source_id 기준 upsert라
+완료 표시가 기록되기 전에 종료되어 같은 페이지를 한 번 더 저장해도 결과는 같다.
+
+줄 형식:
+    {"seq": 1, "torrents": [...]}   페이지 (datetime은 {"$dt": "ISO 문자열"})
+    {"done": [1, 2]}                커밋 완료 표시
+"""
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+_DATETIME_KEY = '$dt'
+
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return {_DATETIME_KEY: value.isoformat()}
+    if isinstance(value, (set, tuple)):
+        return list(value)
+    return str(value)
+
+
+def _decode(obj: Dict[str, Any]):
+    if len(obj) == 1 and _DATETIME_KEY in obj:
+        return datetime.fromisoformat(obj[_DATETIME_KEY])
+    return obj
+
+
+def journal_path(db_path: str, path: str = '') -> str:
+    """저널 파일 경로 (path가 비어 있으면 DB 파일과 같은 폴더의 ingest_journal.ndjson)"""
+    if path:
+        return path
+    return os.path.join(os.path.dirname(os.path.abspath(db_path)), 'ingest_journal.ndjson')
+
+
+class IngestJournal:
+    """스크래핑 페이지 추가 전용 저널 (스크래퍼 스레드와 DBWriterThread가 함께 사용)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+        self._next_seq = 1
+        self._pending = set()  # 커밋되지 않은 페이지 seq
+
+    def recover(self) -> List[Tuple[int, List[Dict[str, Any]]]]:
+        """기존 저널에서 미완료 페이지를 읽고 파일을 그 페이지들만 남기도록 다시 쓴 뒤 추가 모드로 엶
+
+        Returns:
+            [(seq, 토렌트 목록), ...] (추가된 순서)
+        """
+        pages: Dict[int, List[Dict[str, Any]]] = {}
+        done = set()
+        skipped = 0
+        if os.path.exists(self.path):
+            with open(self.path, 'rb') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line, object_hook=_decode)
+                    except ValueError:
+                        # 쓰는 도중 종료되어 잘린 마지막 줄
+                        skipped += 1
+                        continue
+                    if 'done' in entry:
+                        done.update(entry['done'])
+                    elif 'seq' in entry:
+                        pages[entry['seq']] = entry.get('torrents') or []
+        pending = [(seq, torrents) for seq, torrents in sorted(pages.items()) if seq not in done]
+
+        with self._lock:
+            # 미완료 페이지만 임시 파일에 쓴 뒤 교체 (교체 전에 종료되면 기존 저널이 그대로 남음)
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                for seq, torrents in pending:
+                    f.write(self._page_line(seq, torrents))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            self._file = open(self.path, 'ab')
+            self._pending = {seq for seq, _ in pending}
+            self._next_seq = max(pages, default=0) + 1
+
+        if pending or skipped:
+            count = sum(len(torrents) for _, torrents in pending)
+            print(f"[DB] 수집 저널 복구: {len(pending)}페이지 ({count}건)"
+                  + (f", 손상된 줄 {skipped}개 무시" if skipped else ""))
+        return pending
+
+    @staticmethod
+    def _page_line(seq: int, torrents: List[Dict[str, Any]]) -> bytes:
+        data = json.dumps({'seq': seq, 'torrents': torrents}, ensure_ascii=False,
+                          separators=(',', ':'), default=_encode)
+        return data.encode('utf-8') + b'\n'
+
+    def append(self, torrents: List[Dict[str, Any]]) -> Optional[int]:
+        """페이지 추가 후 fsync (반환 후에는 비정상 종료에도 남음)
+
+        Returns:
+            페이지 seq (저널이 닫혀 있으면 None)
+        """
+        with self._lock:
+            if self._file is None:
+                return None
+            seq = self._next_seq
+            self._next_seq += 1
+            self._file.write(self._page_line(seq, torrents))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._pending.add(seq)
+            return seq
+
+    def complete(self, seqs: Iterable[int]):
+        """커밋된 페이지 완료 표시 (미완료 페이지가 없으면 파일 비움)
+
+        완료 표시는 fsync하지 않는다. 표시가 유실되면 다음 시작 때 한 번 더 저장될 뿐이다.
+        """
+        seqs = [seq for seq in seqs if seq is not None]
+        if not seqs:
+            return
+        with self._lock:
+            if self._file is None:
+                return
+            self._pending.difference_update(seqs)
+            try:
+                if self._pending:
+                    self._file.write(json.dumps({'done': seqs}, separators=(',', ':')).encode('utf-8') + b'\n')
+                    self._file.flush()
+                else:
+                    self._file.truncate(0)
+                    os.fsync(self._file.fileno())
+            except OSError as e:
+                print(f"[DB] 수집 저널 완료 표시 실패: {e}")
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
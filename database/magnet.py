@@ -0,0 +1,113 @@
+"""
+magnet 링크 파싱 유틸리티
+BTIH(BitTorrent info hash)를 뽑아서 중복 확인 키로 사용하고,
+저장할 때는 info hash / 나머지 파라미터 / tracker 목록으로 나눠서 보관한다.
+"""
+import base64
+import binascii
+import re
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from urllib.parse import quote, unquote, unquote_plus
+
+# xt=urn:btih:<40자 hex 또는 32자 base32>
+_BTIH_RE = re.compile(r'xt=urn:btih:([0-9a-z]{40}|[a-z2-7]{32})(?![0-9a-z])', re.I)
+
+
+def parse_info_hash(magnet_link: Optional[str]) -> Optional[str]:
+    """magnet 링크에서 info hash 추출
+
+    Args:
+        magnet_link: magnet:?xt=urn:btih:... 형식 링크
+
+    Returns:
+        소문자 hex 40자 (없거나 형식이 잘못되면 None)
+    """
+    if not magnet_link:
+        return None
+    match = _BTIH_RE.search(magnet_link)
+    if not match:
+        return None
+    value = match.group(1)
+    if len(value) == 40:
+        value = value.lower()
+        return value if re.fullmatch(r'[0-9a-f]{40}', value) else None
+    # base32 표기 (구형 클라이언트)
+    try:
+        return base64.b32decode(value.upper()).hex()
+    except (binascii.Error, ValueError):
+        return None
+
+
+@lru_cache(maxsize=1024)
+def _decode_tracker(value: str) -> str:
+    # 같은 tracker가 모든 행에 반복되므로 디코딩 결과 캐시
+    return unquote(value)
+
+
+def _same_hash(value: str, info_hash: str) -> bool:
+    if len(value) == 40:
+        return value.lower() == info_hash
+    return parse_info_hash(f'xt=urn:btih:{value}') == info_hash
+
+
+def split_magnet(magnet_link: Optional[str], title: Optional[str] = None) -> Optional[Tuple[str, str, List[str]]]:
+    """magnet 링크를 저장용 조각으로 분리
+
+    tracker 목록은 수십만 행에 똑같이 반복되므로 tracker_sets 테이블에 따로 저장하고,
+    dn이 제목과 같으면 버린다 (build_magnet에서 제목으로 다시 만듦).
+
+    Args:
+        magnet_link: magnet:?xt=urn:btih:... 형식 링크
+        title: 토렌트 제목
+
+    Returns:
+        (info hash, 나머지 파라미터 문자열, tracker URL 리스트) 또는 None (분리할 수 없는 링크)
+    """
+    if not magnet_link or not magnet_link.lower().startswith('magnet:?'):
+        return None
+    info_hash = parse_info_hash(magnet_link)
+    if not info_hash:
+        return None
+
+    rest = []
+    trackers = []
+    for part in magnet_link[len('magnet:?'):].split('&'):
+        if not part:
+            continue
+        key, _, value = part.partition('=')
+        key = key.lower()
+        if key == 'tr':
+            trackers.append(_decode_tracker(value))
+        elif key == 'xt' and value.lower().startswith('urn:btih:') and _same_hash(value[9:], info_hash):
+            continue
+        elif key == 'dn' and title and unquote_plus(value) == title:
+            continue
+        else:
+            rest.append(part)
+    return info_hash, '&'.join(rest), trackers
+
+
+def join_trackers(trackers: List[str]) -> str:
+    """tracker_sets.trackers 저장 형식 (순서 유지, 줄바꿈 구분)"""
+    return '\n'.join(trackers)
+
+
+def build_magnet(info_hash: str, rest: Optional[str], trackers: Optional[str], title: Optional[str] = None) -> str:
+    """split_magnet으로 나눈 조각에서 magnet 링크 복원
+
+    Args:
+        info_hash: 소문자 hex 40자
+        rest: 나머지 파라미터 문자열 (magnet_link 컬럼 값)
+        trackers: join_trackers 형식 tracker 목록
+        title: 토렌트 제목 (rest에 dn이 없으면 dn으로 사용)
+    """
+    parts = [f'xt=urn:btih:{info_hash}']
+    rest_parts = [p for p in (rest or '').split('&') if p]
+    if title and not any(p.lower().startswith('dn=') for p in rest_parts):
+        parts.append(f'dn={quote(title, safe="")}')
+    parts.extend(rest_parts)
+    for tracker in (trackers or '').split('\n'):
+        if tracker:
+            parts.append(f'tr={quote(tracker, safe="")}')
+    return 'magnet:?' + '&'.join(parts)
@@ -0,0 +1,129 @@
+"""
+썸네일 정리 / 탐색 기록 초기화 (집합 단위 SQL)
+행을 파이썬으로 읽어 하나씩 고치지 않고, id 범위마다 짧은 쓰기 트랜잭션(BEGIN IMMEDIATE)에서
+UPDATE ... WHERE / DELETE ... WHERE 한 번으로 처리한다. 범위 사이에 잠금을 놓으므로
+DBWriterThread가 쓰기 잠금을 오래 기다리지 않는다.
+
+- GIF 판별은 연결마다 등록된 REGEXP 함수(regexp)를 쓰되 LIKE '%.gif%'로 먼저 거른 행에만 호출한다
+- 진행률은 progress(처리한 범위 끝 id, 최대 id) 콜백으로 알린다
+"""
+import re
+import time
+from datetime import datetime
+from typing import Callable, Iterator, List, Optional, Tuple
+
+# 한 트랜잭션이 훑는 id 범위 (rowid 범위 조회라 행 수가 많아도 짧음)
+CHUNK_SIZE = 50000
+# SQLite 바인드 변수 제한을 넘지 않도록 IN (...)을 나누는 크기
+IN_CHUNK_SIZE = 500
+
+# GIF 썸네일 (.gif로 끝나거나 뒤에 ? # & / 가 오는 URL)
+GIF_PATTERN = r'(?i)\.gif([?#&/]|$)'
+# 이미지가 아닌 썸네일 (사이트 아이콘, javbee 저장소 경로 / 대체 이미지), LIKE는 ASCII 대소문자 무시
+PLACEHOLDER_PATTERNS = ('%.ico%', '%favicon%', '%javbee.vip/storage/%', '%39466ce5e12977f09eddf35bf06aa721.jpg%')
+
+ProgressCallback = Optional[Callable[[int, int], None]]
+
+
+def regexp(pattern: str, value) -> bool:
+    """SQLite REGEXP 함수 (X REGEXP Y는 regexp(Y, X)로 호출됨, NULL은 불일치)"""
+    if value is None:
+        return False
+    return re.search(pattern, value) is not None
+
+
+def _id_ranges(db, table: str, column: str, chunk_size: int) -> Iterator[Tuple[int, int, int]]:
+    """(시작 id 초과, 끝 id 이하, 최대 id) 범위 목록"""
+    with db.read_engine.connect() as conn:
+        max_id = conn.connection.driver_connection.execute(f"SELECT max({column}) FROM {table}").fetchone()[0] or 0
+    for low in range(0, max_id, chunk_size):
+        yield low, min(low + chunk_size, max_id), max_id
+
+
+def _clear_thumbnails(db, condition: str, params: tuple, reset_attempts: bool,
+                      chunk_size: int, progress: ProgressCallback) -> List[int]:
+    """조건에 맞는 썸네일 URL을 빈 값으로 초기화 (reset_attempts면 탐색 기록도 삭제)
+
+    thumbnail_cleared_at을 기록해서 증분 동기화가 받는 쪽의 같은 썸네일도 지우게 한다.
+
+    Returns:
+        초기화한 torrent_id 목록
+    """
+    # SQLAlchemy DateTime과 같은 문자열 형식 (증분 동기화 기준)
+    now = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S.%f')
+    sql = (
+        f"UPDATE torrents SET thumbnail_url = '', updated_at = ?, thumbnail_cleared_at = ? "
+        f"WHERE id > ? AND id <= ? AND ({condition}) RETURNING id"
+    )
+    cleared: List[int] = []
+    for low, high, max_id in _id_ranges(db, 'torrents', 'id', chunk_size):
+        with db.write_engine.begin() as conn:
+            raw = conn.connection.driver_connection
+            ids = [row[0] for row in raw.execute(sql, (now, now, low, high) + params)]
+            if reset_attempts:
+                for i in range(0, len(ids), IN_CHUNK_SIZE):
+                    chunk = ids[i:i + IN_CHUNK_SIZE]
+                    raw.execute(
+                        f"DELETE FROM thumbnail_attempts WHERE torrent_id IN ({', '.join('?' * len(chunk))})", chunk
+                    )
+        cleared.extend(ids)
+        if progress is not None:
+            progress(high, max_id)
+
+    if cleared:
+        db.notify_data_changed(changed_ids=cleared)
+    return cleared
+
+
+def clear_gif_thumbnails(db, chunk_size: int = CHUNK_SIZE, progress: ProgressCallback = None) -> List[int]:
+    """GIF 썸네일 URL과 그 토렌트의 탐색 기록 초기화 (다시 탐색하도록)
+
+    Returns:
+        초기화한 torrent_id 목록
+    """
+    start = time.time()
+    cleared = _clear_thumbnails(
+        db, "thumbnail_url LIKE '%.gif%' AND thumbnail_url REGEXP ?", (GIF_PATTERN,),
+        reset_attempts=True, chunk_size=chunk_size, progress=progress
+    )
+    if cleared:
+        print(f"[DB] GIF 썸네일 {len(cleared)}개 초기화 ({time.time() - start:.2f}초)")
+    return cleared
+
+
+def clear_placeholder_thumbnails(db, chunk_size: int = CHUNK_SIZE, progress: ProgressCallback = None) -> List[int]:
+    """아이콘(.ico, favicon) / javbee 저장소 이미지 썸네일 URL 초기화 (탐색 기록은 유지)
+
+    Returns:
+        초기화한 torrent_id 목록
+    """
+    start = time.time()
+    condition = ' OR '.join('thumbnail_url LIKE ?' for _ in PLACEHOLDER_PATTERNS)
+    cleared = _clear_thumbnails(
+        db, condition, PLACEHOLDER_PATTERNS,
+        reset_attempts=False, chunk_size=chunk_size, progress=progress
+    )
+    if cleared:
+        print(f"[DB] 아이콘/대체 이미지 썸네일 {len(cleared)}개 초기화 ({time.time() - start:.2f}초)")
+    return cleared
+
+
+def reset_all_thumbnail_attempts(db, chunk_size: int = CHUNK_SIZE, progress: ProgressCallback = None) -> int:
+    """전체 썸네일 탐색 기록을 torrent_id 범위별로 삭제
+
+    Returns:
+        탐색 기록이 있던 토렌트 수
+    """
+    reset_count = 0
+    for low, high, max_id in _id_ranges(db, 'thumbnail_attempts', 'torrent_id', chunk_size):
+        with db.write_engine.begin() as conn:
+            raw = conn.connection.driver_connection
+            # 기본 키(torrent_id, server) 범위 조회
+            reset_count += raw.execute(
+                "SELECT count(DISTINCT torrent_id) FROM thumbnail_attempts WHERE torrent_id > ? AND torrent_id <= ?",
+                (low, high)
+            ).fetchone()[0]
+            raw.execute("DELETE FROM thumbnail_attempts WHERE torrent_id > ? AND torrent_id <= ?", (low, high))
+        if progress is not None:
+            progress(high, max_id)
+    return reset_count
@@ -0,0 +1,378 @@
+"""
+스키마 버전 관리 및 순차 마이그레이션
+schema_version 테이블에 마지막으로 적용한 버전을 저장하고, 그 이후 마이그레이션만 한 번씩 실행한다.
+최신 버전이면 시작 시 버전 한 줄만 읽고 끝난다.
+
+새 테이블/컬럼/인덱스는 MIGRATIONS 끝에 (버전, 설명, 함수)로 추가한다.
+버전 정보가 없던 기존 DB도 처음부터 다시 적용하므로 각 함수는 여러 번 실행해도 안전해야 한다.
+"""
+from sqlalchemy import text, inspect, insert
+from .models import (
+    GENRE_MASK_BITS, Base, Torrent, Genre, Country, ThumbnailAttempt, TrackerSet, TorrentStat, TitleLshBucket,
+    TorrentTombstone, SyncPeer, torrent_genres
+)
+
+
+def _column_names(conn, table: str) -> list:
+    return [col['name'] for col in inspect(conn).get_columns(table)]
+
+
+def _create_indexes(conn, names: set):
+    """모델에 선언된 인덱스 중 지정한 것만 생성 (이미 있으면 건너뜀)
+
+    모델의 인덱스 전체를 만들면 이후 버전에서 추가된 컬럼의 인덱스까지 만들려고 하므로 이름으로 고른다.
+    """
+    for table in (Torrent.__table__, Genre.__table__, torrent_genres, ThumbnailAttempt.__table__):
+        for index in table.indexes:
+            if index.name in names:
+                index.create(conn, checkfirst=True)
+
+
+def _create_base_tables(conn):
+    """기본 테이블 생성 (torrents, genres, countries, torrent_genres)"""
+    Base.metadata.create_all(
+        conn,
+        tables=[Torrent.__table__, Genre.__table__, Country.__table__, torrent_genres]
+    )
+
+
+def _add_thumbnail_searched_servers(conn):
+    """torrents.thumbnail_searched_servers 컬럼 추가 (구버전 DB)"""
+    if 'thumbnail_searched_servers' not in _column_names(conn, 'torrents'):
+        conn.execute(text("ALTER TABLE torrents ADD COLUMN thumbnail_searched_servers TEXT DEFAULT '[]'"))
+
+
+def _add_views_column(conn):
+    """torrents.views 컬럼 추가 (기존 데이터는 완료수 x 5로 추정, 구 add_views_column.py)"""
+    if 'views' not in _column_names(conn, 'torrents'):
+        conn.execute(text("ALTER TABLE torrents ADD COLUMN views INTEGER DEFAULT 0"))
+        conn.execute(text("UPDATE torrents SET views = downloads * 5 WHERE views = 0 OR views IS NULL"))
+
+
+def _seed_reference_data(conn):
+    """초기 장르 및 국가 데이터 추가 (비어 있을 때만)"""
+    if conn.execute(text("SELECT 1 FROM genres LIMIT 1")).first() is None:
+        genres_data = [
+            ('Blowjob', 'BJ/펠라치오'),
+            ('Handjob', '핸드잡'),
+            ('Threesome', '쓰리썸'),
+            ('Creampie', '크림파이'),
+            ('Anal', '항문'),
+            ('BDSM', 'BDSM'),
+            ('Bondage', '속박'),
+            ('Cosplay', '코스프레'),
+            ('Schoolgirl', '여학생'),
+            ('MILF', '숙녀'),
+            ('Amateur', '아마추어'),
+            ('POV', 'POV'),
+            ('Gangbang', '갱뱅'),
+            ('Lesbian', '레즈비언'),
+            ('Solo', '솔로'),
+            ('Masturbation', '자위'),
+            ('Toy', '도구'),
+            ('Squirting', '분수'),
+            ('Bukkake', '부카케'),
+            ('Outdoor', '야외'),
+            ('Massage', '마사지'),
+            ('Office', '오피스'),
+        ]
+        conn.execute(
+            Genre.__table__.insert(),
+            [{'name': name, 'name_kr': name_kr} for name, name_kr in genres_data]
+        )
+
+    if conn.execute(text("SELECT 1 FROM countries LIMIT 1")).first() is None:
+        countries_data = [
+            ('JP', 'Japan', '일본'),
+            ('CN', 'China', '중국'),
+            ('KR', 'Korea', '한국'),
+            ('US', 'United States', '미국'),
+            ('EU', 'Europe', '유럽'),
+            ('TH', 'Thailand', '태국'),
+            ('TW', 'Taiwan', '대만'),
+            ('OTHER', 'Other', '기타'),
+        ]
+        conn.execute(
+            Country.__table__.insert(),
+            [{'code': code, 'name': name, 'name_kr': name_kr} for code, name, name_kr in countries_data]
+        )
+
+
+def _create_fulltext_index(conn):
+    """제목 검색용 FTS5 인덱스 생성 및 동기화 트리거 설정
+
+    trigram 토크나이저를 사용하여 띄어쓰기가 없는 한중일 제목도 부분 문자열로 검색한다.
+    트리거가 torrents의 INSERT/UPDATE/DELETE를 따라가므로 DBWriterThread는 따로 할 일이 없다.
+    FTS5를 지원하지 않는 SQLite면 건너뛴다 (Database.fts_enabled=False → LIKE 검색).
+    """
+    if conn.execute(text("SELECT 1 FROM sqlite_master WHERE type='table' AND name='torrents_fts'")).first():
+        return
+    try:
+        # FTS5 실패가 다른 마이그레이션을 되돌리지 않도록 SAVEPOINT 안에서 시도
+        with conn.begin_nested():
+            conn.execute(text(
+                "CREATE VIRTUAL TABLE torrents_fts USING fts5("
+                "title, content='torrents', content_rowid='id', tokenize='trigram')"
+            ))
+    except Exception as e:
+        print(f"[DB] FTS5 인덱스 사용 불가 (LIKE 검색으로 대체): {e}")
+        return
+    conn.execute(text(
+        "CREATE TRIGGER IF NOT EXISTS torrents_fts_ai AFTER INSERT ON torrents BEGIN "
+        "INSERT INTO torrents_fts(rowid, title) VALUES (new.id, new.title); END"
+    ))
+    conn.execute(text(
+        "CREATE TRIGGER IF NOT EXISTS torrents_fts_ad AFTER DELETE ON torrents BEGIN "
+        "INSERT INTO torrents_fts(torrents_fts, rowid, title) VALUES ('delete', old.id, old.title); END"
+    ))
+    conn.execute(text(
+        "CREATE TRIGGER IF NOT EXISTS torrents_fts_au AFTER UPDATE OF title ON torrents BEGIN "
+        "INSERT INTO torrents_fts(torrents_fts, rowid, title) VALUES ('delete', old.id, old.title); "
+        "INSERT INTO torrents_fts(rowid, title) VALUES (new.id, new.title); END"
+    ))
+    # 기존 데이터로 인덱스 채우기
+    conn.execute(text("INSERT INTO torrents_fts(torrents_fts) VALUES ('rebuild')"))
+
+
+def _create_thumbnail_attempts(conn):
+    """thumbnail_attempts 테이블 생성 후 thumbnail_searched_servers(JSON) 기록을 옮기고 비움"""
+    ThumbnailAttempt.__table__.create(conn, checkfirst=True)
+
+    legacy = "thumbnail_searched_servers IS NOT NULL AND thumbnail_searched_servers NOT IN ('', '[]')"
+    result = conn.execute(text(
+        "INSERT OR IGNORE INTO thumbnail_attempts (torrent_id, server, attempted_at, outcome) "
+        "SELECT t.id, lower(j.value), COALESCE(t.updated_at, t.created_at, CURRENT_TIMESTAMP), 'legacy' "
+        "FROM torrents t, json_each(t.thumbnail_searched_servers) j "
+        f"WHERE t.{legacy} AND json_valid(t.thumbnail_searched_servers) AND j.type = 'text'"
+    ))
+    conn.execute(text(f"UPDATE torrents SET thumbnail_searched_servers = '[]' WHERE {legacy}"))
+    if result.rowcount:
+        print(f"[DB] 썸네일 탐색 기록 {result.rowcount}건 이전됨")
+
+
+def _create_query_indexes(conn):
+    """필터/정렬 조합용 인덱스 생성 (모델에 선언된 인덱스 중 없는 것만) 후 통계 수집
+
+    어떤 조합이 인덱스를 타는지는 check_query_plans.py로 확인한다.
+    """
+    names = {
+        'ix_torrents_size_bytes', 'ix_torrents_leechers', 'ix_torrents_downloads',
+        'ix_torrents_censored_upload', 'ix_torrents_country_upload', 'ix_torrents_censored_country_upload',
+        'ix_torrent_genres_genre_torrent',
+    }
+    _create_indexes(conn, names)
+    # 새 인덱스를 쿼리 플래너가 고를 수 있도록 통계 수집 (행 샘플링으로 큰 DB에서도 빠르게)
+    conn.execute(text("PRAGMA analysis_limit=1000"))
+    conn.execute(text("ANALYZE"))
+
+
+def _add_info_hash(conn):
+    """torrents.info_hash 컬럼 추가 후 magnet 링크에서 채우고 인덱스 생성"""
+    from .magnet import parse_info_hash
+
+    if 'info_hash' not in _column_names(conn, 'torrents'):
+        conn.execute(text("ALTER TABLE torrents ADD COLUMN info_hash VARCHAR(40)"))
+
+    # 파싱은 파이썬 함수를 SQL 함수로 등록해서 UPDATE 한 번으로 처리
+    conn.connection.driver_connection.create_function('parse_info_hash', 1, parse_info_hash, deterministic=True)
+    result = conn.execute(text(
+        "UPDATE torrents SET info_hash = parse_info_hash(magnet_link) "
+        "WHERE info_hash IS NULL AND magnet_link LIKE '%btih:%'"
+    ))
+    if result.rowcount:
+        print(f"[DB] info hash {result.rowcount}건 추출됨")
+
+    _create_indexes(conn, {'ix_torrents_info_hash'})
+
+
+def _compact_magnet_links(conn):
+    """magnet 링크를 info hash / 나머지 파라미터 / tracker_sets 참조로 분리
+
+    같은 tracker 목록이 모든 행에 반복되던 것을 tracker_sets 한 행으로 합친다.
+    줄어든 공간은 DB 파일 안에서 재사용되며, 파일 자체를 줄이려면 VACUUM을 실행한다.
+    """
+    from .magnet import split_magnet, join_trackers
+
+    TrackerSet.__table__.create(conn, checkfirst=True)
+    if 'tracker_set_id' not in _column_names(conn, 'torrents'):
+        conn.execute(text("ALTER TABLE torrents ADD COLUMN tracker_set_id INTEGER REFERENCES tracker_sets(id)"))
+
+    set_ids = {trackers: set_id for set_id, trackers in conn.execute(text("SELECT id, trackers FROM tracker_sets"))}
+    # info_hash는 8번에서 이미 채워졌으므로 건드리지 않음 (인덱스 갱신 생략)
+    update = text("UPDATE torrents SET magnet_link = :magnet_link, tracker_set_id = :tracker_set_id WHERE id = :_id")
+    last_id = 0
+    compacted = 0
+    while True:
+        rows = conn.execute(text(
+            "SELECT id, title, magnet_link FROM torrents "
+            "WHERE id > :last_id AND magnet_link LIKE 'magnet:%' ORDER BY id LIMIT 5000"
+        ), {'last_id': last_id}).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        params = []
+        for torrent_id, title, magnet_link in rows:
+            parts = split_magnet(magnet_link, title)
+            if parts is None:
+                continue
+            _, rest, trackers = parts
+            key = join_trackers(trackers)
+            set_id = set_ids.get(key) if key else None
+            if key and set_id is None:
+                set_id = conn.execute(insert(TrackerSet.__table__).values(trackers=key)).inserted_primary_key[0]
+                set_ids[key] = set_id
+            params.append({'_id': torrent_id, 'magnet_link': rest, 'tracker_set_id': set_id})
+        if params:
+            conn.execute(update, params)
+            compacted += len(params)
+
+    if compacted:
+        print(f"[DB] magnet 링크 {compacted}건 분리됨 (tracker 목록 {len(set_ids)}종)")
+
+
+def _create_torrent_stats(conn):
+    """torrent_stats 시계열 테이블 및 torrents.trending_score 컬럼 추가"""
+    TorrentStat.__table__.create(conn, checkfirst=True)
+    if 'trending_score' not in _column_names(conn, 'torrents'):
+        conn.execute(text("ALTER TABLE torrents ADD COLUMN trending_score FLOAT DEFAULT 0.0"))
+    _create_indexes(conn, {'ix_torrents_trending_score'})
+
+
+def _add_genre_mask(conn):
+    """genres.bit / torrents.genre_mask 컬럼 추가 후 torrent_genres로 마스크 채우기"""
+    if 'bit' not in _column_names(conn, 'genres'):
+        conn.execute(text("ALTER TABLE genres ADD COLUMN bit INTEGER"))
+    _create_indexes(conn, {'ix_genres_bit'})
+
+    # 비트가 없는 장르에 id 순서대로 남은 비트 배정
+    used = {bit for (bit,) in conn.execute(text("SELECT bit FROM genres WHERE bit IS NOT NULL"))}
+    free = [bit for bit in range(GENRE_MASK_BITS) if bit not in used]
+    unassigned = conn.execute(text("SELECT id FROM genres WHERE bit IS NULL ORDER BY id")).scalars().all()
+    params = [{'_id': genre_id, 'bit': bit} for genre_id, bit in zip(unassigned, free)]
+    if params:
+        conn.execute(text("UPDATE genres SET bit = :bit WHERE id = :_id"), params)
+
+    if 'genre_mask' not in _column_names(conn, 'torrents'):
+        conn.execute(text("ALTER TABLE torrents ADD COLUMN genre_mask INTEGER DEFAULT 0"))
+    # (torrent_id, genre_id)가 기본 키이고 비트가 장르마다 다르므로 SUM = 비트 OR
+    conn.execute(text(
+        "UPDATE torrents SET genre_mask = ("
+        "  SELECT COALESCE(SUM(1 << g.bit), 0) FROM torrent_genres tg JOIN genres g ON g.id = tg.genre_id "
+        "  WHERE tg.torrent_id = torrents.id AND g.bit IS NOT NULL"
+        ") WHERE id IN (SELECT torrent_id FROM torrent_genres)"
+    ))
+
+
+def _add_title_clusters(conn):
+    """torrents.cluster_id 컬럼 및 제목 LSH 버킷 테이블 추가 (기존 행 배정은 Database가 백그라운드에서 처리)"""
+    if 'cluster_id' not in _column_names(conn, 'torrents'):
+        conn.execute(text("ALTER TABLE torrents ADD COLUMN cluster_id INTEGER"))
+    _create_indexes(conn, {'ix_torrents_cluster_id'})
+    TitleLshBucket.__table__.create(conn, checkfirst=True)
+
+
+def _add_delta_sync(conn):
+    """증분 동기화용 updated_at / attempted_at 인덱스, 삭제 기록 테이블과 트리거, 동기화 대상 테이블"""
+    # updated_at이 비어 있는 예전 행은 처음 델타에 포함되도록 생성 시각으로 채움
+    conn.execute(text(
+        "UPDATE torrents SET updated_at = COALESCE(created_at, upload_date) WHERE updated_at IS NULL"
+    ))
+    _create_indexes(conn, {'ix_torrents_updated_at', 'ix_thumbnail_attempts_attempted_at'})
+    TorrentTombstone.__table__.create(conn, checkfirst=True)
+    SyncPeer.__table__.create(conn, checkfirst=True)
+    # SQLAlchemy DateTime 저장 형식(마이크로초 6자리)에 맞춰 문자열 비교가 되도록 함
+    conn.execute(text(
+        "CREATE TRIGGER IF NOT EXISTS torrents_tombstone AFTER DELETE ON torrents BEGIN "
+        "INSERT INTO torrent_tombstones (torrent_id, info_hash, source_site, source_id, title, deleted_at) "
+        "VALUES (old.id, old.info_hash, old.source_site, old.source_id, old.title, "
+        "strftime('%Y-%m-%d %H:%M:%f', 'now') || '000'); END"
+    ))
+
+
+
+def _add_thumbnail_cleared_at(conn):
+    """torrents.thumbnail_cleared_at 컬럼 추가 (지운 썸네일을 증분 동기화로 전파)"""
+    if 'thumbnail_cleared_at' not in _column_names(conn, 'torrents'):
+        conn.execute(text("ALTER TABLE torrents ADD COLUMN thumbnail_cleared_at DATETIME"))
+
+
+
+def _reset_title_clusters(conn):
+    """제목 묶음 다시 배정 (화수 / 파트 숫자가 다른 제목이 이어진 묶음 해제, Database가 백그라운드에서 다시 채움)"""
+    conn.execute(text("DELETE FROM title_lsh"))
+    conn.execute(text("UPDATE torrents SET cluster_id = NULL WHERE cluster_id IS NOT NULL"))
+
+
+
+def _drop_genre_mask_index(conn):
+    """ix_torrents_genre_mask 삭제 (genre_mask & :m = :m 비트 연산은 B-tree 인덱스로 좁힐 수 없어 쓰기 비용만 듦)"""
+    schemas = [row[1] for row in conn.execute(text("PRAGMA database_list"))]
+    for schema in schemas:
+        if schema != 'temp':
+            conn.execute(text(f"DROP INDEX IF EXISTS {schema}.ix_torrents_genre_mask"))
+
+
+# (버전, 설명, 함수) - 버전은 1부터 빠짐없이 증가
+MIGRATIONS = [
+    (1, '기본 테이블 생성', _create_base_tables),
+    (2, 'thumbnail_searched_servers 컬럼 추가', _add_thumbnail_searched_servers),
+    (3, 'views 컬럼 추가', _add_views_column),
+    (4, '초기 장르/국가 데이터', _seed_reference_data),
+    (5, '제목 전문 검색 인덱스(FTS5)', _create_fulltext_index),
+    (6, '썸네일 탐색 기록 테이블', _create_thumbnail_attempts),
+    (7, '필터/정렬 복합 인덱스', _create_query_indexes),
+    (8, 'info hash 컬럼', _add_info_hash),
+    (9, 'magnet 링크 tracker 목록 분리', _compact_magnet_links),
+    (10, '통계 시계열 / 급상승 점수', _create_torrent_stats),
+    (11, '장르 비트마스크', _add_genre_mask),
+    (12, '제목 유사 중복 묶음', _add_title_clusters),
+    (13, '증분 동기화 (변경 시각 인덱스, 삭제 기록)', _add_delta_sync),
+    (14, '썸네일 정리 시각', _add_thumbnail_cleared_at),
+    (15, '제목 묶음 다시 배정 (숫자 비교)', _reset_title_clusters),
+    (16, '장르 비트마스크 인덱스 삭제', _drop_genre_mask_index),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn) -> int:
+    """현재 스키마 버전 (schema_version 테이블이 없으면 0)"""
+    exists = conn.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='schema_version'"
+    )).first()
+    if not exists:
+        return 0
+    return conn.execute(text("SELECT version FROM schema_version")).scalar() or 0
+
+
+def upgrade(engine) -> int:
+    """적용되지 않은 마이그레이션을 순서대로 실행
+
+    마이그레이션마다 별도 트랜잭션으로 실행하고 같은 트랜잭션에서 버전을 올린다.
+    도중에 실패하면 그 이전 버전까지만 반영되고, 다음 실행 때 실패한 버전부터 다시 시도한다.
+
+    Returns:
+        적용 후 스키마 버전
+    """
+    with engine.connect() as conn:
+        version = get_schema_version(conn)
+    if version >= LATEST_VERSION:
+        return version
+
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)"))
+        if conn.execute(text("SELECT 1 FROM schema_version")).first() is None:
+            conn.execute(text("INSERT INTO schema_version (version) VALUES (0)"))
+
+    for target, description, migrate in MIGRATIONS:
+        if target <= version:
+            continue
+        print(f"[DB] 마이그레이션 {target}: {description}...")
+        with engine.begin() as conn:
+            migrate(conn)
+            conn.execute(text("UPDATE schema_version SET version = :version"), {'version': target})
+        version = target
+
+    print(f"[DB] 스키마 버전 {version} 적용 완료")
+    return version
@@ -1,19 +1,64 @@
 """데이터베이스 모델 정의"""
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Float, Boolean, Text, Table, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Float, Boolean, Text, Table, ForeignKey, MetaData, Index
 from sqlalchemy.orm import declarative_base, relationship
 
 Base = declarative_base()
 
+# genre_mask에 쓰는 장르 비트 수 (SQLite INTEGER는 부호 있는 64비트)
+GENRE_MASK_BITS = 63
+
 # 다대다 관계를 위한 연결 테이블
 torrent_genres = Table(
     'torrent_genres',
     Base.metadata,
     Column('torrent_id', Integer, ForeignKey('torrents.id'), primary_key=True),
-    Column('genre_id', Integer, ForeignKey('genres.id'), primary_key=True)
+    Column('genre_id', Integer, ForeignKey('genres.id'), primary_key=True),
+    # 장르 필터 (genre_id -> torrent_id 조회, 기본 키는 torrent_id가 앞이라 사용 불가)
+    Index('ix_torrent_genres_genre_torrent', 'genre_id', 'torrent_id')
+)
+
+# 제목 전문 검색용 FTS5 가상 테이블 (trigram 토크나이저, torrents를 외부 콘텐츠로 사용)
+# create_all 대상이 아니므로 별도 MetaData에 정의 (생성은 migrations 5번 담당)
+fts_metadata = MetaData()
+torrents_fts = Table(
+    'torrents_fts',
+    fts_metadata,
+    Column('rowid', Integer, primary_key=True),
+    Column('title', Text)
 )
 
 
+def calculate_popularity_score(seeders, leechers, downloads, comments, views) -> float:
+    """인기도 점수 계산 (0-100)
+    
+    ORM 객체 없이 값만으로 계산 (DBWriterThread 일괄 저장 경로에서 사용)
+    
+    가중치:
+    - 시더: 30% (최대 30점)
+    - 완료수: 25% (최대 25점)
+    - 조회수: 20% (최대 20점)
+    - 댓글: 10% (최대 10점)
+    - 리처: 15% (최대 15점)
+    """
+    # 시더 점수 (최대 30점)
+    seeder_score = min((seeders or 0) / 10, 30)
+    
+    # 완료 수 점수 (최대 25점)
+    download_score = min((downloads or 0) / 100, 25)
+    
+    # 조회수 점수 (최대 20점)
+    views_score = min((views or 0) / 1000, 20)
+    
+    # 댓글 점수 (최대 10점)
+    comment_score = min((comments or 0) / 10, 10)
+    
+    # 리처 점수 (최대 15점, 리처가 많으면 현재 인기있다는 의미)
+    leecher_score = min((leechers or 0) / 20, 15)
+    
+    return seeder_score + download_score + views_score + comment_score + leecher_score
+
+
 class Torrent(Base):
     """토렌트 정보 모델"""
     __tablename__ = 'torrents'
@@ -26,15 +71,18 @@ class Torrent(Base):
     source_site = Column(String(100), default='sukebei.nyaa.si')
     
     # 토렌트 정보
-    magnet_link = Column(Text, nullable=False)
+    magnet_link = Column(Text, nullable=False)  # magnet URI, 또는 'magnet:'으로 시작하지 않으면 xt/tr을 뺀 나머지 파라미터
+    info_hash = Column(String(40), index=True)  # magnet 링크의 BTIH (소문자 hex 40자, 중복 확인 1순위 키)
+    tracker_set_id = Column(Integer, ForeignKey('tracker_sets.id'))  # magnet 링크의 tracker 목록
     torrent_link = Column(String(500))
     size = Column(String(50))  # "1.5 GiB" 형식
     size_bytes = Column(Integer)  # 정렬을 위한 바이트 단위
     
     # 미디어 정보
     thumbnail_url = Column(String(500))
+    thumbnail_cleared_at = Column(DateTime)  # 있던 썸네일 URL을 지운 시각 (정리 작업 / 아이콘 재탐색, 델타에 빈 URL을 전파할지 판단)
     snapshot_urls = Column(Text)  # JSON 배열로 저장 (여러 스냅샷)
-    thumbnail_searched_servers = Column(Text, default='[]')  # JSON 배열로 저장 (탐색한 서버 목록: ['fc2ppv', 'javbee'])
+    thumbnail_searched_servers = Column(Text, default='[]')  # (구버전) JSON 서버 목록, 현재는 thumbnail_attempts 테이블 사용
     
     # 분류 정보
     category = Column(String(100))
@@ -50,49 +98,68 @@ class Torrent(Base):
     
     # 인기도 점수 (계산된 값)
     popularity_score = Column(Float, default=0.0, index=True)
+    trending_score = Column(Float, default=0.0, index=True)  # 최근 통계 변화량 기반 급상승 점수 (database/trending.py)
+    
+    # 장르 비트마스크 (Genre.bit 비트를 OR, torrent_genres의 사본이며 다중 장르 필터용)
+    genre_mask = Column(Integer, default=0)
+    
+    # 제목 유사 중복 묶음 (묶음에서 가장 작은 토렌트 id, database/title_clusters.py에서 배정, 배정 전에는 NULL)
+    cluster_id = Column(Integer, index=True)
     
     # 시간 정보
     upload_date = Column(DateTime, nullable=False, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)  # 증분 동기화 기준 (database/delta_sync.py)
     
     # 관계
     genres = relationship('Genre', secondary=torrent_genres, back_populates='torrents')
     
+    __table_args__ = (
+        # 정렬 전용 (title, seeders, popularity_score, upload_date는 컬럼 index=True)
+        # 인덱스 끝에 rowid가 붙으므로 ORDER BY 값, id 도 임시 정렬 없이 처리됨
+        Index('ix_torrents_size_bytes', 'size_bytes'),
+        Index('ix_torrents_leechers', 'leechers'),
+        Index('ix_torrents_downloads', 'downloads'),
+        # 검열/국가 필터 + 기간 필터 또는 날짜순 정렬
+        Index('ix_torrents_censored_upload', 'censored', 'upload_date'),
+        Index('ix_torrents_country_upload', 'country', 'upload_date'),
+        Index('ix_torrents_censored_country_upload', 'censored', 'country', 'upload_date'),
+    )
+    
     def __repr__(self):
         return f"<Torrent(id={self.id}, title='{self.title[:30]}...')>"
     
     def calculate_popularity(self):
-        """인기도 점수 계산 (0-100)
-        
-        가중치:
-        - 시더: 30% (최대 30점)
-        - 완료수: 25% (최대 25점)
-        - 조회수: 20% (최대 20점)
-        - 댓글: 10% (최대 10점)
-        - 리처: 15% (최대 15점)
-        """
-        # 시더 점수 (최대 30점)
-        seeder_score = min((self.seeders or 0) / 10, 30)
-        
-        # 완료 수 점수 (최대 25점)
-        download_score = min((self.downloads or 0) / 100, 25)
-        
-        # 조회수 점수 (최대 20점)
-        views_score = min((self.views or 0) / 1000, 20)
-        
-        # 댓글 점수 (최대 10점)
-        comment_score = min((self.comments or 0) / 10, 10)
-        
-        # 리처 점수 (최대 15점, 리처가 많으면 현재 인기있다는 의미)
-        leecher_score = min((self.leechers or 0) / 20, 15)
-        
-        self.popularity_score = (
-            seeder_score + download_score + views_score + 
-            comment_score + leecher_score
+        """인기도 점수 계산 (0-100, 공식은 calculate_popularity_score 참고)"""
+        self.popularity_score = calculate_popularity_score(
+            self.seeders, self.leechers, self.downloads, self.comments, self.views
         )
 
 
+class TorrentRow:
+    """목록 화면용 경량 토렌트 행 (Core select 결과, 세션과 무관)
+    
+    목록에 표시하는 컬럼만 담는다. magnet_link, 장르는 필요할 때
+    Database.get_torrent_details로 따로 조회한다.
+    """
+    __slots__ = (
+        'id', 'title', 'size', 'size_bytes', 'seeders', 'leechers', 'downloads',
+        'upload_date', 'thumbnail_url', 'snapshot_urls', 'cluster_id'
+    )
+    
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+    
+    @classmethod
+    def columns(cls, table) -> list:
+        """select()에 넣을 컬럼 목록 (__slots__ 순서)"""
+        return [table.c[name] for name in cls.__slots__]
+    
+    def __repr__(self):
+        return f"<TorrentRow(id={self.id}, title='{(self.title or '')[:30]}...')>"
+
+
 class Genre(Base):
     """장르 모델"""
     __tablename__ = 'genres'
@@ -100,10 +167,15 @@ class Genre(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String(50), unique=True, nullable=False, index=True)
     name_kr = Column(String(50))  # 한국어 이름
+    bit = Column(Integer)  # Torrent.genre_mask 비트 번호 (0~62, 먼저 생긴 장르부터, 비트가 모자라면 NULL)
     
     # 관계
     torrents = relationship('Torrent', secondary=torrent_genres, back_populates='genres')
     
+    __table_args__ = (
+        Index('ix_genres_bit', 'bit', unique=True),
+    )
+    
     def __repr__(self):
         return f"<Genre(name='{self.name}')>"
 
@@ -120,3 +192,101 @@ class Country(Base):
     def __repr__(self):
         return f"<Country(code='{self.code}', name='{self.name}')>"
 
+
+class TrackerSet(Base):
+    """magnet 링크 tracker 목록 (같은 목록은 한 행만 저장, 토렌트는 id로 참조)"""
+    __tablename__ = 'tracker_sets'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    trackers = Column(Text, unique=True, nullable=False)  # 줄바꿈으로 구분한 tracker URL (원래 순서 유지)
+    
+    def __repr__(self):
+        return f"<TrackerSet(id={self.id}, trackers={self.trackers.count(chr(10)) + 1})>"
+
+
+class TorrentStat(Base):
+    """토렌트 통계 시계열 (시간 단위, 오래된 기록은 일 단위로 합쳐짐)
+    
+    bucket은 epoch 기준 시간 번호 (time // 3600)이며 일 단위로 합친 행은 그날 0시 bucket을 쓴다.
+    완료수는 이전 기록 대비 증가량만 저장한다.
+    """
+    __tablename__ = 'torrent_stats'
+    
+    torrent_id = Column(Integer, ForeignKey('torrents.id', ondelete='CASCADE'), primary_key=True)
+    bucket = Column(Integer, primary_key=True)
+    seeders = Column(Integer, nullable=False, default=0)  # 구간 마지막 값
+    leechers = Column(Integer, nullable=False, default=0)  # 구간 마지막 값
+    downloads_delta = Column(Integer, nullable=False, default=0)  # 구간 동안 늘어난 완료수
+    
+    __table_args__ = (
+        # 급상승 점수 계산 시 최근 구간만 읽기 / 오래된 기록 정리용
+        Index('ix_torrent_stats_bucket', 'bucket'),
+        {'sqlite_with_rowid': False},
+    )
+    
+    def __repr__(self):
+        return f"<TorrentStat(torrent_id={self.torrent_id}, bucket={self.bucket})>"
+
+
+class TitleLshBucket(Base):
+    """제목 MinHash LSH 버킷 (토렌트당 밴드 수만큼, 같은 버킷의 토렌트가 유사 제목 후보)"""
+    __tablename__ = 'title_lsh'
+    
+    bucket = Column(Integer, primary_key=True)  # 밴드 번호 + 서명 조각의 64비트 해시
+    torrent_id = Column(Integer, ForeignKey('torrents.id', ondelete='CASCADE'), primary_key=True)
+    
+    __table_args__ = (
+        {'sqlite_with_rowid': False},
+    )
+    
+    def __repr__(self):
+        return f"<TitleLshBucket(bucket={self.bucket}, torrent_id={self.torrent_id})>"
+
+
+class ThumbnailAttempt(Base):
+    """썸네일 서버별 탐색 기록 (토렌트당 서버 1행)"""
+    __tablename__ = 'thumbnail_attempts'
+    
+    torrent_id = Column(Integer, ForeignKey('torrents.id', ondelete='CASCADE'), primary_key=True)
+    server = Column(String(50), primary_key=True)  # fc2ppv, javdb, javbee 등 (소문자)
+    attempted_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    outcome = Column(String(20), nullable=False, default='miss')  # found / miss
+    
+    __table_args__ = (
+        # 서버별 미탐색 항목 조회용 (torrent_id 조회는 기본 키가 담당)
+        Index('ix_thumbnail_attempts_server_torrent', 'server', 'torrent_id'),
+    )
+    
+    def __repr__(self):
+        return f"<ThumbnailAttempt(torrent_id={self.torrent_id}, server='{self.server}', outcome='{self.outcome}')>"
+
+
+class TorrentTombstone(Base):
+    """삭제된 토렌트 기록 (증분 동기화에서 다른 설치본에 삭제를 전달, torrents 삭제 트리거가 추가)
+    
+    보관 DB로 옮긴 행은 삭제가 아니므로 database/archive.py가 기록을 지운다.
+    """
+    __tablename__ = 'torrent_tombstones'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    torrent_id = Column(Integer, nullable=False, index=True)  # 삭제 전 id (설치본마다 다르므로 조회용으로만 사용)
+    info_hash = Column(String(40))
+    source_site = Column(String(100))
+    source_id = Column(String(100))
+    title = Column(String(500))
+    deleted_at = Column(DateTime, nullable=False, index=True)
+    
+    def __repr__(self):
+        return f"<TorrentTombstone(torrent_id={self.torrent_id}, info_hash='{self.info_hash}')>"
+
+
+class SyncPeer(Base):
+    """증분 동기화 대상별 마지막 내보내기 기준 시각 (다음 델타는 이 시각 이후 변경분)"""
+    __tablename__ = 'sync_peers'
+    
+    name = Column(String(100), primary_key=True)
+    watermark = Column(DateTime, nullable=False)
+    exported_at = Column(DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<SyncPeer(name='{self.name}', watermark={self.watermark})>"
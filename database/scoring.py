@@ -0,0 +1,232 @@
+"""
+인기도 점수 일괄 재계산
+torrents 통계 컬럼을 청크 단위로 numpy 배열로 읽어서 점수를 한 번에 계산하고 executemany로 다시 쓴다.
+점수 공식은 SCORERS에 등록된 스코어러 중 POPULARITY_SCORER로 고른다 (register_scorer로 추가 가능).
+
+수집 중(DBWriterThread)에도 score_row로 같은 공식 / 같은 척도로 계산한다.
+- 행마다 독립인 공식은 그대로 계산하고, 백분위 공식은 마지막 일괄 재계산의 분포 안에서 순위를 매긴다
+- 시간 감쇠와 분포는 시간이 지나면 달라지므로 Database가 POPULARITY_RESCORE_INTERVAL마다 다시 계산한다
+  (기본 공식에 감쇠가 없으면 저장된 점수가 바뀌지 않으므로 실행하지 않음)
+- numpy가 없으면 models.calculate_popularity_score (기본 공식)로 계산한다
+"""
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+from config import POPULARITY_SCORER, POPULARITY_HALF_LIFE_DAYS
+from .models import calculate_popularity_score
+from .trending import NUMPY_AVAILABLE, read_array
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+# 한 번에 읽고 쓰는 행 수 (쓰기 트랜잭션도 이 단위로 짧게 나눔)
+CHUNK_SIZE = 50000
+
+# 읽는 컬럼 순서 (age_days는 upload_date로부터 계산)
+METRICS = ['seeders', 'leechers', 'downloads', 'comments', 'views']
+
+# 지표별 만점 (합계 100, calculate_popularity_score와 같은 비율)
+WEIGHTS = {'seeders': 30, 'downloads': 25, 'views': 20, 'comments': 10, 'leechers': 15}
+
+
+class CappedLinearScorer:
+    """기본 공식: 지표별 선형 점수에 상한 (calculate_popularity_score의 벡터 버전)"""
+    catalog_wide = False  # 행마다 독립 계산 (청크 단위 스트리밍 가능)
+
+    # 지표별 1점당 값
+    DIVISORS = {'seeders': 10, 'downloads': 100, 'views': 1000, 'comments': 10, 'leechers': 20}
+
+    def __call__(self, cols: Dict[str, 'np.ndarray']) -> 'np.ndarray':
+        score = np.zeros(len(cols['seeders']), dtype=np.float64)
+        for name, cap in WEIGHTS.items():
+            score += np.minimum(np.maximum(cols[name], 0) / self.DIVISORS[name], cap)
+        return score
+
+
+class PercentileScorer:
+    """카탈로그 백분위 공식: 지표별 순위 백분위(0~1) x 만점
+
+    고정 상한 없이 전체 분포 안에서의 위치로 점수를 매기므로 카탈로그가 커져도 점수가 몰리지 않는다.
+    전체 계산에 쓴 분포를 보관해서 새로 수집한 행은 rank로 같은 분포 안에서 점수를 매긴다.
+    """
+    catalog_wide = True  # 전체 행을 읽은 뒤 계산
+
+    def __init__(self):
+        self.distribution: Optional[Dict[str, 'np.ndarray']] = None  # 지표별 정렬된 값 (마지막 전체 계산)
+
+    def __call__(self, cols: Dict[str, 'np.ndarray']) -> 'np.ndarray':
+        self.distribution = {name: np.sort(cols[name]) for name in WEIGHTS}
+        return self.rank(cols)
+
+    def rank(self, cols: Dict[str, 'np.ndarray']) -> 'np.ndarray':
+        """보관한 분포 기준 점수 (전체 계산 전이면 None)"""
+        if self.distribution is None:
+            return None
+        score = np.zeros(len(cols['seeders']), dtype=np.float64)
+        n = len(self.distribution['seeders'])
+        if n == 0:
+            return score
+        for name, weight in WEIGHTS.items():
+            # 같은 값은 같은 백분위 (자기보다 작은 값의 비율)
+            ranks = np.searchsorted(self.distribution[name], cols[name], side='left')
+            score += weight * np.minimum(ranks / max(n - 1, 1), 1.0)
+        return score
+
+
+# 이름 -> 스코어러 생성 함수
+SCORERS: Dict[str, Callable[[], Callable]] = {
+    'capped': CappedLinearScorer,
+    'percentile': PercentileScorer,
+}
+
+
+def register_scorer(name: str, factory: Callable[[], Callable]):
+    """스코어러 등록
+
+    Args:
+        name: POPULARITY_SCORER에 쓰는 이름
+        factory: 스코어러를 만드는 함수. 스코어러는 {지표 이름: 배열} 딕셔너리를 받아 점수 배열을 반환하고,
+            전체 행이 필요하면 catalog_wide = True 속성을 가진다. catalog_wide 스코어러가
+            rank(cols) 메서드로 마지막 전체 계산 기준 점수를 주면 수집 시에도 그 점수를 쓴다.
+    """
+    SCORERS[name] = factory
+
+
+def get_scorer(name: Optional[str] = None):
+    """이름으로 스코어러 생성 (없으면 기본 공식)"""
+    factory = SCORERS.get(name or POPULARITY_SCORER)
+    if factory is None:
+        print(f"[DB] 알 수 없는 인기도 공식 '{name or POPULARITY_SCORER}', 기본 공식 사용")
+        factory = CappedLinearScorer
+    return factory()
+
+
+_current = None
+_current_lock = threading.Lock()
+
+
+def current_scorer():
+    """POPULARITY_SCORER 스코어러 (수집과 일괄 재계산이 같은 인스턴스를 공유해서 백분위 분포를 이어 씀)"""
+    global _current
+    with _current_lock:
+        if _current is None:
+            _current = get_scorer()
+        return _current
+
+
+def needs_rescore() -> bool:
+    """저장된 점수가 시간이 지나면 달라지는 설정인지 (기본 공식 + 감쇠 없음이면 False)"""
+    return POPULARITY_SCORER != 'capped' or POPULARITY_HALF_LIFE_DAYS > 0
+
+
+def score_row(values: Dict[str, Any], upload_date: Optional[datetime]) -> float:
+    """행 하나의 인기도 점수 (DBWriterThread 수집 경로, 일괄 재계산과 같은 공식 / 척도)
+
+    catalog_wide 공식이 아직 전체 계산 전이면 기본 공식으로 계산하고 다음 일괄 재계산에서 맞춘다.
+    """
+    metrics = [values.get(name) for name in METRICS]
+    if not NUMPY_AVAILABLE or not needs_rescore():
+        return calculate_popularity_score(*metrics)
+
+    scorer = current_scorer()
+    cols = {name: np.array([float(value or 0)]) for name, value in zip(METRICS, metrics)}
+    # 일괄 재계산의 julianday('now') - julianday(upload_date)와 같은 기준
+    age_days = (datetime.utcnow() - upload_date).total_seconds() / 86400 if upload_date else 0.0
+    cols['age_days'] = np.array([age_days])
+    if getattr(scorer, 'catalog_wide', False):
+        rank = getattr(scorer, 'rank', None)
+        score = rank(cols) if rank is not None else None
+        if score is None:
+            return calculate_popularity_score(*metrics)
+    else:
+        score = scorer(cols)
+    return float(apply_time_decay(score, cols['age_days'], POPULARITY_HALF_LIFE_DAYS)[0])
+
+
+def apply_time_decay(score: 'np.ndarray', age_days: 'np.ndarray', half_life_days: float) -> 'np.ndarray':
+    """업로드 후 경과일에 따라 점수 감쇠 (half_life_days마다 절반)"""
+    if half_life_days <= 0:
+        return score
+    return score * np.power(0.5, np.maximum(age_days, 0) / half_life_days)
+
+
+def _read_chunks(db, chunk_size: int):
+    """(id, 지표 5개, 경과일, 현재 점수) 배열을 id 순서로 청크 단위 조회"""
+    sql = (
+        "SELECT id, seeders, leechers, downloads, comments, views, "
+        "julianday('now') - julianday(upload_date), popularity_score "
+        "FROM torrents WHERE id > ? ORDER BY id LIMIT ?"
+    )
+    last_id = 0
+    with db.read_engine.connect() as conn:
+        while True:
+            chunk = read_array(conn, sql, (last_id, chunk_size), width=8, dtype=np.float64)
+            if len(chunk) == 0:
+                return
+            last_id = int(chunk[-1, 0])
+            yield chunk
+
+
+def _score_chunk(scorer, chunk: 'np.ndarray', half_life_days: float) -> 'np.ndarray':
+    cols = {name: chunk[:, i + 1] for i, name in enumerate(METRICS)}
+    cols['age_days'] = chunk[:, 6]
+    return apply_time_decay(scorer(cols), cols['age_days'], half_life_days)
+
+
+def _write_scores(db, ids: 'np.ndarray', scores: 'np.ndarray', current: 'np.ndarray', chunk_size: int) -> int:
+    """바뀐 점수만 청크 단위 트랜잭션으로 저장"""
+    changed = ~np.isclose(scores, current, rtol=0, atol=1e-9)
+    ids, scores = ids[changed], scores[changed]
+    for i in range(0, len(ids), chunk_size):
+        params = zip(scores[i:i + chunk_size].tolist(), ids[i:i + chunk_size].tolist())
+        with db.engine.begin() as conn:
+            # 수만 행 executemany는 SQLAlchemy 파라미터 처리를 거치지 않고 드라이버로 바로 실행
+            conn.exec_driver_sql("UPDATE torrents SET popularity_score = ? WHERE id = ?", list(params))
+    return len(ids)
+
+
+def rescore_popularity(db, scorer_name: Optional[str] = None,
+                       half_life_days: Optional[float] = None, chunk_size: int = CHUNK_SIZE) -> int:
+    """전체 토렌트 popularity_score 재계산
+
+    Args:
+        db: Database 인스턴스
+        scorer_name: SCORERS 이름 (None이면 POPULARITY_SCORER, 수집 경로와 스코어러 공유)
+        half_life_days: 시간 감쇠 반감기 (None이면 POPULARITY_HALF_LIFE_DAYS, 0이면 감쇠 없음)
+        chunk_size: 한 번에 읽고 쓰는 행 수
+
+    Returns:
+        점수가 바뀐 행 수
+    """
+    if not NUMPY_AVAILABLE:
+        print("[DB] numpy가 설치되지 않아 인기도 점수를 일괄 계산할 수 없습니다 (설치: pip install numpy)")
+        return 0
+
+    scorer = current_scorer() if scorer_name in (None, POPULARITY_SCORER) else get_scorer(scorer_name)
+    if half_life_days is None:
+        half_life_days = POPULARITY_HALF_LIFE_DAYS
+    start = time.time()
+    updated = 0
+    total = 0
+
+    if getattr(scorer, 'catalog_wide', False):
+        # 전체 분포가 필요한 공식: 필요한 컬럼만 모두 읽은 뒤 한 번에 계산
+        chunks = list(_read_chunks(db, chunk_size))
+        if chunks:
+            data = np.concatenate(chunks)
+            total = len(data)
+            scores = _score_chunk(scorer, data, half_life_days)
+            updated = _write_scores(db, data[:, 0].astype(np.int64), scores, data[:, 7], chunk_size)
+    else:
+        # 행마다 독립인 공식: 읽은 청크를 바로 계산해서 저장
+        for chunk in _read_chunks(db, chunk_size):
+            total += len(chunk)
+            scores = _score_chunk(scorer, chunk, half_life_days)
+            updated += _write_scores(db, chunk[:, 0].astype(np.int64), scores, chunk[:, 7], chunk_size)
+
+    if updated:
+        # 정렬 값이 바뀌었으므로 페이지 앵커 캐시 무효화 (카탈로그 인덱스는 컬럼 다시 읽기)
+        db.notify_data_changed(changed_columns=['popularity_score'])
+    print(f"[DB] 인기도 점수 재계산: {total}건 중 {updated}건 변경 ({time.time() - start:.1f}초)")
+    return updated
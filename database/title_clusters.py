@@ -0,0 +1,371 @@
+"""
+제목 유사 중복 묶음 (MinHash / LSH)
+같은 릴리스가 해상도 태그, [中文字幕], 업로더 접두어만 다른 제목으로 다시 올라온 것을 한 묶음(cluster_id)으로 모은다.
+
+- 제목을 정규화한 뒤 문자 3-gram 집합으로 MinHash 서명(NUM_PERM개)을 만들고,
+  BANDS개 밴드의 해시를 title_lsh 테이블에 저장한다 (같은 버킷에 있는 행만 후보)
+- 후보는 실제 3-gram Jaccard 유사도로 다시 확인한다 (품번이 둘 다 있는데 다르거나,
+  품번 밖 숫자(화수, 파트, 권수)가 다르면 다른 릴리스. 해상도 등 릴리스 태그의 숫자는 정규화에서 빠짐)
+- 묶음 안 썸네일 공유는 품번이 같은 행끼리만 한다 (품번 없는 제목은 묶여도 각자 탐색)
+- cluster_id는 묶음에서 가장 작은 토렌트 id이며, 두 묶음을 잇는 제목이 들어오면 작은 id 쪽으로 합친다
+
+수집 시 TorrentBulkIngestor가 신규 행에 바로 배정하고, 배정되지 않은 기존 행은 Database가 백그라운드에서 채운다.
+"""
+import hashlib
+import random
+import re
+import struct
+import time
+import unicodedata
+import zlib
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+from config import TITLE_CLUSTER_THRESHOLD
+from .trending import NUMPY_AVAILABLE
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+# MinHash 서명 길이 = 밴드 수 x 밴드당 행 수 (유사도 약 0.6 이상부터 후보로 잡힘)
+NUM_PERM = 32
+BANDS = 8
+ROWS = NUM_PERM // BANDS
+
+SHINGLE_SIZE = 3
+# 3-gram이 이보다 적은 제목은 묶지 않음 (정규화 후 거의 빈 제목이 한 버킷에 몰리는 것 방지)
+MIN_SHINGLES = 4
+# 버킷당 읽는 후보 수 (최근 id부터, 흔한 제목 버킷이 커져도 조회량 일정)
+MAX_BUCKET_CANDIDATES = 20
+# 행마다 실제 유사도를 확인하는 후보 수 (겹치는 밴드가 많은 후보부터)
+MAX_CANDIDATE_CHECKS = 16
+# 백그라운드 채우기 한 트랜잭션 행 수
+BACKFILL_CHUNK_SIZE = 1000
+IN_CHUNK_SIZE = 500
+
+_MASK32 = 0xFFFFFFFF
+# 해시 계수 (a는 홀수), 고정 시드라 저장된 버킷과 항상 같음 (바꾸면 title_lsh와 cluster_id를 다시 만들어야 함)
+_rng = random.Random(0x7C1)
+_COEFFS = [(_rng.getrandbits(32) | 1, _rng.getrandbits(32)) for _ in range(NUM_PERM)]
+del _rng
+
+# 릴리스 정보 태그 (대괄호 안이 이것들로만 이루어지면 괄호째 지움, 괄호 밖에 있으면 단어만 지움)
+_TAG_WORDS = (
+    r'\d{3,4}p|[248]k|hd|fhd|uhd|sd|hq|x26[45]|h26[45]|hevc|avc|aac|vr|60fps|mp4|mkv|avi|wmv|'
+    r'sub|subs|chs|cht|ch|chn|eng|engsub|uncensored|censored|leak|leaked|reupload|repost|'
+    r'中文字幕|中字|字幕|字幕版|无码|無碼|无修正|無修正|破解|流出|高清|无水印|無水印'
+)
+_TAG_TOKEN = re.compile(rf'^(?:{_TAG_WORDS})$')
+_TAG_WORD = re.compile(rf'(?<![a-z0-9])(?:{_TAG_WORDS})(?![a-z0-9])')
+_BRACKETED = re.compile(r'[\[【(「『〔]([^\[\]【】()「」『』〔〕]*)[\]】)」』〕]')
+_TOKEN_SPLIT = re.compile(r'[\s_\-+/|,.·&]+')
+# 업로더/사이트 접두어 (hhd800.com@ABC-123, [xxx@yyy] 등) 및 도메인
+_UPLOADER_PREFIX = re.compile(r'^(?:[\w.\-]+@)+')
+_DOMAIN = re.compile(r'(?<![\w.])[\w\-]+(?:\.[\w\-]+)*\.(?:com|net|org|cc|xyz|me|tv|info|club|top|vip|la|io|co)(?![\w])')
+# 품번 뒤 자막판 표시 (ABC-123-C, ABC-123_UC 등)
+_CODE_SUFFIX = re.compile(r'(\d)[-_](?:c|ch|uc|u)(?![a-z0-9])')
+_PRODUCT_CODE = re.compile(r'(?<![a-z0-9])([a-z]{2,6})[-_ ]?(\d{3,7})(?!\d)')
+_NON_WORD = re.compile(r'[\W_]+')
+_NUMBER = re.compile(r'\d+')
+
+
+def normalize_title(title: str) -> str:
+    """비교용 제목 (소문자, 릴리스 태그/업로더 접두어/도메인 제거, 구두점은 공백 하나로)"""
+    s = unicodedata.normalize('NFKC', title or '').lower().strip()
+    s = _UPLOADER_PREFIX.sub(' ', s)
+
+    def strip_group(match) -> str:
+        inner = match.group(1)
+        tokens = [tok for tok in _TOKEN_SPLIT.split(inner) if tok]
+        if not tokens or '@' in inner or _DOMAIN.search(inner) or all(_TAG_TOKEN.match(tok) for tok in tokens):
+            return ' '
+        return f' {inner} '
+
+    s = _BRACKETED.sub(strip_group, s)
+    s = _DOMAIN.sub(' ', s)
+    s = _CODE_SUFFIX.sub(r'\1', s)
+    s = _TAG_WORD.sub(' ', s)
+    return _NON_WORD.sub(' ', s).strip()
+
+
+def product_codes(normalized: str) -> frozenset:
+    """정규화된 제목의 품번 집합 (abc123 형식, 앞자리 0 무시)"""
+    return frozenset(f'{letters}{int(number)}' for letters, number in _PRODUCT_CODE.findall(normalized))
+
+
+def number_tokens(normalized: str) -> frozenset:
+    """정규화된 제목에서 품번을 뺀 숫자 집합 (화수 / 파트 / 권수 등, 앞자리 0 무시)"""
+    return frozenset(int(number) for number in _NUMBER.findall(_PRODUCT_CODE.sub(' ', normalized)))
+
+
+def title_codes(title: str) -> frozenset:
+    """원본 제목의 품번 집합 (썸네일 공유 기준)"""
+    return product_codes(normalize_title(title))
+
+
+def shingles(normalized: str) -> frozenset:
+    """문자 3-gram 집합"""
+    if len(normalized) <= SHINGLE_SIZE:
+        return frozenset([normalized]) if normalized else frozenset()
+    return frozenset(normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1))
+
+
+class TitleFeatures:
+    """제목 하나의 비교용 값 (3-gram, 품번, 품번 밖 숫자, LSH 버킷)"""
+    __slots__ = ('shingles', 'codes', 'numbers', 'buckets')
+
+    def __init__(self, title: str):
+        normalized = normalize_title(title)
+        self.shingles = shingles(normalized)
+        self.codes = product_codes(normalized)
+        self.numbers = number_tokens(normalized)
+        self.buckets: List[int] = []
+
+    @property
+    def indexable(self) -> bool:
+        return len(self.shingles) >= MIN_SHINGLES
+
+    def similar(self, other: 'TitleFeatures', threshold: float) -> bool:
+        """같은 릴리스로 볼 만큼 비슷한지 (3-gram Jaccard 유사도, 품번이 둘 다 있으면 하나 이상 겹쳐야 함)
+
+        품번 밖 숫자가 다르면 유사도와 관계없이 다른 릴리스 (- 01 / - 02, Part 1 / Part 2 등이
+        한 묶음이 되면 묶음 합치기로 전체 시리즈가 이어지므로)
+        """
+        if self.codes and other.codes and not (self.codes & other.codes):
+            return False
+        if self.numbers != other.numbers:
+            return False
+        union = len(self.shingles | other.shingles)
+        return union > 0 and len(self.shingles & other.shingles) / union >= threshold
+
+
+def _shingle_hashes(features: TitleFeatures) -> List[int]:
+    # 내장 hash()는 실행마다 달라지므로 crc32 사용 (버킷이 DB에 저장됨)
+    return [zlib.crc32(s.encode('utf-8')) for s in features.shingles]
+
+
+def minhash_signatures(hash_lists: Sequence[List[int]]) -> List[List[int]]:
+    """3-gram 해시 목록별 MinHash 서명 (값마다 (a*x + b) mod 2^32의 최솟값)
+
+    numpy가 있으면 전체 목록을 한 배열로 이어 붙여 계수별로 한 번에 계산한다 (결과는 순수 파이썬과 같음).
+    빈 목록은 넣지 않는다.
+    """
+    if not hash_lists:
+        return []
+    if not NUMPY_AVAILABLE:
+        return [[min((a * x + b) & _MASK32 for x in hashes) for a, b in _COEFFS] for hashes in hash_lists]
+
+    values = np.fromiter((x for hashes in hash_lists for x in hashes), dtype=np.uint64)
+    starts = np.zeros(len(hash_lists), dtype=np.int64)
+    np.cumsum([len(hashes) for hashes in hash_lists[:-1]], out=starts[1:])
+    sig = np.empty((NUM_PERM, len(hash_lists)), dtype=np.uint64)
+    for i, (a, b) in enumerate(_COEFFS):
+        # a, x < 2^32 이므로 a*x + b는 uint64를 넘지 않음
+        sig[i] = np.minimum.reduceat((values * np.uint64(a) + np.uint64(b)) & np.uint64(_MASK32), starts)
+    return sig.T.tolist()
+
+
+def band_buckets(signature: List[int]) -> List[int]:
+    """밴드별 버킷 키 (밴드 번호 + 서명 조각의 64비트 해시, SQLite INTEGER에 맞게 부호 있는 값)"""
+    buckets = []
+    for band in range(BANDS):
+        chunk = struct.pack(f'<B{ROWS}I', band, *signature[band * ROWS:(band + 1) * ROWS])
+        digest = hashlib.blake2b(chunk, digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, 'little', signed=True))
+    return buckets
+
+
+def build_features(rows: Sequence[Tuple[int, str]]) -> List[Tuple[int, TitleFeatures]]:
+    """(id, 제목) 목록의 비교용 값 계산 (DB 접근 없음, 쓰기 트랜잭션 밖에서 미리 계산 가능)"""
+    prepared = [(torrent_id, TitleFeatures(title)) for torrent_id, title in rows]
+    indexable = [features for _, features in prepared if features.indexable]
+    signatures = minhash_signatures([_shingle_hashes(features) for features in indexable])
+    for features, signature in zip(indexable, signatures):
+        features.buckets = band_buckets(signature)
+    return prepared
+
+
+class _UnionFind:
+    """묶음 합치기 (대표는 항상 가장 작은 id)"""
+
+    def __init__(self):
+        self.parent: Dict[int, int] = {}
+
+    def find(self, x: int) -> int:
+        root = x
+        while self.parent.get(root, root) != root:
+            root = self.parent[root]
+        while x != root:
+            self.parent[x], x = root, self.parent.get(x, x)
+        return root
+
+    def union(self, a: int, b: int) -> int:
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            ra, rb = min(ra, rb), max(ra, rb)
+            self.parent[rb] = ra
+        return ra
+
+
+def assign_clusters(conn, prepared: List[Tuple[int, TitleFeatures]],
+                    threshold: Optional[float] = None) -> Dict[int, int]:
+    """cluster_id가 없는 행에 묶음 배정 (title_lsh 버킷 저장, 다른 묶음과 이어지면 합침)
+
+    Args:
+        conn: SQLAlchemy Connection (쓰기 트랜잭션 안, 커밋은 호출자가 처리)
+        prepared: build_features 결과 (이미 cluster_id가 있는 행은 건너뜀)
+        threshold: 같은 릴리스로 보는 Jaccard 유사도 (None이면 TITLE_CLUSTER_THRESHOLD)
+
+    Returns:
+        {배정한 행 id: cluster_id}
+    """
+    if not prepared:
+        return {}
+    if threshold is None:
+        threshold = TITLE_CLUSTER_THRESHOLD
+    raw = conn.connection.driver_connection
+
+    # 이미 배정된 행 제외 (source_id 충돌로 기존 행 id가 돌아온 경우, 백그라운드 채우기와 겹친 경우)
+    ids = [torrent_id for torrent_id, _ in prepared]
+    pending = set()
+    for i in range(0, len(ids), IN_CHUNK_SIZE):
+        chunk = ids[i:i + IN_CHUNK_SIZE]
+        marks = ','.join('?' * len(chunk))
+        pending.update(r[0] for r in raw.execute(
+            f"SELECT id FROM torrents WHERE id IN ({marks}) AND cluster_id IS NULL", chunk))
+    prepared = [(torrent_id, features) for torrent_id, features in prepared if torrent_id in pending]
+    if not prepared:
+        return {}
+
+    # 버킷별 기존 후보 (버킷마다 최근 MAX_BUCKET_CANDIDATES개)
+    bucket_members: Dict[int, List[int]] = {}
+    for _, features in prepared:
+        for bucket in features.buckets:
+            if bucket not in bucket_members:
+                bucket_members[bucket] = [r[0] for r in raw.execute(
+                    "SELECT torrent_id FROM title_lsh WHERE bucket = ? ORDER BY torrent_id DESC LIMIT ?",
+                    (bucket, MAX_BUCKET_CANDIDATES))]
+
+    # 후보 제목/묶음 읽기 (비교용 값은 실제로 확인할 때 계산)
+    candidate_ids = list({m for members in bucket_members.values() for m in members} - pending)
+    known: Dict[int, list] = {}  # id -> [제목 또는 TitleFeatures, cluster_id]
+    for i in range(0, len(candidate_ids), IN_CHUNK_SIZE):
+        chunk = candidate_ids[i:i + IN_CHUNK_SIZE]
+        marks = ','.join('?' * len(chunk))
+        for torrent_id, title, cluster_id in raw.execute(
+                f"SELECT id, title, cluster_id FROM torrents WHERE id IN ({marks})", chunk):
+            known[torrent_id] = [title, cluster_id or torrent_id]
+
+    clusters = _UnionFind()
+    assigned: Dict[int, int] = {}
+    merged = set()  # 다른 묶음에 합쳐진 cluster_id
+    for torrent_id, features in prepared:
+        shared = Counter(m for bucket in features.buckets for m in bucket_members[bucket] if m in known)
+        cluster_id = torrent_id
+        # 겹치는 밴드가 많을수록 유사도가 높을 가능성이 큼
+        for member, _ in shared.most_common(MAX_CANDIDATE_CHECKS):
+            entry = known[member]
+            if clusters.find(entry[1]) == clusters.find(cluster_id):
+                continue
+            if not isinstance(entry[0], TitleFeatures):
+                entry[0] = TitleFeatures(entry[0])
+            if features.similar(entry[0], threshold):
+                before = {clusters.find(entry[1]), clusters.find(cluster_id)}
+                cluster_id = clusters.union(entry[1], cluster_id)
+                merged.update(c for c in before if c != cluster_id)
+        assigned[torrent_id] = cluster_id
+        # 같은 배치의 다음 행도 이 행을 후보로 찾도록 추가
+        known[torrent_id] = [features, cluster_id]
+        for bucket in features.buckets:
+            members = bucket_members[bucket]
+            members.insert(0, torrent_id)
+            del members[MAX_BUCKET_CANDIDATES:]
+
+    assigned = {torrent_id: clusters.find(cluster_id) for torrent_id, cluster_id in assigned.items()}
+    raw.executemany(
+        "INSERT OR IGNORE INTO title_lsh (bucket, torrent_id) VALUES (?, ?)",
+        [(bucket, torrent_id) for torrent_id, features in prepared for bucket in features.buckets]
+    )
+    raw.executemany(
+        "UPDATE torrents SET cluster_id = ? WHERE id = ?",
+        [(cluster_id, torrent_id) for torrent_id, cluster_id in assigned.items()]
+    )
+    # 합쳐진 기존 묶음의 다른 행도 새 대표로 변경
+    merges = [(clusters.find(old), old) for old in merged if clusters.find(old) != old]
+    if merges:
+        raw.executemany("UPDATE torrents SET cluster_id = ? WHERE cluster_id = ?", merges)
+    return assigned
+
+
+def shareable_thumbnail(url: Optional[str]) -> bool:
+    """다른 행에 복사할 수 있는 썸네일인지 (빈 값, 아이콘 제외)"""
+    if not url:
+        return False
+    lowered = url.lower()
+    return '.ico' not in lowered and 'favicon' not in lowered
+
+
+def share_cluster_thumbnails(conn, cluster_ids) -> List[Tuple[int, str]]:
+    """묶음 안에서 썸네일이 없는 행에 품번이 같은 다른 행의 썸네일 복사 (품번당 한 번만 찾으면 됨)
+
+    품번이 없거나 겹치지 않는 행은 같은 묶음이어도 채우지 않는다.
+
+    Returns:
+        썸네일을 채운 (id, 썸네일 URL) 목록
+    """
+    raw = conn.connection.driver_connection
+    # 증분 동기화가 변경을 찾도록 updated_at도 갱신 (SQLAlchemy DateTime과 같은 문자열 형식)
+    now = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S.%f')
+    filled = []
+    for cluster_id in set(cluster_ids):
+        rows = raw.execute(
+            "SELECT id, title, thumbnail_url FROM torrents WHERE cluster_id = ? ORDER BY id", (cluster_id,)
+        ).fetchall()
+        members = [(torrent_id, title_codes(title), url) for torrent_id, title, url in rows]
+        sources = [(codes, url) for _, codes, url in members if codes and shareable_thumbnail(url)]
+        if not sources:
+            continue
+        for torrent_id, codes, url in members:
+            if url or not codes:
+                continue
+            # 품번이 겹치는 가장 먼저 저장된 행의 썸네일
+            match = next((source_url for source_codes, source_url in sources if codes & source_codes), None)
+            if match is not None:
+                filled.append((torrent_id, match))
+    if filled:
+        raw.executemany(
+            "UPDATE torrents SET thumbnail_url = ?, updated_at = ? "
+            "WHERE id = ? AND (thumbnail_url IS NULL OR thumbnail_url = '')",
+            [(url, now, torrent_id) for torrent_id, url in filled]
+        )
+    return filled
+
+
+def backfill_clusters(db, chunk_size: int = BACKFILL_CHUNK_SIZE, stop_event=None) -> int:
+    """cluster_id가 없는 기존 행을 id 순서대로 청크 단위 배정 (Database 백그라운드 스레드에서 호출)
+
+    서명 계산은 트랜잭션 밖에서 하고, 후보 조회와 저장만 쓰기 연결(BEGIN IMMEDIATE)에서 짧게 실행한다.
+
+    Returns:
+        배정한 행 수
+    """
+    start = time.time()
+    total = 0
+    last_id = 0
+    while stop_event is None or not stop_event.is_set():
+        with db.read_engine.connect() as conn:
+            rows = conn.connection.driver_connection.execute(
+                "SELECT id, title FROM torrents WHERE cluster_id IS NULL AND id > ? ORDER BY id LIMIT ?",
+                (last_id, chunk_size)
+            ).fetchall()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        prepared = build_features(rows)
+        with db.write_engine.begin() as conn:
+            assigned = assign_clusters(conn, prepared)
+            share_cluster_thumbnails(conn, [c for t, c in assigned.items() if c != t])
+        total += len(assigned)
+    if total:
+        print(f"[DB] 제목 묶음 배정: {total}건 ({time.time() - start:.1f}초)")
+    return total
@@ -0,0 +1,177 @@
+"""
+인기 급상승 점수 계산 및 통계 시계열 정리
+torrent_stats의 최근 기록으로 토렌트별 변화 속도를 numpy로 한 번에 계산하여 torrents.trending_score에 저장한다.
+Database가 TRENDING_UPDATE_INTERVAL마다 백그라운드에서 refresh()를 호출한다.
+"""
+import itertools
+import time
+from typing import Tuple
+from sqlalchemy import text
+from config import (
+    TRENDING_WINDOW_HOURS, TRENDING_HALF_LIFE_HOURS,
+    TORRENT_STATS_HOURLY_DAYS, TORRENT_STATS_RETENTION_DAYS
+)
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# 점수 = 10 * (log(1 + 가중 완료수 증가량) + 0.5 * log(1 + 시더 증가량) + 0.25 * log(1 + 현재 리처))
+DOWNLOAD_WEIGHT = 1.0
+SEEDER_GROWTH_WEIGHT = 0.5
+LEECHER_WEIGHT = 0.25
+SCORE_SCALE = 10.0
+
+# 점수 저장 시 executemany 한 번에 넣는 행 수
+WRITE_CHUNK_SIZE = 5000
+
+
+def current_bucket() -> int:
+    """현재 시간 구간 번호 (epoch 기준 시간)"""
+    return int(time.time() // 3600)
+
+
+def read_array(conn, sql: str, params: tuple, width: int, dtype=None) -> 'np.ndarray':
+    """숫자 컬럼 조회 결과를 (N, width) 배열로 읽기 (기본 int64)
+
+    SQLAlchemy Row 객체를 거치지 않고 sqlite3 커서 튜플을 바로 numpy로 넘긴다 (수십만 행에서 수십 배 빠름).
+    NULL은 0으로 읽는다.
+    """
+    cursor = conn.connection.driver_connection.execute(sql, params)
+    try:
+        values = itertools.chain.from_iterable(cursor)
+        flat = np.fromiter((v or 0 for v in values), dtype=dtype or np.int64)
+    finally:
+        cursor.close()
+    return flat.reshape(-1, width)
+
+
+def compute_scores(stats: 'np.ndarray', now_bucket: int,
+                   half_life_hours: float = TRENDING_HALF_LIFE_HOURS) -> Tuple['np.ndarray', 'np.ndarray']:
+    """통계 기록으로 토렌트별 급상승 점수 계산
+
+    Args:
+        stats: (N, 5) int64 배열 - torrent_id, bucket, seeders, leechers, downloads_delta
+        now_bucket: 현재 시간 구간
+        half_life_hours: 완료수 증가량 가중치 반감 시간
+
+    Returns:
+        (torrent_id 배열, 점수 배열)
+    """
+    if len(stats) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+    # torrent_id, bucket 순으로 정렬하여 토렌트별 구간을 연속으로 만듦
+    stats = stats[np.lexsort((stats[:, 1], stats[:, 0]))]
+    ids, starts = np.unique(stats[:, 0], return_index=True)
+    group = np.repeat(np.arange(len(ids)), np.diff(np.append(starts, len(stats))))
+    ends = np.append(starts[1:], len(stats)) - 1
+
+    # 최근 증가량일수록 큰 가중치 (반감기 지수 감소)
+    age = np.maximum(now_bucket - stats[:, 1], 0).astype(np.float64)
+    weights = np.power(0.5, age / max(half_life_hours, 1e-6))
+    downloads = np.bincount(group, weights=stats[:, 4] * weights, minlength=len(ids))
+
+    seeder_growth = np.maximum(stats[ends, 2] - stats[starts, 2], 0)
+    leechers = np.maximum(stats[ends, 3], 0)
+
+    scores = SCORE_SCALE * (
+        DOWNLOAD_WEIGHT * np.log1p(np.maximum(downloads, 0))
+        + SEEDER_GROWTH_WEIGHT * np.log1p(seeder_growth)
+        + LEECHER_WEIGHT * np.log1p(leechers)
+    )
+    return ids, scores
+
+
+def update_trending_scores(db) -> int:
+    """최근 TRENDING_WINDOW_HOURS 기록으로 trending_score 갱신
+
+    읽기는 읽기 전용 연결, 쓰기는 점수 초기화 + executemany 한 트랜잭션으로 처리한다.
+
+    Returns:
+        점수가 0보다 큰 토렌트 수
+    """
+    now_bucket = current_bucket()
+    with db.read_engine.connect() as conn:
+        stats = read_array(
+            conn,
+            "SELECT torrent_id, bucket, seeders, leechers, downloads_delta "
+            "FROM torrent_stats WHERE bucket >= ?",
+            (now_bucket - TRENDING_WINDOW_HOURS,),
+            width=5
+        )
+    ids, scores = compute_scores(stats, now_bucket)
+
+    positive = scores > 0
+    params = [
+        {'_id': int(torrent_id), 'score': float(score)}
+        for torrent_id, score in zip(ids[positive], scores[positive])
+    ]
+    with db.engine.begin() as conn:
+        conn.execute(text("UPDATE torrents SET trending_score = 0 WHERE trending_score > 0"))
+        update = text("UPDATE torrents SET trending_score = :score WHERE id = :_id")
+        for i in range(0, len(params), WRITE_CHUNK_SIZE):
+            conn.execute(update, params[i:i + WRITE_CHUNK_SIZE])
+
+    # 정렬 값이 바뀌었으므로 페이지 앵커 캐시 무효화 (카탈로그 인덱스는 컬럼 다시 읽기)
+    db.notify_data_changed(changed_columns=['trending_score'])
+    return len(params)
+
+
+def compact_torrent_stats(db) -> Tuple[int, int]:
+    """오래된 통계 정리
+
+    - TORRENT_STATS_HOURLY_DAYS보다 오래된 시간 단위 기록은 일 단위 한 행으로 합침
+      (시더/리처는 그날 마지막 값, 완료수 증가량은 합계)
+    - TORRENT_STATS_RETENTION_DAYS보다 오래된 기록은 삭제
+
+    Returns:
+        (합친 일 단위 행 수, 삭제한 행 수)
+    """
+    now_bucket = current_bucket()
+    daily_cutoff = (now_bucket - TORRENT_STATS_HOURLY_DAYS * 24) // 24 * 24
+    retention_cutoff = now_bucket - TORRENT_STATS_RETENTION_DAYS * 24
+
+    with db.engine.begin() as conn:
+        deleted = conn.execute(text(
+            "DELETE FROM torrent_stats WHERE bucket < :cutoff"
+        ), {'cutoff': retention_cutoff}).rowcount
+
+        # 이미 합쳐진 날(0시 bucket 한 행만 있는 날)은 제외
+        conn.execute(text("DROP TABLE IF EXISTS temp.stats_daily"))
+        conn.execute(text(
+            "CREATE TEMP TABLE stats_daily AS "
+            "SELECT g.torrent_id, g.day, s.seeders, s.leechers, g.delta FROM ("
+            "  SELECT torrent_id, (bucket / 24) * 24 AS day, MAX(bucket) AS last_bucket, "
+            "         SUM(downloads_delta) AS delta "
+            "  FROM torrent_stats WHERE bucket < :cutoff "
+            "  GROUP BY torrent_id, bucket / 24 "
+            "  HAVING COUNT(*) > 1 OR MAX(bucket) % 24 != 0"
+            ") g JOIN torrent_stats s ON s.torrent_id = g.torrent_id AND s.bucket = g.last_bucket"
+        ), {'cutoff': daily_cutoff})
+        conn.execute(text(
+            "DELETE FROM torrent_stats WHERE bucket < :cutoff "
+            "AND (torrent_id, (bucket / 24) * 24) IN (SELECT torrent_id, day FROM temp.stats_daily)"
+        ), {'cutoff': daily_cutoff})
+        compacted = conn.execute(text(
+            "INSERT INTO torrent_stats (torrent_id, bucket, seeders, leechers, downloads_delta) "
+            "SELECT torrent_id, day, seeders, leechers, delta FROM temp.stats_daily"
+        )).rowcount
+        conn.execute(text("DROP TABLE temp.stats_daily"))
+
+    return compacted, deleted
+
+
+def refresh(db):
+    """통계 정리 후 급상승 점수 재계산 (Database 백그라운드 스레드에서 호출)"""
+    if not NUMPY_AVAILABLE:
+        return
+    try:
+        compacted, deleted = compact_torrent_stats(db)
+        if compacted or deleted:
+            print(f"[DB] 통계 기록 정리: 일 단위로 합침 {compacted}건, 삭제 {deleted}건")
+        update_trending_scores(db)
+    except Exception as e:
+        print(f"[DB] 급상승 점수 갱신 오류: {e}")
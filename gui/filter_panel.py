@@ -4,10 +4,13 @@ from PySide6.QtWidgets import (
     QCheckBox, QLineEdit, QPushButton, QGroupBox, QListWidget,
     QAbstractItemView
 )
-from PySide6.QtCore import Signal
+from PySide6.QtCore import Qt, Signal
 from config import TIME_RANGES, TIME_RANGE_DAYS
 from typing import List, Optional
 
+# 콤보박스 항목의 개수 없는 표시명 (set_facet_counts가 문구를 다시 만들 때 사용)
+LABEL_ROLE = Qt.UserRole + 1
+
 
 class FilterPanel(QWidget):
     """필터링 옵션 패널"""
@@ -34,15 +37,23 @@ class FilterPanel(QWidget):
         period_layout = QVBoxLayout()
         
         self.period_combo = QComboBox()
-        # config.py의 TIME_RANGES 사용
-        period_items = list(TIME_RANGES.values())
-        self.period_combo.addItems(period_items)
-        self.period_combo.currentTextChanged.connect(self.on_filter_changed)
+        # config.py의 TIME_RANGES 사용 (항목 데이터는 TIME_RANGE_DAYS 일수)
+        for key, label in TIME_RANGES.items():
+            self._add_item(self.period_combo, label, TIME_RANGE_DAYS.get(key))
+        # 항목 문구에 개수가 붙으므로 텍스트가 아니라 인덱스 변경으로 감지
+        self.period_combo.currentIndexChanged.connect(self.on_filter_changed)
         period_layout.addWidget(self.period_combo)
         
         period_group.setLayout(period_layout)
         layout.addWidget(period_group)
         
+        # 검열 / 국가 / 장르 필터 (국가, 장르 항목은 set_options로 DB 값을 채움)
+        self.censored_combo = self._add_combo_group(layout, "검열", [
+            (None, "전체"), (True, "검열"), (False, "무검열")
+        ])
+        self.country_combo = self._add_combo_group(layout, "국가", [(None, "전체")])
+        self.genre_combo = self._add_combo_group(layout, "장르", [(None, "전체")])
+        
         # 검색
         search_group = QGroupBox("검색")
         search_layout = QVBoxLayout()
@@ -82,6 +93,58 @@ class FilterPanel(QWidget):
         
         layout.addStretch()
     
+    def _add_combo_group(self, layout, title: str, items: List[tuple]) -> QComboBox:
+        """(값, 표시명) 항목 콤보박스 그룹 추가"""
+        group = QGroupBox(title)
+        group_layout = QVBoxLayout()
+        combo = QComboBox()
+        for value, label in items:
+            self._add_item(combo, label, value)
+        combo.currentIndexChanged.connect(self.on_filter_changed)
+        group_layout.addWidget(combo)
+        group.setLayout(group_layout)
+        layout.addWidget(group)
+        return combo
+    
+    def set_options(self, countries: List[tuple], genres: List[tuple]):
+        """국가/장르 항목 설정 (선택 상태 유지)
+        
+        Args:
+            countries: [(국가 코드, 표시명), ...]
+            genres: [(장르 이름, 표시명), ...]
+        """
+        for combo, items in ((self.country_combo, countries), (self.genre_combo, genres)):
+            current = combo.currentData()
+            combo.blockSignals(True)
+            try:
+                while combo.count() > 1:
+                    combo.removeItem(1)
+                for value, label in items:
+                    self._add_item(combo, label, value)
+                index = combo.findData(current)
+                combo.setCurrentIndex(index if index >= 0 else 0)
+            finally:
+                combo.blockSignals(False)
+    
+    def set_facet_counts(self, facets: dict):
+        """항목 옆에 개수 표시 (Database.get_facet_counts 결과)
+        
+        개수가 없는 항목은 0으로 표시한다.
+        """
+        for combo, name in ((self.period_combo, 'period'), (self.censored_combo, 'censored'),
+                            (self.country_combo, 'country'), (self.genre_combo, 'genres')):
+            counts = facets.get(name) or {}
+            for index in range(combo.count()):
+                label = combo.itemData(index, LABEL_ROLE)
+                count = counts.get(combo.itemData(index), 0)
+                combo.setItemText(index, f"{label} ({count:,})")
+    
+    @staticmethod
+    def _add_item(combo: QComboBox, label: str, value):
+        """항목 추가 (값은 itemData, 개수를 붙이기 전 표시명은 LABEL_ROLE에 보관)"""
+        combo.addItem(label, value)
+        combo.setItemData(combo.count() - 1, label, LABEL_ROLE)
+    
     def _set_search_keyword(self, keyword: str):
         """추천 검색어 버튼 클릭 시 검색어 설정"""
         self.search_input.setText(keyword)
@@ -98,11 +161,11 @@ class FilterPanel(QWidget):
         Returns:
             필터 딕셔너리
         """
-        # 기간 (config.py의 TIME_RANGES 사용)
-        period_text = self.period_combo.currentText()
-        # TIME_RANGES의 값에서 키 찾기 (역매핑)
-        period_key = next((key for key, value in TIME_RANGES.items() if value == period_text), None)
-        period_days = TIME_RANGE_DAYS.get(period_key) if period_key else None
+        # 기간 (항목 데이터가 TIME_RANGE_DAYS 일수, 전체는 None)
+        period_days = self.period_combo.currentData()
+        
+        # 장르 (Database 필터는 장르 목록을 받음, 캐시 키로 쓰이므로 튜플)
+        genre = self.genre_combo.currentData()
         
         # 검색어
         search_query = self.search_input.text().strip()
@@ -110,12 +173,18 @@ class FilterPanel(QWidget):
         
         return {
             'period_days': period_days,
+            'censored': self.censored_combo.currentData(),
+            'country': self.country_combo.currentData(),
+            'genres': (genre,) if genre else None,
             'search_query': search_query
         }
     
     def reset_filters(self):
         """필터 초기화"""
-        self.period_combo.setCurrentIndex(0)
+        for combo in (self.period_combo, self.censored_combo, self.country_combo, self.genre_combo):
+            combo.blockSignals(True)
+            combo.setCurrentIndex(0)
+            combo.blockSignals(False)
         self.search_input.clear()
         self.on_filter_changed()
 
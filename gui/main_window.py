@@ -10,7 +10,7 @@ from PySide6.QtGui import QAction, QIcon
 from .filter_panel import FilterPanel
 from .torrent_list import TorrentListWidget
 from database import Database
-from database.db_writer import DBWriterThread
+from database.db_writer import DBWriterThread, WritePriority
 from scrapers import ScraperManager
 from config import PAGE_SIZE, MAX_SCRAPE_PAGES, ENABLE_THUMBNAIL, MAX_CONSECUTIVE_DUPLICATES, THUMBNAIL_SERVER_BLOCK_THRESHOLD
 from .settings_dialog import SettingsDialog
@@ -158,7 +158,7 @@ class ThumbnailUpdateThread(QThread):
                 
                     priority_items_from_db = []
                     if new_ids:
-                        session = self.db.get_session()
+                        session = self.db.get_read_session()
                         try:
                             from database.models import Torrent
                             
@@ -340,39 +340,15 @@ class ThumbnailUpdateThread(QThread):
                     )
                 )
                 
-                # .ico가 포함된 썸네일 및 javbee.vip/storage/ 경로의 썸네일은 빈 값으로 초기화 (DB_writer 사용)
-                ico_torrents = session.query(Torrent).filter(
-                    or_(
-                        Torrent.thumbnail_url.like('%.ico%'),
-                        Torrent.thumbnail_url.like('%favicon%'),
-                        Torrent.thumbnail_url.like('%javbee.vip/storage/%'),
-                        Torrent.thumbnail_url.like('%39466ce5e12977f09eddf35bf06aa721.jpg%')
+                # .ico / favicon / javbee.vip/storage/ 썸네일은 빈 값으로 초기화 (id 범위별 UPDATE 한 번씩, 행을 읽지 않음)
+                # 초기화된 행은 위 query의 빈 썸네일 조건으로 이번 탐색에 포함됨
+                from database import maintenance
+                maintenance.clear_placeholder_thumbnails(
+                    self.db,
+                    progress=lambda done, max_id: self.progress.emit(
+                        done * 100 // max_id, f"아이콘 썸네일 정리 중... ({done}/{max_id})"
                     )
-                ).all()
-                if ico_torrents:
-                    ico_found = False
-                    for t in ico_torrents:
-                        if t.id not in processed_ids:
-                            thumb_url_lower = (t.thumbnail_url or '').lower()
-                            if 'javbee.vip/storage/' in thumb_url_lower or '39466ce5e12977f09eddf35bf06aa721.jpg' in thumb_url_lower:
-                                print(f"[썸네일] javbee.vip/storage/ 이미지 감지, 초기화: {t.title[:50]}... ({t.thumbnail_url[:60]}...)")
-                            elif 'javbee.vip/images/loading' in thumb_url_lower:
-                                print(f"[썸네일] javbee.vip loading.gif 이미지 감지, 초기화: {t.title[:50]}... ({t.thumbnail_url[:60]}...)")
-                            else:
-                                print(f"[썸네일] .ico 파일 감지, 초기화: {t.title[:50]}... ({t.thumbnail_url[:60]}...)")
-                            # DB_writer를 통해 비동기 저장
-                            if self.db_writer:
-                                self.db_writer.update_thumbnail(t.id, '')
-                            else:
-                                # DB_writer가 없으면 직접 저장
-                                t.thumbnail_url = ''
-                                ico_found = True
-                    if ico_found and not self.db_writer:
-                        # DB_writer가 없을 때만 직접 커밋
-                        session.commit()
-                    elif self.db_writer:
-                        # DB_writer를 사용하면 세션은 닫기만 (커밋은 DB_writer가 처리)
-                        pass
+                )
                 if processed_ids:
                     query = query.filter(~Torrent.id.in_(processed_ids))
                 
@@ -432,96 +408,92 @@ class ThumbnailUpdateThread(QThread):
                 self.main_list = main_list
                 self.main_lock = main_lock
                 
-                # DB 세션 생성 (검색 여부 확인용)
-                check_session = self.db.get_session()
-                import json
+                # DB 세션 생성 (검색 여부 확인용, DB_writer가 있으면 읽기 전용 연결 사용)
+                check_session = self.db.get_read_session() if self.db_writer else self.db.get_session()
                 from database.models import Torrent
                 
                 added_count = 0
                 skipped_has_thumbnail = 0
                 skipped_all_searched = 0
+                skipped_cluster = 0
                 skipped_error = 0
                 
-                for item in torrent_items:
-                    if item.get('is_priority', False):
-                        continue  # 우선순위 항목은 이미 priority_list에 있음
+                # 제목 형태별 서버 중 아직 탐색하지 않은 서버가 남은 항목 (SQL 한 번으로 확인)
+                main_items = [item for item in torrent_items if not item.get('is_priority', False)]
+                try:
+                    untried_ids = self.db.get_untried_thumbnail_ids(check_session, [item['id'] for item in main_items])
+                    # 제목 묶음 + 품번별 썸네일 (같은 릴리스는 한 번만 탐색)
+                    clusters = self.db.get_thumbnail_clusters(check_session, [item['id'] for item in main_items])
+                except Exception as e:
+                    print(f"[썸네일] 초기화 시 DB 확인 오류: {e}")
+                    untried_ids = set()
+                    clusters = {}
+                    skipped_error = len(main_items)
+                    main_items = []
+                
+                exhausted_ids = []
+                shared_thumbnails = []
+                queued_clusters = set()
+                for item in main_items:
+                    share_key, cluster_thumbnail = clusters.get(item['id'], (None, None))
+                    if cluster_thumbnail:
+                        # 같은 묶음에서 품번이 같은 다른 항목이 이미 찾은 썸네일 사용
+                        shared_thumbnails.append((item['id'], cluster_thumbnail))
+                        skipped_cluster += 1
+                        continue
                     
-                    # 썸네일이 없고, 모든 서버에서 검색이 끝나지 않은 항목만 메인 큐에 추가
-                    try:
-                        torrent = check_session.get(Torrent, item['id'])
-                        if not torrent:
-                            skipped_error += 1
-                            continue
-                        
-                        # 이미 썸네일이 있으면 스킵
-                        if torrent.thumbnail_url and torrent.thumbnail_url.strip():
-                            skipped_has_thumbnail += 1
-                            continue
-                        
-                        # DB에서 이미 탐색한 서버 목록 확인
-                        searched_servers = []
-                        if torrent.thumbnail_searched_servers:
-                            try:
-                                searched_servers = json.loads(torrent.thumbnail_searched_servers)
-                            except (json.JSONDecodeError, TypeError):
-                                searched_servers = []
-                        
-                        # 제목 형태에 따라 처리 가능한 서버 확인
-                        title_text = item.get('title', '') or torrent.title or ''
-                        # FC2 패턴 확인
-                        fc2_patterns = [
-                            r'FC2[-\s]?PPV[-\s]?(\d{6,8})',  # FC2-PPV-숫자
-                            r'FC2[-\s]?PPV',                  # FC2-PPV
-                            r'FC2PPV',                        # FC2PPV
-                            r'FC2\s+PPV'                      # FC2 PPV
-                        ]
-                        is_fc2 = False
-                        if title_text:
-                            title_upper = title_text.upper()
-                            for pattern in fc2_patterns:
-                                if re.search(pattern, title_upper):
-                                    is_fc2 = True
-                                    break
-                        
-                        # FC2 항목: FC2PPV, JAVDB, JAVGURU, JAVMOST만 처리 가능
-                        # FC2가 아닌 항목: JAVDB, JAVBEE, JAVGURU, JAVMOST만 처리 가능
-                        # JAVGURU, JAVMOST는 모든 형태의 제목 검색 가능
-                        if is_fc2:
-                            all_servers = {'fc2ppv', 'javdb', 'javguru', 'javmost'}  # FC2 항목: FC2PPV, JAVDB, JAVGURU, JAVMOST
-                        else:
-                            all_servers = {'javdb', 'javbee', 'javguru', 'javmost'}  # FC2가 아닌 항목: JAVDB, JAVBEE, JAVGURU, JAVMOST
-                        
-                        # 모든 서버에서 검색했으면 스킵
-                        # searched_servers를 set으로 변환하여 비교 (대소문자 구분 없이)
-                        searched_servers_set = {s.lower() for s in searched_servers} if searched_servers else set()
-                        all_servers_lower = {s.lower() for s in all_servers}
-                        
-                        # 미검색 서버 확인
-                        remaining_servers = all_servers_lower - searched_servers_set
-                        
-                        if not remaining_servers:
-                            # 모든 서버에서 검색했는데 썸네일이 없으면 이미지 없음 처리
-                            if not torrent.thumbnail_url:
-                                if self.db_writer:
-                                    self.db_writer.update_thumbnail(item['id'], '')
-                                else:
-                                    torrent.thumbnail_url = ''
-                                    check_session.commit()
-                            skipped_all_searched += 1
+                    if item['id'] not in untried_ids:
+                        # 모든 서버에서 검색했는데 썸네일이 없으면 이미지 없음 처리
+                        exhausted_ids.append(item['id'])
+                        skipped_all_searched += 1
+                        continue
+                    
+                    if share_key is not None:
+                        # 묶음 + 품번의 첫 항목만 탐색 (찾으면 DBWriter가 품번이 같은 나머지 항목에 복사)
+                        if share_key in queued_clusters:
+                            skipped_cluster += 1
                             continue
-                        
-                        # 썸네일이 없고, 모든 서버에서 검색이 끝나지 않은 항목만 메인 리스트에 추가
-                        main_list.append({'item': item, 'processed': False, 'processing_by': None})
-                        added_count += 1
-                    except Exception as e:
-                        # 오류 발생 시 스킵 (메인 큐에 추가하지 않음)
-                        skipped_error += 1
-                        if skipped_error <= 10:  # 처음 10개만 출력
-                            print(f"[썸네일] 초기화 시 DB 확인 오류 (ID: {item.get('id')}): {e}")
+                        queued_clusters.add(share_key)
+                    
+                    # 썸네일이 없고, 모든 서버에서 검색이 끝나지 않은 항목만 메인 리스트에 추가
+                    main_list.append({'item': item, 'processed': False, 'processing_by': None})
+                    added_count += 1
+                
+                if shared_thumbnails:
+                    if self.db_writer:
+                        for torrent_id, thumbnail_url in shared_thumbnails:
+                            self.db_writer.update_thumbnail(torrent_id, thumbnail_url)
+                    else:
+                        for torrent_id, thumbnail_url in shared_thumbnails:
+                            check_session.query(Torrent).filter(Torrent.id == torrent_id).update(
+                                {Torrent.thumbnail_url: thumbnail_url}, synchronize_session=False
+                            )
+                        check_session.commit()
+                    for torrent_id, thumbnail_url in shared_thumbnails:
+                        self.thumbnail_updated.emit(torrent_id, thumbnail_url)
+                
+                if exhausted_ids:
+                    # 이미 빈 값('')으로 처리된 행은 다시 쓰지 않음 (페이지마다 변경 시각 / 변경 알림이 생기지 않도록)
+                    null_ids = []
+                    for i in range(0, len(exhausted_ids), 500):
+                        null_ids.extend(torrent_id for (torrent_id,) in check_session.query(Torrent.id).filter(
+                            Torrent.id.in_(exhausted_ids[i:i + 500]), Torrent.thumbnail_url.is_(None)
+                        ))
+                    exhausted_ids = null_ids
+                
+                if exhausted_ids:
+                    if self.db_writer:
+                        for torrent_id in exhausted_ids:
+                            self.db_writer.update_thumbnail(torrent_id, '')
+                    else:
+                        check_session.query(Torrent).filter(Torrent.id.in_(exhausted_ids)).update(
+                            {Torrent.thumbnail_url: ''}, synchronize_session=False
+                        )
+                        check_session.commit()
                 
                 check_session.close()
                 
-                print(f"[썸네일] 메인 리스트 초기화 완료: 추가 {added_count}개, 스킵(썸네일 있음) {skipped_has_thumbnail}개, 스킵(모든 서버 검색 완료) {skipped_all_searched}개, 스킵(오류) {skipped_error}개")
+                print(f"[썸네일] 메인 리스트 초기화 완료: 추가 {added_count}개, 스킵(썸네일 있음) {skipped_has_thumbnail}개, 스킵(모든 서버 검색 완료) {skipped_all_searched}개, 스킵(같은 묶음) {skipped_cluster}개, 스킵(오류) {skipped_error}개")
                 
                 # 디버깅: 메인 리스트의 첫 번째 항목과 DB 상태 출력
                 unprocessed_main = [x for x in main_list if not x['processed']]
@@ -531,40 +503,16 @@ class ThumbnailUpdateThread(QThread):
                         first_item = first_entry['item']
                         
                         # 첫 번째 항목의 DB 상태 확인
-                        debug_session = self.db.get_session()
+                        debug_session = self.db.get_read_session()
                         try:
                             debug_torrent = debug_session.get(Torrent, first_item['id'])
                             if debug_torrent:
-                                searched_servers_debug = []
-                                if debug_torrent.thumbnail_searched_servers:
-                                    try:
-                                        searched_servers_debug = json.loads(debug_torrent.thumbnail_searched_servers)
-                                    except (json.JSONDecodeError, TypeError):
-                                        searched_servers_debug = []
+                                searched_servers_debug = self.db.get_searched_servers(debug_session, [first_item['id']]).get(first_item['id'], set())
                                 
                                 # 제목 형태에 따라 처리 가능한 서버 확인
                                 title_text_debug = first_item.get('title', '') or debug_torrent.title or ''
-                                fc2_patterns_debug = [
-                                    r'FC2[-\s]?PPV[-\s]?(\d{6,8})',  # FC2-PPV-숫자
-                                    r'FC2[-\s]?PPV',                  # FC2-PPV
-                                    r'FC2PPV',                        # FC2PPV
-                                    r'FC2\s+PPV'                      # FC2 PPV
-                                ]
-                                is_fc2_debug = False
-                                if title_text_debug:
-                                    title_upper_debug = title_text_debug.upper()
-                                    for pattern in fc2_patterns_debug:
-                                        if re.search(pattern, title_upper_debug):
-                                            is_fc2_debug = True
-                                            break
-                                
-                                # FC2 항목: FC2PPV, JAVDB, JAVGURU만 처리 가능
-                                # FC2가 아닌 항목: JAVDB, JAVBEE, JAVGURU만 처리 가능
-                                # JAVGURU, JAVMOST는 모든 형태의 제목 검색 가능
-                                if is_fc2_debug:
-                                    all_servers_debug = {'fc2ppv', 'javdb', 'javguru', 'javmost'}  # FC2 항목: FC2PPV, JAVDB, JAVGURU, JAVMOST
-                                else:
-                                    all_servers_debug = {'javdb', 'javbee', 'javguru', 'javmost'}  # FC2가 아닌 항목: JAVDB, JAVBEE, JAVGURU, JAVMOST
+                                all_servers_debug = set(self.db.get_thumbnail_servers(title_text_debug))
+                                is_fc2_debug = 'fc2ppv' in all_servers_debug
                                 
                                 remaining_servers_debug = all_servers_debug - set(searched_servers_debug)
                                 
@@ -582,7 +530,6 @@ class ThumbnailUpdateThread(QThread):
                                 unprocessed_priority_count = len([x for x in priority_list if not x['processed']])
                                 print(f"  일반 대기열 크기: {len(main_list)} (미처리: {unprocessed_main_count}개)")
                                 print(f"  우선순위 대기열 크기: {len(priority_list)} (미처리: {unprocessed_priority_count}개)")
-                                print(f"  thumbnail_searched_servers 원본: {debug_torrent.thumbnail_searched_servers or '(없음)'}")
                                 print("=" * 80)
                             else:
                                 print(f"[디버깅] 일반 대기열 첫 번째 항목 (ID: {first_item['id']}) - DB에서 찾을 수 없음")
@@ -857,10 +804,9 @@ class ThumbnailUpdateThread(QThread):
                     consecutive_no_found = 0  # 연속으로 찾지 못한 횟수
                     server_blocked = False  # 서버가 차단되었는지 여부 (403 에러만 차단으로 처리)
                     
-                    # DB 세션 (항목 가져오기 전에 검색 여부 확인용)
-                    check_session = self.db.get_session()
+                    # DB 세션 (항목 가져오기 전에 검색 여부 확인용, DB_writer가 있으면 읽기 전용 연결 사용)
+                    check_session = self.db.get_read_session() if self.db_writer else self.db.get_session()
                     from database.models import Torrent
-                    import json
                     
                     # FC2 패턴 (FC2-PPV-숫자, FC2-PPV, FC2PPV, FC2 PPV 모두 포함)
                     fc2_patterns = [
@@ -900,25 +846,13 @@ class ThumbnailUpdateThread(QThread):
                                 if not temp_item.get('force_replace', False):
                                     return None, 'has_thumbnail'
                             
-                            # DB에서 이미 탐색한 서버 목록 확인
-                            searched_servers = []
-                            if torrent.thumbnail_searched_servers:
-                                try:
-                                    searched_servers = json.loads(torrent.thumbnail_searched_servers)
-                                except (json.JSONDecodeError, TypeError):
-                                    searched_servers = []
+                            # DB에서 이미 탐색한 서버 목록 확인 (thumbnail_attempts)
+                            searched_servers = self.db.get_searched_servers(check_session, [temp_item_id]).get(temp_item_id, set())
                             
                             # 제목 형태에 따라 처리 가능한 서버 확인
+                            # (FC2 항목: FC2PPV, JAVDB, JAVGURU, JAVMOST / 그 외: JAVDB, JAVBEE, JAVGURU, JAVMOST)
                             title_text = temp_item.get('title', '') or torrent.title or ''
-                            is_fc2 = is_fc2_title(title_text)
-                            
-                            # FC2 항목: FC2PPV, JAVDB, JAVGURU, JAVMOST만 처리 가능
-                            # FC2가 아닌 항목: JAVDB, JAVBEE, JAVGURU, JAVMOST만 처리 가능
-                            # JAVGURU, JAVMOST는 모든 형태의 제목 검색 가능
-                            if is_fc2:
-                                all_servers = {'fc2ppv', 'javdb', 'javguru', 'javmost'}  # FC2 항목: FC2PPV, JAVDB, JAVGURU, JAVMOST
-                            else:
-                                all_servers = {'javdb', 'javbee', 'javguru', 'javmost'}  # FC2가 아닌 항목: JAVDB, JAVBEE, JAVGURU, JAVMOST
+                            all_servers = set(self.db.get_thumbnail_servers(title_text))
                             
                             # 이미 이 서버에서 탐색했으면 다른 서버 확인
                             if server_name in searched_servers:
@@ -2405,14 +2339,13 @@ class ThumbnailUpdateThread(QThread):
                             continue
                         
                         # status_lock에서 tried_servers 체크는 제거
-                        # check_item_before_process에서 이미 DB의 thumbnail_searched_servers를 확인했으므로
+                        # check_item_before_process에서 이미 DB의 탐색 기록(thumbnail_attempts)을 확인했으므로
                         # 중복 체크는 불필요함
                         
                         try:
                             # 독립적인 세션 생성
                             work_session = self.db.get_session()
                             try:
-                                import json
                                 from database.models import Torrent
                                 torrent = work_session.get(Torrent, torrent_id)
                                 if not torrent:
@@ -2433,25 +2366,16 @@ class ThumbnailUpdateThread(QThread):
                                     if server_name in thread_status:
                                         thread_status[server_name]['processed'] = processed_count
                                 
-                                # 탐색한 서버 목록에 추가 (성공/실패 관계없이) - DB에서 최신 상태 가져오기
-                                # DB에서 최신 searched_servers 가져오기
-                                current_searched_servers = []
-                                if torrent.thumbnail_searched_servers:
-                                    try:
-                                        current_searched_servers = json.loads(torrent.thumbnail_searched_servers)
-                                    except (json.JSONDecodeError, TypeError):
-                                        current_searched_servers = []
-                                
-                                # 현재 서버가 아직 추가되지 않았으면 추가
-                                if server_name not in current_searched_servers:
-                                    current_searched_servers.append(server_name)
-                                    if self.db_writer:
-                                        # DB_writer를 통해 비동기 저장 (썸네일 URL은 그대로 유지)
-                                        self.db_writer.update_thumbnail(torrent_id, torrent.thumbnail_url or '', server_name=server_name)
-                                    else:
-                                        # DB_writer가 없으면 직접 저장
-                                        torrent.thumbnail_searched_servers = json.dumps(current_searched_servers)
-                                        work_session.commit()
+                                # 탐색 기록 남기기 (성공/실패 관계없이, thumbnail_attempts에 upsert되므로 중복 확인 불필요)
+                                if self.db_writer:
+                                    # DB_writer를 통해 비동기 저장 (썸네일 URL은 그대로 유지)
+                                    self.db_writer.update_thumbnail(torrent_id, None, server_name=server_name)
+                                else:
+                                    # DB_writer가 없으면 직접 저장
+                                    self.db.record_thumbnail_attempts(work_session, [
+                                        {'torrent_id': torrent_id, 'server': server_name, 'outcome': 'found' if thumbnail_url else 'miss'}
+                                    ])
+                                    work_session.commit()
                                 
                                 # thumbnail_url이 있으면 카운트해야 하므로, 이미 다른 서버에서 찾았는지 확인은 thumbnail_url 체크 후에
                                 if thumbnail_url:
@@ -2558,7 +2482,11 @@ class ThumbnailUpdateThread(QThread):
                                         # DB에 저장 (DB_writer 사용)
                                         if self.db_writer:
                                             # DB_writer를 통해 비동기 저장 (서버 이름 포함)
-                                            self.db_writer.update_thumbnail(torrent_id, thumbnail_url, server_name=server_name)
+                                            # 현재 페이지 항목은 INTERACTIVE 레인으로 (스크래핑 저장보다 먼저 반영)
+                                            self.db_writer.update_thumbnail(
+                                                torrent_id, thumbnail_url, server_name=server_name,
+                                                priority=WritePriority.INTERACTIVE if is_priority else WritePriority.THUMBNAIL
+                                            )
                                             # 세션은 닫기만 (커밋은 DB_writer가 처리)
                                             # torrent 객체는 더 이상 사용하지 않으므로 세션 닫기
                                             
@@ -2639,19 +2567,12 @@ class ThumbnailUpdateThread(QThread):
                                     # 현재 서버에서 못 찾음
                                     consecutive_no_found += 1
                                     
-                                    # DB에서 최신 searched_servers 가져오기
-                                    current_searched_servers_after = []
-                                    if torrent.thumbnail_searched_servers:
-                                        try:
-                                            current_searched_servers_after = json.loads(torrent.thumbnail_searched_servers)
-                                        except (json.JSONDecodeError, TypeError):
-                                            current_searched_servers_after = []
+                                    # DB에서 최신 탐색 기록 가져오기 (방금 탐색한 서버는 writer 반영 전일 수 있으므로 포함)
+                                    current_searched_servers_after = self.db.get_searched_servers(work_session, [torrent_id]).get(torrent_id, set())
+                                    current_searched_servers_after.add(server_name)
                                     
                                     # 제목 형태에 따라 처리 가능한 서버 확인
-                                    if is_fc2_title(title):
-                                        all_servers_after = {'fc2ppv', 'javdb', 'javguru', 'javmost'}  # FC2 항목: FC2PPV, JAVDB, JAVGURU, JAVMOST
-                                    else:
-                                        all_servers_after = {'javdb', 'javbee', 'javguru', 'javmost'}  # FC2가 아닌 항목: JAVDB, JAVBEE, JAVGURU, JAVMOST
+                                    all_servers_after = set(self.db.get_thumbnail_servers(title))
                                     
                                     remaining_servers_after = all_servers_after - set(current_searched_servers_after)
                                     
@@ -2837,7 +2758,6 @@ class ThumbnailUpdateThread(QThread):
                 def monitor_threads():
                     """모든 스레드 상태를 주기적으로 출력"""
                     import time
-                    import json
                     import queue
                     from database.models import Torrent
                     last_print_time = time.time()
@@ -2880,40 +2800,16 @@ class ThumbnailUpdateThread(QThread):
                                                     first_priority_item = first_priority_entry['item']
                                                     
                                                     # 첫 번째 항목의 DB 상태 확인
-                                                    debug_session_priority = self.db.get_session()
+                                                    debug_session_priority = self.db.get_read_session()
                                                     try:
                                                         debug_torrent_priority = debug_session_priority.get(Torrent, first_priority_item['id'])
                                                         if debug_torrent_priority:
-                                                            searched_servers_priority_debug = []
-                                                            if debug_torrent_priority.thumbnail_searched_servers:
-                                                                try:
-                                                                    searched_servers_priority_debug = json.loads(debug_torrent_priority.thumbnail_searched_servers)
-                                                                except (json.JSONDecodeError, TypeError):
-                                                                    searched_servers_priority_debug = []
+                                                            searched_servers_priority_debug = self.db.get_searched_servers(debug_session_priority, [first_priority_item['id']]).get(first_priority_item['id'], set())
                                                             
                                                             # 제목 형태에 따라 처리 가능한 서버 확인
                                                             title_text_priority_debug = first_priority_item.get('title', '') or debug_torrent_priority.title or ''
-                                                            fc2_patterns_priority_debug = [
-                                                                r'FC2[-\s]?PPV[-\s]?(\d{6,8})',  # FC2-PPV-숫자
-                                                                r'FC2[-\s]?PPV',                  # FC2-PPV
-                                                                r'FC2PPV',                        # FC2PPV
-                                                                r'FC2\s+PPV'                      # FC2 PPV
-                                                            ]
-                                                            is_fc2_priority_debug = False
-                                                            if title_text_priority_debug:
-                                                                title_upper_priority_debug = title_text_priority_debug.upper()
-                                                                for pattern in fc2_patterns_priority_debug:
-                                                                    if re.search(pattern, title_upper_priority_debug):
-                                                                        is_fc2_priority_debug = True
-                                                                        break
-                                                            
-                                                            # FC2 항목: FC2PPV, JAVDB, NYAA만 처리 가능
-                                                            # FC2가 아닌 항목: JAVDB, JAVBEE, NYAA만 처리 가능
-                                                            # NYAA는 모든 형태의 품번 검색 가능
-                                                            if is_fc2_priority_debug:
-                                                                all_servers_priority_debug = {'fc2ppv', 'javdb', 'javguru'}  # FC2 항목: FC2PPV, JAVDB, JAVGURU
-                                                            else:
-                                                                all_servers_priority_debug = {'javdb', 'javbee', 'javguru'}  # FC2가 아닌 항목: JAVDB, JAVBEE, JAVGURU
+                                                            all_servers_priority_debug = set(self.db.get_thumbnail_servers(title_text_priority_debug))
+                                                            is_fc2_priority_debug = 'fc2ppv' in all_servers_priority_debug
                                                             
                                                             remaining_servers_priority_debug = all_servers_priority_debug - set(searched_servers_priority_debug)
                                                             
@@ -2945,39 +2841,16 @@ class ThumbnailUpdateThread(QThread):
                                                     first_main_item = first_main_entry['item']
                                                 
                                                     # 첫 번째 항목의 DB 상태 확인
-                                                    debug_session = self.db.get_session()
+                                                    debug_session = self.db.get_read_session()
                                                     try:
                                                         debug_torrent = debug_session.get(Torrent, first_main_item['id'])
                                                         if debug_torrent:
-                                                            searched_servers_debug = []
-                                                            if debug_torrent.thumbnail_searched_servers:
-                                                                try:
-                                                                    searched_servers_debug = json.loads(debug_torrent.thumbnail_searched_servers)
-                                                                except (json.JSONDecodeError, TypeError):
-                                                                    searched_servers_debug = []
+                                                            searched_servers_debug = self.db.get_searched_servers(debug_session, [first_main_item['id']]).get(first_main_item['id'], set())
                                                             
                                                             # 제목 형태에 따라 처리 가능한 서버 확인
                                                             title_text_debug = first_main_item.get('title', '') or debug_torrent.title or ''
-                                                            fc2_patterns_debug = [
-                                                                r'FC2[-\s]?PPV[-\s]?(\d{6,8})',  # FC2-PPV-숫자
-                                                                r'FC2[-\s]?PPV',                  # FC2-PPV
-                                                                r'FC2PPV',                        # FC2PPV
-                                                                r'FC2\s+PPV'                      # FC2 PPV
-                                                            ]
-                                                            is_fc2_debug = False
-                                                            if title_text_debug:
-                                                                title_upper_debug = title_text_debug.upper()
-                                                                for pattern in fc2_patterns_debug:
-                                                                    if re.search(pattern, title_upper_debug):
-                                                                        is_fc2_debug = True
-                                                                        break
-                                                            
-                                                            # FC2 항목: FC2PPV, JAVDB, JAVGURU만 처리 가능
-                                                            # FC2가 아닌 항목: JAVDB, JAVBEE, JAVGURU만 처리 가능
-                                                            if is_fc2_debug:
-                                                                all_servers_debug = {'fc2ppv', 'javdb', 'javguru'}  # FC2 항목: FC2PPV, JAVDB, JAVGURU
-                                                            else:
-                                                                all_servers_debug = {'javdb', 'javbee', 'javguru'}  # FC2가 아닌 항목: JAVDB, JAVBEE, JAVGURU
+                                                            all_servers_debug = set(self.db.get_thumbnail_servers(title_text_debug))
+                                                            is_fc2_debug = 'fc2ppv' in all_servers_debug
                                                             
                                                             remaining_servers_debug = all_servers_debug - set(searched_servers_debug)
                                                             
@@ -3110,17 +2983,11 @@ class SingleThumbnailReplaceThread(QThread):
                     except Exception:
                         pass
                 
-                # DB에서 이미 탐색한 서버 목록 확인
-                import json
-                searched_servers = []
-                if t.thumbnail_searched_servers:
-                    try:
-                        searched_servers = json.loads(t.thumbnail_searched_servers)
-                    except (json.JSONDecodeError, TypeError):
-                        searched_servers = []
+                # DB에서 이미 탐색한 서버 목록 확인 (thumbnail_attempts)
+                searched_servers = self.db.get_searched_servers(session, [self.torrent_id]).get(self.torrent_id, set())
                 
                 # 탐색하지 않은 서버만 검색 (교체 시 우선 탐색)
-                exclude_servers = searched_servers.copy()  # 이미 탐색한 서버는 제외
+                exclude_servers = sorted(searched_servers)  # 이미 탐색한 서버는 제외
                 
                 # ImageFinder 재사용 (없으면 새로 생성)
                 if self.image_finder is None:
@@ -3138,7 +3005,7 @@ class SingleThumbnailReplaceThread(QThread):
                     # DB 저장 (DB_writer 사용)
                     if self.db_writer:
                         # DB_writer를 통해 비동기 저장
-                        self.db_writer.update_thumbnail(self.torrent_id, new_url)
+                        self.db_writer.update_thumbnail(self.torrent_id, new_url, priority=WritePriority.INTERACTIVE)
                         session.close()
                         self.updated.emit(self.torrent_id, new_url)
                     else:
@@ -3263,7 +3130,7 @@ class ScraperThread(QThread):
                     # db_writer를 사용하면 이미 실시간으로 저장되었으므로 추가 저장 불필요
                     # 큐에 남은 작업이 완료될 때까지 대기
                     if self.db_writer:
-                        self.db_writer.queue.join()
+                        self.db_writer.wait_for_bulk()
                     print(f"[스크래핑] [{source_info['name']}] 스크래핑 완료: {len(torrents)}개 수집됨 (DB 저장 완료)")
                     
                     # 정지 요청 시 루프 중단
@@ -3300,8 +3167,8 @@ class ScraperThread(QThread):
                 
                 # 큐에 남은 작업이 완료될 때까지 대기
                 if self.db_writer:
-                    print(f"[스크래핑] DB 저장 큐 완료 대기 중... (큐 크기: {self.db_writer.queue.qsize()})")
-                    self.db_writer.queue.join()
+                    print(f"[스크래핑] DB 저장 큐 완료 대기 중... (큐 크기: {self.db_writer.queue.qsize(WritePriority.BULK)})")
+                    self.db_writer.wait_for_bulk()
                     print(f"[스크래핑] DB 저장 완료 (최종 통계: 추가={self.db_writer_stats.get('added', 0)}, 업데이트={self.db_writer_stats.get('updated', 0)})")
                 
                 # 통계 사용 (시그널로 받은 통계 누적값)
@@ -3326,6 +3193,11 @@ class ScraperThread(QThread):
 class MainWindow(QMainWindow):
     """메인 윈도우"""
     
+    # 백그라운드에서 센 정확한 총 개수 (필터 키, 개수)
+    total_count_ready = Signal(object, int)
+    # 백그라운드에서 센 필터 패널 항목별 개수 (필터 키, Database.get_facet_counts 결과)
+    facet_counts_ready = Signal(object, object)
+    
     def __init__(self):
         super().__init__()
         self.db = Database()
@@ -3341,6 +3213,17 @@ class MainWindow(QMainWindow):
         self.current_page = 1
         self.total_pages = 1
         self.total_count = 0
+        # 총 개수가 추정값인지 여부와 현재 개수의 필터 키 (정확한 개수는 백그라운드에서 계산)
+        self.total_count_approximate = False
+        self._count_filters = None
+        self._exact_count_pending = set()
+        self.total_count_ready.connect(self._on_total_count_ready)
+        self._facet_pending = set()
+        self.facet_counts_ready.connect(self._on_facet_counts_ready)
+        # keyset 페이지네이션 상태 (현재 페이지 첫/마지막 행 커서, 다음 로드 방향)
+        self._page_first_cursor = None
+        self._page_last_cursor = None
+        self._page_nav = None
         # ImageFinder 미리 생성 (교체 버튼 성능 개선 - Selenium 드라이버 재사용)
         print("[ImageFinder] 공유 인스턴스 생성 중... (Selenium 드라이버 재사용)")
         from scrapers.image_finder import ImageFinder
@@ -3360,6 +3243,7 @@ class MainWindow(QMainWindow):
         self.tray_icon = None
         self._init_system_tray()
         self.init_ui()
+        self._load_filter_options()
         # 부팅 시 GIF 썸네일 검사 및 초기화 (백그라운드)
         self._cleanup_gif_thumbnails()
         self.load_torrents()  # load_torrents 내에서 썸네일 업데이트 자동 시작
@@ -3540,6 +3424,8 @@ class MainWindow(QMainWindow):
         self.torrent_list = TorrentListWidget()
         self.torrent_list.refresh_requested.connect(self.load_torrents)
         self.torrent_list.sort_requested.connect(self.on_sort_requested)
+        # DBWriter 커밋별 변경 피드로 보이는 행만 갱신
+        self.db_writer.changes_committed.connect(self.on_changes_committed)
         splitter.addWidget(self.torrent_list)
         
         # 스플리터 비율 설정 (필터 패널 작게, 토렌트 리스트 크게)
@@ -3551,6 +3437,8 @@ class MainWindow(QMainWindow):
         
         # 썸네일 교체 요청 연결
         self.torrent_list.replace_thumbnail_requested.connect(self.on_replace_thumbnail_requested)
+        # magnet 열기 요청 (더블클릭 시 DB에서 조회)
+        self.torrent_list.open_magnet_requested.connect(self.on_open_magnet_requested)
         
         # 페이지네이션 컨트롤 (하단 중앙 배치)
         from PySide6.QtWidgets import QSizePolicy
@@ -3658,71 +3546,44 @@ class MainWindow(QMainWindow):
         
         class GifCleanupThread(QThread):
             finished = Signal(int)  # (초기화된 개수)
+            progress = Signal(int, str)  # (진행률, 메시지)
+            cleared = Signal(list)  # 초기화된 torrent_id 목록 (현재 페이지 행 갱신용)
             
-            def __init__(self, db, db_writer):
+            def __init__(self, db):
                 super().__init__()
                 self.db = db
-                self.db_writer = db_writer
             
             def run(self):
                 try:
-                    session = self.db.get_session()
-                    try:
-                        from database.models import Torrent
-                        
-                        # GIF 썸네일이 있는 모든 토렌트 조회
-                        all_torrents = session.query(Torrent).filter(
-                            Torrent.thumbnail_url.isnot(None),
-                            Torrent.thumbnail_url != ''
-                        ).all()
-                        
-                        gif_count = 0
-                        for torrent in all_torrents:
-                            if not torrent.thumbnail_url:
-                                continue
-                            
-                            thumbnail_url_lower = torrent.thumbnail_url.lower()
-                            # GIF 파일 감지: 더 정확한 패턴 사용
-                            is_gif = (
-                                thumbnail_url_lower.endswith('.gif') or
-                                thumbnail_url_lower.endswith('.gif?') or
-                                thumbnail_url_lower.endswith('.gif&') or
-                                thumbnail_url_lower.endswith('.gif#') or
-                                thumbnail_url_lower.endswith('.gif/') or
-                                '.gif?' in thumbnail_url_lower or
-                                '.gif&' in thumbnail_url_lower or
-                                '.gif#' in thumbnail_url_lower or
-                                '.gif/' in thumbnail_url_lower or
-                                re.search(r'\.gif[\?#&/]', thumbnail_url_lower) is not None
-                            )
-                            
-                            if is_gif:
-                                # GIF 파일이면 초기화 (썸네일 URL 및 검색 서버 리스트 초기화)
-                                if self.db_writer:
-                                    self.db_writer.update_thumbnail(torrent.id, '')
-                                    # 검색 서버 리스트도 초기화
-                                    torrent.thumbnail_searched_servers = '[]'
-                                    session.commit()
-                                else:
-                                    torrent.thumbnail_url = ''
-                                    torrent.thumbnail_searched_servers = '[]'
-                                    session.commit()
-                                gif_count += 1
-                        
-                        if gif_count > 0:
-                            print(f"[초기화] GIF 썸네일 {gif_count}개 초기화 완료 (썸네일 URL 및 검색 서버 리스트 초기화)")
-                        self.finished.emit(gif_count)
-                    finally:
-                        session.close()
+                    from database import maintenance
+                    
+                    # GIF 썸네일 URL 및 탐색 기록 초기화 (id 범위별 UPDATE, REGEXP는 '.gif' 포함 행에만 적용)
+                    cleared = maintenance.clear_gif_thumbnails(
+                        self.db,
+                        progress=lambda done, max_id: self.progress.emit(
+                            done * 100 // max_id, f"GIF 썸네일 검사 중... ({done}/{max_id})"
+                        )
+                    )
+                    if cleared:
+                        print(f"[초기화] GIF 썸네일 {len(cleared)}개 초기화 완료 (썸네일 URL 및 검색 서버 리스트 초기화)")
+                        self.cleared.emit(cleared)
+                    self.finished.emit(len(cleared))
                 except Exception as e:
                     print(f"[초기화] GIF 썸네일 초기화 오류: {e}")
                     self.finished.emit(0)
         
         # 백그라운드 스레드로 실행 (멤버 변수로 저장하여 소멸 방지)
-        self.gif_cleanup_thread = GifCleanupThread(self.db, self.db_writer)
+        self.gif_cleanup_thread = GifCleanupThread(self.db)
+        self.gif_cleanup_thread.progress.connect(lambda value, message: self.status_bar.showMessage(message, 2000))
+        self.gif_cleanup_thread.cleared.connect(self._on_thumbnails_cleared)
         self.gif_cleanup_thread.finished.connect(lambda count: self._on_gif_cleanup_finished(count))
         self.gif_cleanup_thread.start()
     
+    def _on_thumbnails_cleared(self, torrent_ids: list):
+        """썸네일이 초기화된 행 화면 갱신 (현재 페이지에 있는 행만)"""
+        from database.change_feed import RowChange
+        self.torrent_list.apply_changes([RowChange('update', torrent_id, {'thumbnail_url': ''}) for torrent_id in torrent_ids])
+    
     def _on_gif_cleanup_finished(self, count: int):
         """GIF 정리 완료 처리"""
         if count > 0:
@@ -3760,6 +3621,7 @@ class MainWindow(QMainWindow):
         
         class ResetSearchedServersThread(QThread):
             finished = Signal(int)  # (초기화된 개수)
+            progress = Signal(int, str)  # (진행률, 메시지)
             error = Signal(str)
             
             def __init__(self, db):
@@ -3768,28 +3630,22 @@ class MainWindow(QMainWindow):
             
             def run(self):
                 try:
-                    session = self.db.get_session()
-                    try:
-                        from database.models import Torrent
-                        
-                        # 모든 토렌트 조회
-                        all_torrents = session.query(Torrent).all()
-                        
-                        reset_count = 0
-                        for torrent in all_torrents:
-                            if torrent.thumbnail_searched_servers and torrent.thumbnail_searched_servers.strip():
-                                torrent.thumbnail_searched_servers = '[]'
-                                reset_count += 1
-                        
-                        session.commit()
-                        self.finished.emit(reset_count)
-                    finally:
-                        session.close()
+                    from database import maintenance
+                    
+                    # 전체 탐색 기록을 torrent_id 범위별로 삭제 (범위마다 짧은 트랜잭션, 개수도 같은 범위에서 셈)
+                    reset_count = maintenance.reset_all_thumbnail_attempts(
+                        self.db,
+                        progress=lambda done, max_id: self.progress.emit(
+                            done * 100 // max_id, f"썸네일 검색 서버 초기화 중... {done * 100 // max_id}%"
+                        )
+                    )
+                    self.finished.emit(reset_count)
                 except Exception as e:
                     self.error.emit(str(e))
         
         # 백그라운드 스레드로 실행 (멤버 변수로 저장하여 소멸 방지)
         self.reset_searched_servers_thread = ResetSearchedServersThread(self.db)
+        self.reset_searched_servers_thread.progress.connect(lambda value, message: self.status_bar.showMessage(message, 0))
         self.reset_searched_servers_thread.finished.connect(self._on_reset_searched_servers_finished)
         self.reset_searched_servers_thread.error.connect(self._on_reset_searched_servers_error)
         self.reset_searched_servers_thread.start()
@@ -3852,39 +3708,68 @@ class MainWindow(QMainWindow):
         def load_async():
             filters = self.filter_panel.get_filters()
             
-            session = self.db.get_session()
+            session = self.db.get_read_session()
             try:
-                # 전체 개수 가져오기
-                self.total_count = self.db.get_total_count(
-                    session,
-                    period_days=filters['period_days'],
-                    search_query=filters['search_query']
-                )
+                # 전체 개수 가져오기 (캐시 또는 빠른 추정값, 추정값이면 정확한 개수는 백그라운드에서)
+                self.total_count, self.total_count_approximate = self.db.get_count_estimate(session, **filters)
+                self._count_filters = tuple(filters.items())
+                if self.total_count_approximate:
+                    self._start_exact_count(self._count_filters)
+                # 필터 패널 항목별 개수도 백그라운드에서
+                self._start_facet_count(self._count_filters)
                 
                 # 전체 페이지 수 계산
                 self.total_pages = max(1, (self.total_count + self.page_size - 1) // self.page_size)
                 
+                # 이전/다음 버튼으로 이동한 경우에만 현재 페이지 커서를 이어서 사용
+                nav = self._page_nav
+                self._page_nav = None
+                
                 # 현재 페이지가 범위를 벗어나면 조정
                 if self.current_page > self.total_pages:
                     self.current_page = self.total_pages
-                
-                # 오프셋 계산
-                offset = (self.current_page - 1) * self.page_size
+                    nav = None
                 
                 # 정렬 조건 (torrent_list의 정렬 상태 사용, 기본값: 날짜순 내림차순)
                 sort_by = self.torrent_list.current_sort_column or 'upload_date'
                 sort_order = self.torrent_list.current_sort_order or 'desc'
                 
-                # 토렌트 가져오기
-                torrents = self.db.get_torrents(
-                    session,
-                    period_days=filters['period_days'],
-                    search_query=filters['search_query'],
-                    sort_by=sort_by,
-                    sort_order=sort_order,
-                    limit=self.page_size,
-                    offset=offset
-                )
+                # 토렌트 가져오기 (OFFSET 대신 keyset 커서 사용)
+                page_result = None
+                if nav == 'next' and self._page_last_cursor is not None:
+                    cursor = self._page_last_cursor
+                elif nav == 'prev' and self._page_first_cursor is not None:
+                    cursor = self._page_first_cursor
+                else:
+                    cursor = None
+                    nav = None
+                
+                if nav:
+                    page_result = self.db.get_torrents_page(
+                        session,
+                        **filters,
+                        sort_by=sort_by,
+                        sort_order=sort_order,
+                        limit=self.page_size,
+                        cursor=cursor,
+                        direction=nav
+                    )
+                
+                # 페이지 번호로 이동하거나 커서가 맞지 않으면 (데이터 변경 등) 앵커 점프
+                if page_result is None or (len(page_result['torrents']) < self.page_size
+                                           and self.current_page < self.total_pages):
+                    page_result = self.db.get_torrents_at_page(
+                        session,
+                        page=self.current_page,
+                        page_size=self.page_size,
+                        **filters,
+                        sort_by=sort_by,
+                        sort_order=sort_order
+                    )
+                
+                torrents = page_result['torrents']
+                self._page_first_cursor = page_result['first_cursor']
+                self._page_last_cursor = page_result['last_cursor']
                 
                 # UI 업데이트는 메인 스레드에서 비동기로 처리
                 def update_ui():
@@ -3896,7 +3781,7 @@ class MainWindow(QMainWindow):
                         self.update_pagination_ui()
                         self.status_bar.showMessage(
                             f"페이지 {self.current_page}/{self.total_pages} - "
-                            f"{len(torrents)}개 표시 (전체 {self.total_count}개)"
+                            f"{len(torrents)}개 표시 (전체 {self._format_total_count()})"
                         )
                         
                         # 썸네일 업데이트 시작 (비동기로 처리)
@@ -3916,6 +3801,80 @@ class MainWindow(QMainWindow):
         # 비동기로 DB 쿼리 실행
         QTimer.singleShot(0, load_async)
     
+    def _format_total_count(self) -> str:
+        """총 개수 표시 문자열 (추정값이면 '약' 표시)"""
+        if self.total_count_approximate:
+            return f"약 {self.total_count:,}개"
+        return f"{self.total_count}개"
+    
+    def _start_exact_count(self, count_filters: tuple):
+        """정확한 총 개수를 백그라운드에서 계산 (완료 시 total_count_ready 시그널)"""
+        if count_filters in self._exact_count_pending:
+            return
+        self._exact_count_pending.add(count_filters)
+        
+        def count_worker():
+            session = self.db.get_read_session()
+            try:
+                count = self.db.get_total_count(session, **dict(count_filters))
+                self.total_count_ready.emit(count_filters, count)
+            except Exception as e:
+                print(f"[UI] 총 개수 계산 오류: {e}")
+            finally:
+                session.close()
+                self._exact_count_pending.discard(count_filters)
+        
+        import threading
+        threading.Thread(target=count_worker, daemon=True).start()
+    
+    def _on_total_count_ready(self, count_filters, count: int):
+        """백그라운드 총 개수 계산 완료 (필터가 그대로일 때만 반영)"""
+        if count_filters != self._count_filters:
+            return
+        self.total_count = count
+        self.total_count_approximate = False
+        self.total_pages = max(1, (self.total_count + self.page_size - 1) // self.page_size)
+        self.update_pagination_ui()
+    
+    def _load_filter_options(self):
+        """필터 패널 국가/장르 항목을 DB에서 채움 (수집 중 새 장르가 생기면 다시 호출)"""
+        session = self.db.get_read_session()
+        try:
+            countries = [(c.code, c.name_kr or c.name) for c in self.db.get_all_countries(session)]
+            genres = [(g.name, g.name_kr or g.name) for g in self.db.get_all_genres(session)]
+        except Exception as e:
+            print(f"[UI] 필터 항목 로드 오류: {e}")
+            return
+        finally:
+            session.close()
+        self.filter_panel.set_options(countries, genres)
+    
+    def _start_facet_count(self, count_filters: tuple):
+        """필터 패널 항목별 개수를 백그라운드에서 계산 (완료 시 facet_counts_ready 시그널)"""
+        if count_filters in self._facet_pending:
+            return
+        self._facet_pending.add(count_filters)
+        
+        def facet_worker():
+            session = self.db.get_read_session()
+            try:
+                facets = self.db.get_facet_counts(session, **dict(count_filters))
+                self.facet_counts_ready.emit(count_filters, facets)
+            except Exception as e:
+                print(f"[UI] 필터 항목 개수 계산 오류: {e}")
+            finally:
+                session.close()
+                self._facet_pending.discard(count_filters)
+        
+        import threading
+        threading.Thread(target=facet_worker, daemon=True).start()
+    
+    def _on_facet_counts_ready(self, count_filters, facets: dict):
+        """항목별 개수 계산 완료 (필터가 그대로일 때만 반영)"""
+        if count_filters != self._count_filters:
+            return
+        self.filter_panel.set_facet_counts(facets)
+    
     def update_pagination_ui(self):
         """페이지네이션 UI 업데이트 - 비동기 처리"""
         from PySide6.QtCore import QTimer
@@ -3923,7 +3882,7 @@ class MainWindow(QMainWindow):
         # UI 업데이트를 비동기로 처리하여 블로킹 방지
         def update_async():
             self.page_label.setText(f"페이지: {self.current_page} / {self.total_pages}")
-            self.total_label.setText(f"전체: {self.total_count}개")
+            self.total_label.setText(f"전체: {self._format_total_count()}")
             self.page_input.setText(str(self.current_page))
         
         QTimer.singleShot(0, update_async)
@@ -3939,12 +3898,14 @@ class MainWindow(QMainWindow):
         """이전 페이지"""
         if self.current_page > 1:
             self.current_page -= 1
+            self._page_nav = 'prev'
             self.load_torrents()
     
     def next_page(self):
         """다음 페이지"""
         if self.current_page < self.total_pages:
             self.current_page += 1
+            self._page_nav = 'next'
             self.load_torrents()
     
     def goto_page(self):
@@ -4093,7 +4054,8 @@ class MainWindow(QMainWindow):
         
         QTimer.singleShot(0, update_ui_async)
         
-        # 목록 새로고침
+        # 새 장르가 생겼을 수 있으므로 필터 항목 갱신 후 목록 새로고침
+        self._load_filter_options()
         self.load_torrents()
         
         # 수집 완료 후 이미지 없는 항목들의 썸네일 업데이트 시작
@@ -4331,8 +4293,7 @@ class MainWindow(QMainWindow):
         if updated_count > 0:
             print(f"[썸네일] 백그라운드 업데이트 완료: {updated_count}개")
             QTimer.singleShot(0, lambda: self.status_bar.showMessage(f"썸네일 {updated_count}개 업데이트 완료", 3000))
-            # 목록 새로고침 (썸네일이 보이도록, 단 썸네일 업데이트는 다시 시작하지 않음)
-            QTimer.singleShot(0, lambda: self.torrent_list.refresh_thumbnails())  # 썸네일만 새로고침
+            # 현재 페이지 썸네일은 변경 피드(on_changes_committed)로 이미 갱신됨
         else:
             print("[썸네일] 업데이트할 항목이 없습니다.")
             QTimer.singleShot(0, lambda: self.status_bar.showMessage("썸네일 업데이트 완료 (모든 항목 최신)", 2000))
@@ -4361,6 +4322,22 @@ class MainWindow(QMainWindow):
             self.torrent_list.enable_replace_button(torrent_id)
             self.pending_replace_ids.discard(torrent_id)
 
+    def on_changes_committed(self, changes: list):
+        """DBWriter 커밋별 변경 피드 (현재 페이지에 있는 행만 갱신, 백그라운드 작업 중 목록을 다시 불러오지 않음)"""
+        self.torrent_list.apply_changes(changes)
+
+    def on_open_magnet_requested(self, torrent_id: int):
+        """목록 행 더블클릭: magnet 링크를 DB에서 조회하여 열기"""
+        session = self.db.get_read_session()
+        try:
+            details = self.db.get_torrent_details(session, torrent_id)
+        except Exception as e:
+            print(f"[UI] magnet 링크 조회 오류 (ID: {torrent_id}): {e}")
+            details = None
+        finally:
+            session.close()
+        self.torrent_list.open_magnet(details['magnet_link'] if details else '')
+    
     def on_replace_thumbnail_requested(self, torrent_id: int):
         """교체 버튼 클릭 처리: 최우선으로 처리"""
         try:
@@ -4368,41 +4345,17 @@ class MainWindow(QMainWindow):
             from PySide6.QtCore import QTimer
             def print_debug_info():
                 try:
-                    debug_session = self.db.get_session()
+                    debug_session = self.db.get_read_session()
                     try:
                         from database.models import Torrent
-                        import json
                         debug_torrent = debug_session.get(Torrent, torrent_id)
                         if debug_torrent:
-                            searched_servers_debug = []
-                            if debug_torrent.thumbnail_searched_servers:
-                                try:
-                                    searched_servers_debug = json.loads(debug_torrent.thumbnail_searched_servers)
-                                except (json.JSONDecodeError, TypeError):
-                                    searched_servers_debug = []
+                            searched_servers_debug = self.db.get_searched_servers(debug_session, [torrent_id]).get(torrent_id, set())
                             
                             # 제목 형태에 따라 처리 가능한 서버 확인
                             title_text_debug = debug_torrent.title or ''
-                            fc2_patterns_debug = [
-                                r'FC2[-\s]?PPV[-\s]?(\d{6,8})',  # FC2-PPV-숫자
-                                r'FC2[-\s]?PPV',                  # FC2-PPV
-                                r'FC2PPV',                        # FC2PPV
-                                r'FC2\s+PPV'                      # FC2 PPV
-                            ]
-                            is_fc2_debug = False
-                            if title_text_debug:
-                                title_upper_debug = title_text_debug.upper()
-                                for pattern in fc2_patterns_debug:
-                                    if re.search(pattern, title_upper_debug):
-                                        is_fc2_debug = True
-                                        break
-                            
-                            # FC2 항목: FC2PPV, JAVDB, JAVGURU만 처리 가능
-                            # FC2가 아닌 항목: JAVDB, JAVBEE, JAVGURU만 처리 가능
-                            if is_fc2_debug:
-                                all_servers_debug = {'fc2ppv', 'javdb', 'javguru'}  # FC2 항목: FC2PPV, JAVDB, JAVGURU
-                            else:
-                                all_servers_debug = {'javdb', 'javbee', 'javguru'}  # FC2가 아닌 항목: JAVDB, JAVBEE, JAVGURU
+                            all_servers_debug = set(self.db.get_thumbnail_servers(title_text_debug))
+                            is_fc2_debug = 'fc2ppv' in all_servers_debug
                             
                             remaining_servers_debug = all_servers_debug - set(searched_servers_debug)
                             
@@ -4414,7 +4367,6 @@ class MainWindow(QMainWindow):
                             print(f"  DB에서 이미 검색한 서버: {sorted(searched_servers_debug) if searched_servers_debug else '(없음)'}")
                             print(f"  아직 검색하지 않은 서버: {sorted(remaining_servers_debug) if remaining_servers_debug else '(없음)'}")
                             print(f"  DB 썸네일 URL: {debug_torrent.thumbnail_url or '(없음)'}")
-                            print(f"  thumbnail_searched_servers 원본: {debug_torrent.thumbnail_searched_servers or '(없음)'}")
                             print("=" * 80)
                         else:
                             print(f"[썸네일 교체 요청] ID: {torrent_id} - DB에서 찾을 수 없음")
@@ -4594,6 +4546,9 @@ class MainWindow(QMainWindow):
                 print("[종료] DB Writer Thread 강제 종료")
                 self.db_writer.terminate()
         
+        # DB 연결 정리 (PRAGMA optimize 후 연결 해제)
+        self.db.close()
+        
         # 교체 작업 큐 비우기
         if self.replace_worker and self.replace_worker.isRunning():
             print("[종료] 교체 작업 스레드 중지 중...")
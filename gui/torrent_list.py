@@ -7,7 +7,7 @@ from PySide6.QtCore import Qt, Signal, QUrl, QSize, QSettings, QEvent, QTimer
 import time
 from PySide6.QtGui import QDesktopServices, QPixmap, QIcon, QCursor
 from typing import List, Dict, Optional
-from database.models import Torrent
+from database.models import TorrentRow
 from .image_loader import ImageCache, ImageDownloader
 from config import IMAGE_CACHE_SIZE
 
@@ -19,10 +19,13 @@ class TorrentListWidget(QWidget):
     refresh_requested = Signal()
     replace_thumbnail_requested = Signal(int)  # torrent_id
     sort_requested = Signal(str, str)  # (column_name, order: 'asc' or 'desc')
+    open_magnet_requested = Signal(int)  # torrent_id (magnet 링크는 MainWindow가 DB에서 조회)
     
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.torrents: List[Torrent] = []
+        self.torrents: List[TorrentRow] = []
+        # 토렌트 id -> 행 번호 (현재 페이지, 썸네일/변경 피드 반영 시 선형 탐색 대신 사용)
+        self.row_by_id: Dict[int, int] = {}
         
         # 정렬 상태 추적
         self.current_sort_column = None
@@ -169,22 +172,68 @@ class TorrentListWidget(QWidget):
     
     def update_thumbnail_by_id(self, torrent_id: int, thumbnail_url: str):
         """특정 토렌트의 썸네일만 업데이트 (ID로 찾기)"""
-        # 현재 표시된 torrents에서 해당 ID 찾기
-        for row, torrent in enumerate(self.torrents):
-            if torrent.id == torrent_id:
-                # 썸네일 URL 업데이트
-                torrent.thumbnail_url = thumbnail_url
-                # 캐시 제거하고 새로 로드
-                self.image_cache.remove(thumbnail_url)
-                self._load_thumbnail(row, thumbnail_url)
-                print(f"[UI] 썸네일 즉시 업데이트: 행 {row}")
-                break
+        row = self.row_by_id.get(torrent_id)
+        if row is None:
+            return
+        # 썸네일 URL 업데이트
+        self.torrents[row].thumbnail_url = thumbnail_url
+        # 캐시 제거하고 새로 로드
+        self.image_cache.remove(thumbnail_url)
+        self._load_thumbnail(row, thumbnail_url)
+        print(f"[UI] 썸네일 즉시 업데이트: 행 {row}")
+    
+    def apply_changes(self, changes: list) -> int:
+        """DBWriter 변경 피드 반영 (현재 페이지에 있는 행의 바뀐 칸만 갱신, 목록은 다시 불러오지 않음)
+        
+        Args:
+            changes: DBWriterThread.changes_committed의 RowChange 리스트
+        
+        Returns:
+            갱신한 행 수
+        """
+        patched = 0
+        for change in changes:
+            row = self.row_by_id.get(change.torrent_id)
+            if row is None:
+                continue
+            torrent = self.torrents[row]
+            fields = {
+                name: value for name, value in change.fields.items()
+                if name in TorrentRow.__slots__ and getattr(torrent, name) != value
+            }
+            if not fields:
+                continue
+            for name, value in fields.items():
+                setattr(torrent, name, value)
+            # 아직 그리지 않은 행은 setup_row_batch가 바뀐 값으로 그림
+            if self.table.item(row, 0) is not None:
+                self._refresh_row_cells(row, torrent, fields)
+            patched += 1
+        return patched
+    
+    def _refresh_row_cells(self, row: int, torrent: TorrentRow, fields: dict):
+        """바뀐 필드에 해당하는 칸만 다시 표시"""
+        if 'title' in fields:
+            title_label = self.table.cellWidget(row, 1)
+            if isinstance(title_label, QLabel):
+                title_label.setText(torrent.title)
+                title_label.setToolTip(torrent.title)
+        if 'size' in fields:
+            self.table.item(row, 2).setText(torrent.size or 'N/A')
+        for column, name in ((3, 'seeders'), (4, 'leechers'), (5, 'downloads')):
+            if name in fields:
+                self.table.item(row, column).setData(Qt.DisplayRole, getattr(torrent, name) or 0)
+        if 'upload_date' in fields:
+            date_str = torrent.upload_date.strftime('%Y-%m-%d') if torrent.upload_date else 'N/A'
+            self.table.item(row, 6).setText(date_str)
+        if fields.get('thumbnail_url'):
+            self._load_thumbnail(row, torrent.thumbnail_url)
     
-    def set_torrents(self, torrents: List[Torrent]):
+    def set_torrents(self, torrents: List[TorrentRow]):
         """토렌트 목록 설정
         
         Args:
-            torrents: Torrent 객체 리스트
+            torrents: TorrentRow 리스트 (Database.get_torrents_page 결과)
         """
         # 페이지 변경 시 호버 미리보기 숨김
         self._hide_preview()
@@ -207,6 +256,7 @@ class TorrentListWidget(QWidget):
         # 테이블 설정도 비동기로 처리하여 UI 블로킹 방지
         def setup_table_async():
             self.torrents = torrents
+            self.row_by_id = {torrent.id: row for row, torrent in enumerate(torrents)}
             
             # UI 업데이트를 더 작은 단위로 나눠서 처리
             def update_info_label():
@@ -345,13 +395,12 @@ class TorrentListWidget(QWidget):
             def update_button_async():
                 try:
                     # torrent_id로 행 찾아서 버튼 비활성화
-                    for row, torrent in enumerate(self.torrents):
-                        if torrent.id == torrent_id:
-                            btn = self.table.cellWidget(row, 7)
-                            if btn and isinstance(btn, QPushButton):
-                                btn.setEnabled(False)
-                                btn.setText("검색중...")
-                            break
+                    row = self.row_by_id.get(torrent_id)
+                    if row is not None:
+                        btn = self.table.cellWidget(row, 7)
+                        if btn and isinstance(btn, QPushButton):
+                            btn.setEnabled(False)
+                            btn.setText("검색중...")
                 except Exception as e:
                     print(f"[교체] 버튼 상태 변경 오류: {e}")
             
@@ -367,22 +416,21 @@ class TorrentListWidget(QWidget):
         """교체 완료/실패 후 버튼 재활성화"""
         try:
             # 해당 torrent_id의 행 찾기
-            for row, torrent in enumerate(self.torrents):
-                if torrent.id == torrent_id:
-                    # 해당 행의 교체 버튼 가져오기
-                    btn = self.table.cellWidget(row, 7)
-                    if btn and isinstance(btn, QPushButton):
-                        btn.setEnabled(True)
-                        btn.setText("썸네일 교체")
-                    break
+            row = self.row_by_id.get(torrent_id)
+            if row is not None:
+                # 해당 행의 교체 버튼 가져오기
+                btn = self.table.cellWidget(row, 7)
+                if btn and isinstance(btn, QPushButton):
+                    btn.setEnabled(True)
+                    btn.setText("썸네일 교체")
         except Exception:
             pass
     
-    def _create_action_widget(self, torrent: Torrent) -> QWidget:
+    def _create_action_widget(self, torrent: TorrentRow) -> QWidget:
         """액션 버튼 위젯 생성
         
         Args:
-            torrent: Torrent 객체
+            torrent: TorrentRow
             
         Returns:
             버튼이 있는 QWidget
@@ -395,7 +443,7 @@ class TorrentListWidget(QWidget):
         magnet_btn = QPushButton("🧲")
         magnet_btn.setToolTip("Magnet 링크 열기")
         magnet_btn.setMaximumWidth(40)
-        magnet_btn.clicked.connect(lambda: self.open_magnet(torrent.magnet_link))
+        magnet_btn.clicked.connect(lambda _, tid=torrent.id: self.open_magnet_requested.emit(tid))
         layout.addWidget(magnet_btn)
         
         return widget
@@ -424,7 +472,8 @@ class TorrentListWidget(QWidget):
         row = index.row()
         if 0 <= row < len(self.torrents):
             torrent = self.torrents[row]
-            self.open_magnet(torrent.magnet_link)
+            # magnet 링크는 목록에 들고 있지 않으므로 MainWindow에 조회 요청
+            self.open_magnet_requested.emit(torrent.id)
     
     def _load_thumbnail(self, row: int, url: str):
         """썸네일 이미지 로딩
@@ -665,7 +714,7 @@ class TorrentListWidget(QWidget):
         # 첫 배치 시작
         process_batch(0, batch_size=5)
 
-    def _load_snapshots_for_row(self, row: int, torrent: Torrent):
+    def _load_snapshots_for_row(self, row: int, torrent: TorrentRow):
         """주어진 행의 스냅샷 이미지를 선로딩"""
         urls = []
         try:
@@ -0,0 +1,29 @@
+"""인기도 점수 일괄 재계산 스크립트
+
+사용법:
+    python rescore_popularity.py [--scorer capped|percentile] [--half-life 일수]
+
+공식을 바꾼 뒤 전체 토렌트의 popularity_score를 다시 계산할 때 사용한다 (numpy 필요).
+수집과 앱의 주기적 재계산은 POPULARITY_SCORER / POPULARITY_HALF_LIFE_DAYS를 쓰므로 공식을 바꿀 때는 설정도 함께 바꾼다.
+"""
+import argparse
+from database.database import Database
+from database.scoring import SCORERS, rescore_popularity
+
+
+def main():
+    parser = argparse.ArgumentParser(description='인기도 점수 일괄 재계산')
+    parser.add_argument('--db', default='./torrents.db', help='데이터베이스 파일 경로')
+    parser.add_argument('--scorer', choices=sorted(SCORERS), help='점수 공식 (기본: POPULARITY_SCORER)')
+    parser.add_argument('--half-life', type=float, help='시간 감쇠 반감기 (일, 0=감쇠 없음)')
+    args = parser.parse_args()
+
+    db = Database(args.db, background_tasks=False)
+    try:
+        rescore_popularity(db, args.scorer, args.half_life)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
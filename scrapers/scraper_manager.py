@@ -251,8 +251,8 @@ class ScraperManager:
             
             scraper = source['scraper']
             
-            # DB 세션 생성
-            session = db.get_session()
+            # DB 세션 생성 (조회만 하므로 읽기 전용)
+            session = db.get_read_session()
             try:
                 # 첫 페이지를 먼저 스크래핑하여 source_site 확인
                 sort_by = source.get('sort_by', 'seeders')
@@ -377,7 +377,7 @@ class ScraperManager:
                     queue_size = db_writer.queue.qsize()
                     print(f"[{source['name']}] DB 저장 큐 완료 대기 중... (큐 크기: {queue_size})")
                     if queue_size > 0:
-                        db_writer.queue.join()  # 모든 작업이 완료될 때까지 대기
+                        db_writer.wait_for_bulk()  # 일괄 저장 작업이 모두 커밋될 때까지 대기 (썸네일 작업은 제외)
                         print(f"[{source['name']}] DB 저장 완료 (큐 처리 완료)")
                     else:
                         print(f"[{source['name']}] ⚠️ DB 저장 큐가 비어있습니다. 작업이 큐에 추가되지 않았을 수 있습니다.")
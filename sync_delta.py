@@ -0,0 +1,64 @@
+"""설치본 간 증분 동기화 스크립트
+
+사용법:
+    python sync_delta.py export delta.ndjson.gz --peer laptop   # laptop에 마지막으로 보낸 이후 변경분
+    python sync_delta.py export delta.ndjson.gz --since 2026-10-01T00:00:00
+    python sync_delta.py export delta.ndjson.gz --peer laptop --full   # 전체 (기준 시각 다시 시작)
+    python sync_delta.py apply delta.ndjson.gz
+    python sync_delta.py peers
+
+apply는 DBWriterThread와 수집 저널을 사용하므로 같은 DB로 앱이 실행 중이지 않을 때 실행한다.
+"""
+import argparse
+from datetime import datetime
+from PySide6.QtCore import QCoreApplication
+from database.database import Database
+from database.db_writer import DBWriterThread
+from database.delta_sync import export_delta, apply_delta
+from database.models import SyncPeer
+
+
+def main():
+    parser = argparse.ArgumentParser(description='설치본 간 증분 동기화')
+    parser.add_argument('--db', default='./torrents.db', help='데이터베이스 파일 경로')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    export_parser = sub.add_parser('export', help='기준 시각 이후 변경분을 델타 파일로 내보내기')
+    export_parser.add_argument('path', help='출력 파일 (.gz면 gzip 압축)')
+    export_parser.add_argument('--peer', help='동기화 대상 이름 (마지막 기준 시각을 사용하고 새 기준 시각 저장)')
+    export_parser.add_argument('--since', type=datetime.fromisoformat, help='기준 시각 (UTC, ISO 형식)')
+    export_parser.add_argument('--full', action='store_true', help='기준 시각 없이 전체 내보내기')
+
+    apply_parser = sub.add_parser('apply', help='델타 파일을 현재 DB에 적용')
+    apply_parser.add_argument('path', help='입력 파일')
+
+    sub.add_parser('peers', help='동기화 대상별 기준 시각 보기')
+    args = parser.parse_args()
+
+    db = Database(args.db, background_tasks=False)
+    try:
+        if args.command == 'export':
+            export_delta(db, args.path, args.since, args.peer, full=args.full)
+        elif args.command == 'apply':
+            # DBWriterThread(QThread)와 시그널을 쓰려면 Qt 애플리케이션 객체가 있어야 함
+            QCoreApplication.instance() or QCoreApplication([])
+            writer = DBWriterThread(db)
+            writer.start()
+            try:
+                apply_delta(db, writer, args.path)
+            finally:
+                writer.stop()
+                writer.wait()
+        else:
+            session = db.get_read_session()
+            try:
+                for peer in session.query(SyncPeer).order_by(SyncPeer.name):
+                    print(f"{peer.name}: {peer.watermark.isoformat()} (내보낸 시각 {peer.exported_at})")
+            finally:
+                session.close()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""필터별 총 개수 캐시 무효화 (Database.notify_data_changed)"""
+import pytest
+
+from database.database import Database
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / 'torrents.db'), background_tasks=False)
+    yield db
+    db.close()
+
+
+def _store(db, key, count):
+    db._store_count(key, count, db._row_version)
+
+
+def test_filter_column_change_drops_filtered_counts(db):
+    unfiltered = db._count_key()
+    censored = db._count_key(censored=True)
+    _store(db, unfiltered, 10)
+    _store(db, censored, 4)
+
+    db.notify_data_changed(changed_ids=[1], changed_fields={'seeders', 'updated_at'})
+    assert db._get_cached_count(censored) == 4
+
+    db.notify_data_changed(changed_ids=[1], changed_fields={'censored', 'updated_at'})
+    assert db._get_cached_count(censored) is None
+    # 행 수는 그대로이므로 필터 없는 전체 개수는 유지
+    assert db._get_cached_count(unfiltered) == 10
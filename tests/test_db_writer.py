@@ -0,0 +1,61 @@
+"""DBWriterThread 썸네일 업데이트 (database/db_writer.py)"""
+from datetime import datetime
+
+import pytest
+from PySide6.QtCore import QCoreApplication
+
+from database.database import Database
+from database.db_writer import DBWriterThread
+from database.models import Torrent
+
+
+@pytest.fixture
+def db(tmp_path):
+    QCoreApplication.instance() or QCoreApplication([])
+    db = Database(str(tmp_path / 'torrents.db'), background_tasks=False)
+    yield db
+    db.close()
+
+
+def _add_torrent(db, source_id, thumbnail_url):
+    session = db.get_session()
+    try:
+        torrent = Torrent(title=f'Sample {source_id}', source_site='sukebei', source_id=source_id, magnet_link='',
+                          upload_date=datetime(2026, 1, 1), thumbnail_url=thumbnail_url,
+                          updated_at=datetime(2026, 1, 1))
+        session.add(torrent)
+        session.commit()
+        return torrent.id
+    finally:
+        session.close()
+
+
+def _row(db, torrent_id):
+    session = db.get_read_session()
+    try:
+        torrent = session.get(Torrent, torrent_id)
+        return torrent.thumbnail_url, torrent.updated_at
+    finally:
+        session.close()
+
+
+def test_unchanged_thumbnail_is_not_rewritten(db):
+    empty_id = _add_torrent(db, '1', '')
+    found_id = _add_torrent(db, '2', 'http://img.example/a.jpg')
+    changed_id = _add_torrent(db, '3', '')
+
+    writer = DBWriterThread(db)
+    writer.start()
+    try:
+        writer.update_thumbnail(empty_id, '')
+        writer.update_thumbnail(found_id, 'http://img.example/a.jpg')
+        writer.update_thumbnail(changed_id, 'http://img.example/b.jpg')
+        writer.queue.join()
+    finally:
+        writer.stop()
+        writer.wait()
+
+    assert _row(db, empty_id) == ('', datetime(2026, 1, 1))
+    assert _row(db, found_id) == ('http://img.example/a.jpg', datetime(2026, 1, 1))
+    url, updated_at = _row(db, changed_id)
+    assert url == 'http://img.example/b.jpg' and updated_at > datetime(2026, 1, 1)
@@ -0,0 +1,75 @@
+"""증분 동기화 썸네일 병합 (database/delta_sync.py)"""
+import json
+from datetime import datetime
+
+import pytest
+
+from database.database import Database
+from database.delta_sync import _thumbnail_updates, export_delta
+from database.maintenance import clear_placeholder_thumbnails
+from database.models import Torrent
+
+INFO_HASH = 'ab' * 20
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / 'torrents.db'), background_tasks=False)
+    yield db
+    db.close()
+
+
+def _add_torrent(db, thumbnail_url):
+    session = db.get_session()
+    try:
+        torrent = Torrent(
+            title='Sample Title', source_site='sukebei', source_id='1', info_hash=INFO_HASH,
+            magnet_link='', upload_date=datetime(2026, 1, 1), thumbnail_url=thumbnail_url
+        )
+        session.add(torrent)
+        session.commit()
+        return torrent.id
+    finally:
+        session.close()
+
+
+def _record(**fields):
+    record = {'title': 'Sample Title', 'source_site': 'sukebei', 'source_id': '1',
+              'magnet_link': f'magnet:?xt=urn:btih:{INFO_HASH}', 'thumbnail_attempts': {}}
+    record.update(fields)
+    return record
+
+
+def test_delta_without_thumbnail_keeps_local_thumbnail(db):
+    _add_torrent(db, 'http://img.example/x.jpg')
+    assert _thumbnail_updates(db, [_record(thumbnail_url='')]) == []
+    assert _thumbnail_updates(db, [_record(thumbnail_url=None)]) == []
+
+
+def test_delta_with_new_thumbnail_updates_url(db):
+    torrent_id = _add_torrent(db, '')
+    updates = _thumbnail_updates(db, [_record(thumbnail_url='http://img.example/y.jpg')])
+    assert updates == [{'torrent_id': torrent_id, 'thumbnail_url': 'http://img.example/y.jpg'}]
+
+
+def test_cleared_thumbnail_is_exported_and_applied(db, tmp_path):
+    torrent_id = _add_torrent(db, 'http://site.example/favicon.ico')
+    assert clear_placeholder_thumbnails(db) == [torrent_id]
+
+    path = str(tmp_path / 'delta.ndjson')
+    export_delta(db, path)
+    with open(path, encoding='utf-8') as f:
+        records = [json.loads(line) for line in f][1:]
+    assert records[0]['thumbnail_url'] == ''
+    assert records[0]['thumbnail_cleared'] is True
+
+    # 받는 쪽에 아직 아이콘 URL이 있으면 지움
+    session = db.get_session()
+    try:
+        session.query(Torrent).filter(Torrent.id == torrent_id).update(
+            {Torrent.thumbnail_url: 'http://site.example/favicon.ico'}
+        )
+        session.commit()
+    finally:
+        session.close()
+    assert _thumbnail_updates(db, records) == [{'torrent_id': torrent_id, 'thumbnail_url': ''}]